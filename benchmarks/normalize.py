@@ -0,0 +1,197 @@
+"""
+Compare the title normalization helpers with their previous implementations.
+
+Usage:
+    python benchmarks/normalize.py [TITLES_FILE] [--repeat N]
+
+``TITLES_FILE`` holds one track title per line (e.g. exported from Spotify
+playlists). Without it, a synthetic corpus of Brazilian and international
+titles with the usual version suffixes is generated. Every title must give
+the same output with both implementations; the script then reports the
+throughput of each, with and without the ``lru_cache``.
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.cifra_spotify.cifras import normalize
+
+LEGACY_KEYWORDS = [
+    "live",
+    "ao vivo",
+    "acoustic",
+    "remaster",
+    "remastered",
+    "version",
+    "edit",
+    "mix",
+    "deluxe",
+]
+
+
+def legacy_normalize_track_title(title: str) -> str:
+    if not title:
+        return title
+    for part in re.findall(r"[\(\[].*?[\)\]]", title):
+        if any(k in part.lower() for k in LEGACY_KEYWORDS):
+            title = title.replace(part, "")
+    parts = re.split(r"\s-\s", title)
+    if len(parts) > 1 and any(k in parts[-1].lower() for k in LEGACY_KEYWORDS):
+        title = parts[0]
+    return re.sub(r"\s{2,}", " ", title).strip()
+
+
+def legacy_slugify_cifraclub(text: str) -> str:
+    text = unicodedata.normalize("NFD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = re.sub(r"[^a-z0-9\s]", "", text.lower())
+    palavras = text.split()
+    if not palavras:
+        return ""
+    return "-".join(
+        [palavras[0]] + [p for p in palavras[1:] if p not in normalize.ARTIGOS]
+    )
+
+
+def legacy_normalize_text(text: str) -> str:
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return text.lower().strip()
+
+
+PAIRS = {
+    "normalize_track_title": (
+        legacy_normalize_track_title,
+        normalize.normalize_track_title,
+    ),
+    "slugify_cifraclub": (legacy_slugify_cifraclub, normalize.slugify_cifraclub),
+    "normalize_text": (legacy_normalize_text, normalize.normalize_text),
+}
+
+WORDS = [
+    "Evidências",
+    "Saudade",
+    "Coração",
+    "Ipanema",
+    "Tempo",
+    "Perdido",
+    "Lua",
+    "Amor",
+    "de",
+    "Deus",
+    "Você",
+    "Não",
+    "Sei",
+    "Hotel",
+    "California",
+    "Ação",
+    "Graças",
+    "Canção",
+    "Sertão",
+    "Ôh",
+    "Música",
+    "Fé",
+    "Paixão",
+    "Ilusão",
+    "Desejo",
+    "Céu",
+    "Solidão",
+    "Wonderwall",
+    "Yesterday",
+    "Naïve",
+    "Café",
+    "Über",
+    "Ñandú",
+]
+SUFFIXES = (
+    "",
+    "",
+    "",
+    " (Ao Vivo)",
+    " - Ao Vivo",
+    " - Live",
+    " (Live at Rock in Rio)",
+    " [Live]",
+    " (Remastered 2011)",
+    " - Remastered 2015",
+    " (Acoustic Version)",
+    " (feat. Fulano)",
+    " - Radio Edit",
+    " (Deluxe)",
+    " (Part. Especial Zé Neto)",
+)
+
+
+def synthetic_titles(count: int = 20_000, seed: int = 1) -> list[str]:
+    rng = random.Random(seed)
+    titles = [
+        " ".join(rng.choices(WORDS, k=rng.randint(1, 5))) + rng.choice(SUFFIXES)
+        for _ in range(count // 4)
+    ]
+    # Playlists and Solr results repeat titles a lot.
+    return titles + rng.choices(titles, k=count - len(titles))
+
+
+def load_titles(path: str | None) -> list[str]:
+    if path is None:
+        return synthetic_titles()
+    return [
+        line.strip()
+        for line in Path(path).read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+
+
+def check(titles: list[str]) -> list[str]:
+    """Titles for which some new helper differs from the legacy one."""
+    return [
+        f"{name}({title!r})"
+        for name, (legacy, new) in PAIRS.items()
+        for title in dict.fromkeys(titles)
+        if legacy(title) != new(title)
+    ]
+
+
+def throughput(fn, titles: list[str], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for title in titles:
+            fn(title)
+    return repeat * len(titles) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("titles", nargs="?")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    titles = load_titles(args.titles)
+    mismatches = check(titles)
+    if mismatches:
+        sys.exit("Outputs differ:\n" + "\n".join(mismatches[:20]))
+    print(f"{len(titles)} titles, identical output")
+
+    for name, (legacy, new) in PAIRS.items():
+        old = throughput(legacy, titles, args.repeat)
+        uncached = throughput(new.__wrapped__, titles, args.repeat)
+        new.cache_clear()
+        cached = throughput(new, titles, args.repeat)
+        print(
+            f"{name:>22}: legacy {old:>10,.0f}/s"
+            f"  uncached {uncached:>10,.0f}/s ({uncached / old:.1f}x)"
+            f"  cached {cached:>10,.0f}/s ({cached / old:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
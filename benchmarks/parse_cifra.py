@@ -0,0 +1,97 @@
+"""
+Compare the chord page parser backends.
+
+Usage:
+    python benchmarks/parse_cifra.py [PAGES_DIR] [--repeat N]
+
+``PAGES_DIR`` holds saved CifraClub pages (``*.html``). Without it, a
+synthetic page shaped like a real one (large head and footer, ~150 lines of
+chords with tablatures) is used. For every page the backends must return the
+same result; the script reports the mean parse time and the peak traced
+memory of each backend.
+"""
+
+import argparse
+import statistics
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.cifra_spotify.cifras.parsers.cifraclub import PARSER_BACKENDS
+
+
+def synthetic_page() -> str:
+    head = '<link rel="stylesheet" href="/a.css"><meta name="x" content="y">' * 200
+    chords = "\n".join(
+        f"<b>C</b>  <b>G7(13)</b>  verso n&uacute;mero {i} &amp; mais"
+        + (
+            '<span class="tablatura"><span class="cnt">E|--3--|</span></span>'
+            * (i % 7 == 0)
+        )
+        for i in range(150)
+    )
+    footer = '<div class="related"><a href="/x/">Outra m&uacute;sica</a></div>' * 800
+    return (
+        f"<!DOCTYPE html><html><head>{head}</head><body>"
+        '<h1 class="t1">Musica</h1><h2><a href="/artista/">Artista</a></h2>'
+        '<span id="cifra_tom">tom: <a>C</a></span>'
+        f"<pre>{chords}</pre>{footer}</body></html>"
+    )
+
+
+def load_pages(directory: str | None) -> dict[str, str]:
+    if directory is None:
+        return {"synthetic": synthetic_page()}
+    return {
+        path.name: path.read_text(encoding="utf-8")
+        for path in sorted(Path(directory).glob("*.html"))
+    }
+
+
+def peak_memory(parse, text: str) -> int:
+    tracemalloc.start()
+    parse(text, False)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("pages", nargs="?")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages)
+    if not pages:
+        sys.exit(f"No *.html pages found in {args.pages}")
+
+    timings = {name: [] for name in PARSER_BACKENDS}
+    memory = {name: [] for name in PARSER_BACKENDS}
+    for page_name, text in pages.items():
+        for tabs in (False, True):
+            results = {
+                name: parse(text, tabs) for name, parse in PARSER_BACKENDS.items()
+            }
+            if len({repr(result) for result in results.values()}) != 1:
+                sys.exit(f"{page_name}: backends disagree (tabs={tabs})")
+        for name, parse in PARSER_BACKENDS.items():
+            seconds = timeit.timeit(
+                lambda parse=parse, text=text: parse(text, False), number=args.repeat
+            )
+            timings[name].append(seconds / args.repeat)
+            memory[name].append(peak_memory(parse, text))
+
+    print(f"{len(pages)} page(s), identical output for every backend")
+    for name in PARSER_BACKENDS:
+        print(
+            f"{name:>8}: {statistics.mean(timings[name]) * 1000:8.2f} ms/page"
+            f"  {statistics.mean(memory[name]) / 1024:8.0f} KiB peak"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,18 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from src.cifra_spotify.api import register_routers
+from src.cifra_spotify.api.deps import spotify_for
+from src.cifra_spotify.app.core.config import settings
 from src.cifra_spotify.app.core.logger import logger
 from src.cifra_spotify.app.custom_exceptions import register_exception_handlers
+from src.cifra_spotify.cifras.cache import build_cifra_cache, build_search_cache
+from src.cifra_spotify.cifras.cifra_club import CifraClub, create_http_client
+from src.cifra_spotify.cifras.parsers.pool import build_parser_pool
+from src.cifra_spotify.cifras.prefetch import ChordPrefetcher
+from src.cifra_spotify.cifras.render.pdf import build_pdf_renderer
+from src.cifra_spotify.spotify import spotify, spotify_users
+from src.cifra_spotify.spotify.broadcaster import NowPlayingBroadcaster
+from src.cifra_spotify.spotify.scheduler import PollingScheduler
 
 try:
     import uvloop
@@ -22,8 +32,40 @@ if uvloop and sys.platform != "win32":
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting application...")
+    app.state.cifra_club = CifraClub(
+        client=create_http_client(),
+        cache=build_cifra_cache(),
+        search_cache=build_search_cache(),
+        parser_pool=build_parser_pool(),
+        stream_pages=settings.CIFRA_STREAM_PAGES,
+        pdf_renderer=build_pdf_renderer(),
+    )
+    if app.state.cifra_club.pdf_renderer:
+        await app.state.cifra_club.pdf_renderer.start()
+    # Here the prefetcher only follows accounts with a stream subscriber; the
+    # polling worker prefetches for every account it polls.
+    prefetcher = None
+    if settings.CIFRA_PREFETCH:
+        prefetcher = ChordPrefetcher(
+            app.state.cifra_club,
+            queue_depth=settings.CIFRA_PREFETCH_QUEUE_DEPTH,
+            max_concurrency=settings.CIFRA_PREFETCH_CONCURRENCY,
+        )
+    app.state.now_playing = NowPlayingBroadcaster(
+        PollingScheduler(max_concurrency=settings.SPOTIFY_POLLING_CONCURRENCY),
+        api_for=spotify_for,
+        queue_size=settings.SPOTIFY_STREAM_QUEUE_SIZE,
+        on_watch=prefetcher.attach if prefetcher else None,
+    )
+    await app.state.now_playing.start()
     yield
     logger.info("Stopping application...")
+    await app.state.now_playing.stop()
+    if prefetcher:
+        await prefetcher.aclose()
+    await app.state.cifra_club.aclose()
+    await spotify.aclose()
+    await spotify_users.aclose()
 
 
 def create_app():
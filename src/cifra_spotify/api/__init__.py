@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 
-from .router import auth, cifra, me, playlist, track, webhooks
+from .router import auth, cifra, me, playlist, stream, track, webhooks
 
 
 def register_routers(app: FastAPI) -> FastAPI:
@@ -10,5 +10,6 @@ def register_routers(app: FastAPI) -> FastAPI:
     app.include_router(track.router)
     app.include_router(cifra.router)
     app.include_router(webhooks.router)
+    app.include_router(stream.router)
 
     return app
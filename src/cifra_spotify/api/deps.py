@@ -1,12 +1,65 @@
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Cookie, Depends, Header, Request
 
-from src.cifra_spotify.spotify import SpotifyAPI, spotify
+from src.cifra_spotify.app.core.config import settings
+from src.cifra_spotify.app.core.session import sessions
+from src.cifra_spotify.app.custom_exceptions.exceptions import (
+    UserNotAuthenticatedException,
+)
+from src.cifra_spotify.cifras.cifra_club import CifraClub
+from src.cifra_spotify.spotify import SpotifyAPI, spotify, spotify_users
 
 
-def get_spotify() -> SpotifyAPI:
+def get_session_user(
+    authorization: Annotated[
+        str | None,
+        Header(description="``Bearer <session>`` returned by the login callback."),
+    ] = None,
+    session: Annotated[
+        str | None, Cookie(alias=settings.SESSION_COOKIE, include_in_schema=False)
+    ] = None,
+) -> str | None:
+    """
+    Spotify user ID of the session sent with the request.
+
+    The session is the signed token issued by the login callback, either as
+    a bearer token or as the cookie it sets. Without one, ``None`` is
+    returned and the single-user client is used.
+
+    Raises:
+        UserNotAuthenticatedException: If the session is invalid or expired.
+    """
+    token = session
+    if authorization:
+        scheme, _, credentials = authorization.partition(" ")
+        if scheme.lower() == "bearer":
+            token = credentials
+    if not token:
+        return None
+
+    user_id = sessions.verify(token)
+    if user_id is None:
+        raise UserNotAuthenticatedException("Invalid or expired session.", 401)
+    return user_id
+
+
+SESSIONDEPS = Annotated[str | None, Depends(get_session_user)]
+
+
+def spotify_for(user_id: str | None) -> SpotifyAPI:
+    if user_id:
+        return spotify_users.get(user_id)
     return spotify
 
 
+def get_spotify(user_id: SESSIONDEPS) -> SpotifyAPI:
+    return spotify_for(user_id)
+
+
+def get_cifra_club(request: Request) -> CifraClub:
+    return request.app.state.cifra_club
+
+
 SPOTIFYDEPS = Annotated[SpotifyAPI, Depends(get_spotify)]
+CIFRACLUBDEPS = Annotated[CifraClub, Depends(get_cifra_club)]
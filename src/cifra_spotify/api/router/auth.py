@@ -1,12 +1,12 @@
 from fastapi import APIRouter
 
-from src.cifra_spotify.api.deps import SPOTIFYDEPS
+from src.cifra_spotify.spotify import spotify_users
 
 router = APIRouter(prefix="/api/auth", tags=["AUTH"])
 
 
 @router.get("/login")
-async def login(spotify: SPOTIFYDEPS):
+async def login():
     """
     Generate the Spotify authentication URL.
 
@@ -14,4 +14,4 @@ async def login(spotify: SPOTIFYDEPS):
     After logging in, Spotify will redirect the user to the configured `redirect_uri`
     along with an authorization code used to obtain access tokens.
     """
-    return {"url_login": spotify.auth.get_login_url(), "status": "ok"}
+    return {"url_login": spotify_users.login_auth.get_login_url(), "status": "ok"}
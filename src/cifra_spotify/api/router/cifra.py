@@ -2,9 +2,8 @@ from typing import Annotated
 
 from fastapi import APIRouter, Query
 
-from cifra_spotify.api.deps import SPOTIFYDEPS
+from cifra_spotify.api.deps import CIFRACLUBDEPS, SPOTIFYDEPS
 from cifra_spotify.cifras.cifra_base import Instruments
-from cifra_spotify.cifras.cifra_club import CifraClub
 from cifra_spotify.cifras.enum import SitesCifra
 from cifra_spotify.cifras.parsers.spotify import get_current_track_with_genres
 from cifra_spotify.cifras.schemas.response import ChordSearchResponse
@@ -16,6 +15,7 @@ router = APIRouter(prefix="/api/cifra", tags=["CIFRA"])
 @router.get("/", response_model=ChordSearchResponse)
 async def cifra_by_current_track(
     spotify: SPOTIFYDEPS,
+    cifra_club: CIFRACLUBDEPS,
     site: Annotated[
         SitesCifra,
         Query(description="Website where the musical score will be searched."),
@@ -31,8 +31,6 @@ async def cifra_by_current_track(
 
     song_data = await get_current_track_with_genres(spotify)
 
-    cifra_club = CifraClub()
-
     items = await cifra_club.search_musics(
         singer=song_data.artist_name,
         music=song_data.track_name,
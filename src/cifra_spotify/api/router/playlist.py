@@ -1,13 +1,22 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Query, status
+from fastapi import APIRouter, Query, Response, status
+from fastapi.responses import StreamingResponse
 
-from src.cifra_spotify.api.deps import SPOTIFYDEPS
+from src.cifra_spotify.api.deps import CIFRACLUBDEPS, SPOTIFYDEPS
+from src.cifra_spotify.app.core.config import settings
 from src.cifra_spotify.app.custom_exceptions.exceptions import PlaylistSeachException
 from src.cifra_spotify.app.schemas.search_schema import (
     PlaylistsResponse,
     SpotifySearchResponse,
 )
+from src.cifra_spotify.cifras.cifra_base import Instruments
+from src.cifra_spotify.cifras.enum import SongbookFormat
+from src.cifra_spotify.cifras.render.cifraclub import (
+    aiter_html_document,
+    render_html_document,
+)
+from src.cifra_spotify.cifras.songbook import iter_songbook, resolve_songbook
 
 router = APIRouter(prefix="/api/playlist", tags=["PLAYLIST"])
 
@@ -52,3 +61,62 @@ async def my_playlists(
             "Erro ao buscar playlist", status_code=response.status_code
         )
     return PlaylistsResponse.model_validate(response.json())
+
+
+@router.get("/{playlist_id}/songbook")
+async def playlist_songbook(
+    spotify: SPOTIFYDEPS,
+    cifra_club: CIFRACLUBDEPS,
+    playlist_id: str,
+    output_format: Annotated[
+        SongbookFormat, Query(alias="format", description="Formato do songbook.")
+    ] = SongbookFormat.HTML,
+    instrument: Annotated[
+        Instruments, Query(description="Instrumento das cifras.")
+    ] = Instruments.GUITAR,
+    tabs: Annotated[bool, Query(description="Incluir tablaturas.")] = False,
+):
+    """
+    Build a songbook from a Spotify playlist.
+
+    Every track of the playlist is resolved to its chord sheet concurrently
+    and the sheets are rendered, in playlist order, into one HTML or PDF
+    document. Tracks whose chords cannot be found are left out.
+
+    The HTML songbook is streamed: each sheet is sent as soon as it and the
+    ones before it are resolved. The PDF is rendered once every track is
+    resolved, and its `X-Songbook-Missing` header says how many were left
+    out. Both report the tracks read in `X-Songbook-Tracks`, and
+    `X-Songbook-Truncated` is `true` when the playlist has more than
+    `CIFRA_SONGBOOK_MAX_TRACKS` items and the rest were skipped.
+    """
+    max_tracks = settings.CIFRA_SONGBOOK_MAX_TRACKS
+    tracks, total = await spotify.get_playlist_tracks(
+        playlist_id, max_tracks=max_tracks
+    )
+    headers = {
+        "X-Songbook-Tracks": str(len(tracks)),
+        "X-Songbook-Truncated": "true" if total > max_tracks else "false",
+    }
+    songbook = {
+        "instrument": instrument,
+        "tabs": tabs,
+        "max_concurrency": settings.CIFRA_SONGBOOK_CONCURRENCY,
+    }
+
+    if output_format is SongbookFormat.PDF:
+        entries = await resolve_songbook(cifra_club, tracks, **songbook)
+        songs = [cifra for entry in entries for cifra in entry.cifras]
+        pdf = await cifra_club.generate_pdf(render_html_document(songs))
+        headers["X-Songbook-Missing"] = str(sum(not entry.found for entry in entries))
+        headers["Content-Disposition"] = f'inline; filename="{playlist_id}.pdf"'
+        return Response(pdf, media_type="application/pdf", headers=headers)
+
+    async def songs():
+        async for entry in iter_songbook(cifra_club, tracks, **songbook):
+            for cifra in entry.cifras:
+                yield cifra
+
+    return StreamingResponse(
+        aiter_html_document(songs()), media_type="text/html", headers=headers
+    )
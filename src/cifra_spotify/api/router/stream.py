@@ -0,0 +1,106 @@
+import asyncio
+from typing import Annotated
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+    WebSocketException,
+    status,
+)
+from fastapi.responses import StreamingResponse
+
+from src.cifra_spotify.api.deps import SESSIONDEPS, get_session_user
+from src.cifra_spotify.app.core.config import settings
+from src.cifra_spotify.app.custom_exceptions.exceptions import (
+    UserNotAuthenticatedException,
+)
+from src.cifra_spotify.spotify.broadcaster import NowPlayingBroadcaster
+
+router = APIRouter(prefix="/api/stream", tags=["STREAM"])
+
+
+def get_ws_account(websocket: WebSocket) -> str | None:
+    """Session user of a WebSocket, closing it with 1008 if the session is invalid."""
+    try:
+        return get_session_user(
+            authorization=websocket.headers.get("authorization"),
+            session=websocket.cookies.get(settings.SESSION_COOKIE),
+        )
+    except UserNotAuthenticatedException as exc:
+        raise WebSocketException(status.WS_1008_POLICY_VIOLATION, exc.message) from exc
+
+
+WSACCOUNTDEPS = Annotated[str | None, Depends(get_ws_account)]
+
+
+@router.get("/now_playing")
+async def now_playing_sse(request: Request, account: SESSIONDEPS):
+    """
+    Stream now-playing changes as Server-Sent Events.
+
+    Every ``start``, ``change`` and ``stop`` event of the account is sent as
+    an SSE message whose ``event`` field is the event type and whose data is
+    ``{"event": ..., "track": {...}}``. The latest event is replayed on
+    connect. All clients of the same account share a single upstream poll.
+
+    The account is the one of the session sent with the request, as for the
+    REST endpoints.
+    """
+    broadcaster: NowPlayingBroadcaster = request.app.state.now_playing
+
+    async def events():
+        async with broadcaster.subscribe(account) as queue:
+            while True:
+                try:
+                    event, message = await asyncio.wait_for(
+                        queue.get(), timeout=settings.SPOTIFY_STREAM_KEEPALIVE
+                    )
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event}\ndata: {message}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/now_playing/ws")
+async def now_playing_ws(websocket: WebSocket, account: WSACCOUNTDEPS):
+    """
+    Stream now-playing changes over a WebSocket.
+
+    Sends the same JSON messages as the SSE endpoint, one per text frame.
+    """
+    broadcaster: NowPlayingBroadcaster = websocket.app.state.now_playing
+    await websocket.accept()
+
+    # Anything the client sends is ignored; receiving only detects disconnects.
+    disconnected = asyncio.create_task(_wait_disconnect(websocket))
+    try:
+        async with broadcaster.subscribe(account) as queue:
+            while True:
+                message = asyncio.create_task(queue.get())
+                done, _ = await asyncio.wait(
+                    {message, disconnected}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if disconnected in done:
+                    message.cancel()
+                    break
+                await websocket.send_text(message.result()[1])
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+
+
+async def _wait_disconnect(websocket: WebSocket):
+    while True:
+        received = await websocket.receive()
+        if received["type"] == "websocket.disconnect":
+            return
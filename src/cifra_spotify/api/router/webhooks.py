@@ -1,37 +1,68 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
 from pydantic import BaseModel
 
 from src.cifra_spotify.api.deps import SPOTIFYDEPS
+from src.cifra_spotify.app.core.config import settings
 from src.cifra_spotify.app.core.logger import logger
+from src.cifra_spotify.app.core.session import sessions
+from src.cifra_spotify.spotify import spotify, spotify_users
 
 router = APIRouter(prefix="/webhooks", tags=["WEBHOOKS"])
 
 
 @router.get("/callback")
-async def callback(code: Annotated[str, Query()], spotify: SPOTIFYDEPS):
+async def callback(code: Annotated[str, Query()], response: Response):
     """
     Exchange the authorization code returned by Spotify for access and refresh tokens.
 
     This endpoint is called by Spotify after the user completes the login flow.
     It receives the ``code`` from the redirect URL and exchanges it for the tokens
     required to authenticate future Spotify API requests.
+
+    The tokens are stored server-side under the Spotify user ID, and also
+    become those of the single-user client used by requests without a
+    session and by the single-user polling worker. The response
+    carries a signed session instead, both in the body and as a cookie; send
+    it back as ``Authorization: Bearer <session>`` (or just keep the cookie)
+    to act on behalf of that user.
     """
-    data = await spotify.auth.exchange_code_for_token(code)
-    logger.info(f"Tokens obtidos: {data}")
+    data = await spotify_users.login_auth.request_token(code)
+    user_id = await spotify_users.register(data)
+    await spotify.auth.save_token(data)
+    logger.info(f"Tokens obtidos para {user_id}")
 
-    return {"status": "logado", "tokens": data}
+    session = sessions.issue(user_id)
+    response.set_cookie(
+        settings.SESSION_COOKIE,
+        session,
+        max_age=sessions.ttl,
+        httponly=True,
+        secure=settings.SESSION_COOKIE_SECURE,
+        samesite="lax",
+    )
+    return {"status": "logado", "user_id": user_id, "session": session}
 
 
 class TrackInfo(BaseModel):
+    user_id: str | None = None
     id: str
     name: str
     artist: str
-    progress_ms: int
+    progress_ms: int | None = None
+
+
+class WebhookEnvelope(BaseModel):
+    version: int
+    events: list[TrackInfo]
 
 
 @router.post("/spotify")
-async def webhook(spotify: SPOTIFYDEPS, track: TrackInfo):
-    logger.debug(f"Track changed: {track}")
-    return {"status": "ok"}
+async def webhook(spotify: SPOTIFYDEPS, envelope: WebhookEnvelope):
+    """
+    Receive polling events, delivered as ``{"version": 1, "events": [...]}``.
+    """
+    for item in envelope.events:
+        logger.debug(f"Track changed: {item}")
+    return {"status": "ok", "received": len(envelope.events)}
@@ -0,0 +1,262 @@
+import asyncio
+import copy
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from src.cifra_spotify.app.core.logger import logger
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "hit_ratio": self.hit_ratio}
+
+
+class TTLCache:
+    """
+    In-process LRU cache with optional per-entry time to live.
+
+    Entries are evicted in least-recently-used order once ``maxsize`` is
+    reached, and lazily discarded on access after ``ttl`` seconds.
+
+    Args:
+        maxsize (int): Maximum number of entries kept in memory.
+        ttl (float | None): Seconds an entry stays valid. ``None`` disables expiry.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._data: OrderedDict[Any, tuple[float | None, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._data[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: Any, value: Any, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def delete(self, key: Any) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class SQLiteCache:
+    """
+    On-disk key/value cache backed by SQLite.
+
+    Values are stored as JSON. Every call runs in a worker thread so the event
+    loop is never blocked by disk I/O. When the table grows past
+    ``max_entries`` the least recently accessed rows are removed.
+
+    Args:
+        path (str): SQLite database file.
+        ttl (float | None): Seconds an entry stays valid. ``None`` disables expiry.
+        max_entries (int): Maximum number of rows kept on disk.
+        table (str): Table name, allowing several caches in the same file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float | None = None,
+        max_entries: int = 10_000,
+        table: str = "cache",
+    ):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.table = table
+        self.stats = CacheStats()
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            logger.debug(f"Opening SQLite cache: {self.path} ({self.table})")
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table}_accessed "
+                f"ON {self.table} (accessed_at)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _get(self, key: str) -> Any:
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+
+            value, expires_at = row
+            if expires_at is not None and now >= expires_at:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                conn.commit()
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+
+            conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            conn.commit()
+            self.stats.hits += 1
+            return json.loads(value)
+
+    def _set(self, key: str, value: Any, ttl: float | None) -> None:
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} "
+                "(key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, now),
+            )
+            (count,) = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+            overflow = count - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN ("
+                    f"SELECT key FROM {self.table} ORDER BY accessed_at LIMIT ?)",
+                    (overflow,),
+                )
+                self.stats.evictions += overflow
+            conn.commit()
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            conn.commit()
+
+    def _close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def get(self, key: str) -> Any:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    async def aclose(self) -> None:
+        await asyncio.to_thread(self._close)
+
+
+class TieredCache:
+    """
+    Two-tier cache: an in-process :class:`TTLCache` in front of an optional
+    :class:`SQLiteCache`.
+
+    Lookups hit memory first; disk hits are promoted back into memory so
+    repeated reads are served without touching SQLite. The memory tier keeps
+    its own copy of each value and hands out copies, so callers may mutate
+    what they get without changing the cache.
+    """
+
+    def __init__(self, memory: TTLCache, disk: SQLiteCache | None = None):
+        self.memory = memory
+        self.disk = disk
+
+    async def get(self, key: str) -> Any:
+        value = self.memory.get(key)
+        if value is not None:
+            return copy.deepcopy(value)
+
+        if self.disk is None:
+            return None
+
+        try:
+            value = await self.disk.get(key)
+        except sqlite3.Error as exc:
+            logger.error(f"[Cache] Disk read error: {exc}")
+            return None
+
+        if value is not None:
+            self.memory.set(key, copy.deepcopy(value))
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self.memory.set(key, copy.deepcopy(value), ttl=ttl)
+        if self.disk is None:
+            return
+        try:
+            await self.disk.set(key, value, ttl=ttl)
+        except sqlite3.Error as exc:
+            logger.error(f"[Cache] Disk write error: {exc}")
+
+    async def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.disk is not None:
+            await self.disk.delete(key)
+
+    def stats(self) -> dict:
+        return {
+            "memory": self.memory.stats.as_dict(),
+            "disk": self.disk.stats.as_dict() if self.disk else None,
+        }
+
+    async def aclose(self) -> None:
+        if self.disk is not None:
+            await self.disk.aclose()
@@ -9,6 +9,71 @@ class Settings(BaseSettings):
     SPOTIFY_CLIENT_ID: str | None = None
     SPOTIFY_CLIENT_SECRET: str | None = None
     SPOTIFY_REDIRECT_URI: str | None = None
+    SPOTIFY_COALESCE_TTL: float = 1.0
+    SPOTIFY_ARTIST_CACHE_PATH: str | None = None
+    SPOTIFY_ARTIST_CACHE_TTL: int = 60 * 60 * 24 * 30
+    SPOTIFY_ARTIST_CACHE_ENTRIES: int = 2048
+    SPOTIFY_RATE_LIMIT: float = 5
+    SPOTIFY_RATE_BURST: int = 10
+    SPOTIFY_MAX_RETRIES: int = 3
+    SPOTIFY_MAX_RETRY_AFTER: float = 30
+    SPOTIFY_ETAG_CACHE_ENTRIES: int = 256
+    SPOTIFY_TOKEN_STORE: str = "sqlite"
+    SPOTIFY_TOKEN_DB: str = ".spotify_tokens.sqlite3"
+    SPOTIFY_REDIS_URL: str | None = None
+    SPOTIFY_POLLING_CONCURRENCY: int = 20
+    SPOTIFY_POLLING_SYNC_INTERVAL: float = 60
+    SPOTIFY_POLLING_PREDICTIVE: bool = False
+    SPOTIFY_POLLING_MAX_PREDICTIVE_INTERVAL: float = 30
+    SPOTIFY_POLLING_HOOK_WORKERS: int = 4
+    SPOTIFY_SHARD_DB: str = ".polling_leases.sqlite3"
+    SPOTIFY_SHARD_LEASE_TTL: float = 30
+    SPOTIFY_STREAM_QUEUE_SIZE: int = 16
+    SPOTIFY_STREAM_KEEPALIVE: float = 15
+    SPOTIFY_WEBHOOK_QUEUE_SIZE: int = 1000
+    SPOTIFY_WEBHOOK_BATCH_SIZE: int = 20
+    SPOTIFY_WEBHOOK_BATCH_WAIT: float = 0.5
+    SPOTIFY_WEBHOOK_WORKERS: int = 2
+    SPOTIFY_WEBHOOK_MAX_RETRIES: int = 5
+    SPOTIFY_WEBHOOK_SPILL_PATH: str | None = None
+    SPOTIFY_WEBHOOK_DEAD_LETTER_PATH: str | None = None
+
+    SESSION_SECRET: str | None = None
+    SESSION_TTL: int = 60 * 60 * 24 * 30
+    SESSION_COOKIE: str = "cifra_session"
+    # Disable only for local development over plain HTTP.
+    SESSION_COOKIE_SECURE: bool = True
+
+    CIFRA_CACHE_PATH: str | None = ".cifra_cache.sqlite3"
+    CIFRA_CACHE_TTL: int = 60 * 60 * 24 * 7
+    CIFRA_CACHE_MEMORY_ENTRIES: int = 512
+    CIFRA_CACHE_DISK_ENTRIES: int = 20_000
+
+    CIFRA_HTTP_TIMEOUT: float = 10
+    CIFRA_HTTP_MAX_CONNECTIONS: int = 100
+    CIFRA_HTTP_MAX_KEEPALIVE: int = 20
+    CIFRA_HTTP_KEEPALIVE_EXPIRY: float = 30
+    CIFRA_HTTP2: bool = True
+    CIFRA_SEARCH_CONCURRENCY: int = 5
+    CIFRA_PARSER: str = "scanner"
+    CIFRA_MATCH_TOP_K: int = 3
+    CIFRA_PARSER_POOL: str = "thread"
+    CIFRA_PARSER_WORKERS: int | None = None
+    CIFRA_PARSER_MAX_PENDING: int = 64
+    CIFRA_STREAM_PAGES: bool = False
+    CIFRA_MAX_PAGE_BYTES: int = 2 * 1024 * 1024
+    CIFRA_PDF_WORKERS: int = 2
+    CIFRA_PDF_MAX_PENDING: int = 8
+    CIFRA_PDF_CACHE_ENTRIES: int = 32
+    CIFRA_PDF_CACHE_TTL: int = 60 * 60
+    CIFRA_SONGBOOK_CONCURRENCY: int = 8
+    CIFRA_SONGBOOK_MAX_TRACKS: int = 200
+    CIFRA_SEARCH_CACHE_ENTRIES: int = 1024
+    CIFRA_SEARCH_CACHE_TTL: int = 60 * 60
+
+    CIFRA_PREFETCH: bool = False
+    CIFRA_PREFETCH_QUEUE_DEPTH: int = 0
+    CIFRA_PREFETCH_CONCURRENCY: int = 2
 
 
 settings = Settings()
@@ -0,0 +1,71 @@
+import base64
+import hashlib
+import hmac
+import secrets
+import time
+
+from src.cifra_spotify.app.core.config import settings
+from src.cifra_spotify.app.core.logger import logger
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class SessionSigner:
+    """
+    Issue and verify signed session tokens for logged-in Spotify users.
+
+    A token is ``<user_id>.<expires_at>.<signature>``, the user ID base64url
+    encoded and the signature an HMAC-SHA256 of the first two parts. Only
+    the server knows ``secret``, so a client cannot mint a token for another
+    user even though Spotify user IDs are public.
+
+    Args:
+        secret (str): Signing key, shared by every API process.
+        ttl (int): Seconds a token stays valid.
+    """
+
+    def __init__(self, secret: str, ttl: int = 60 * 60 * 24 * 30):
+        self._key = secret.encode()
+        self.ttl = ttl
+
+    def _sign(self, payload: str) -> str:
+        digest = hmac.new(self._key, payload.encode(), hashlib.sha256).digest()
+        return _b64encode(digest)
+
+    def issue(self, user_id: str) -> str:
+        expires_at = int(time.time()) + self.ttl
+        payload = f"{_b64encode(user_id.encode())}.{expires_at}"
+        return f"{payload}.{self._sign(payload)}"
+
+    def verify(self, token: str) -> str | None:
+        """User ID of a valid, unexpired ``token``; ``None`` otherwise."""
+        try:
+            encoded_user, expires_at, signature = token.split(".")
+            payload = f"{encoded_user}.{expires_at}"
+            if not hmac.compare_digest(signature, self._sign(payload)):
+                return None
+            if int(expires_at) < time.time():
+                return None
+            return _b64decode(encoded_user).decode()
+        except ValueError:
+            return None
+
+
+def build_session_signer() -> SessionSigner:
+    secret = settings.SESSION_SECRET
+    if not secret:
+        logger.warning(
+            "SESSION_SECRET is not set; sessions will not survive a restart "
+            "nor be shared between processes."
+        )
+        secret = secrets.token_urlsafe(32)
+    return SessionSigner(secret, ttl=settings.SESSION_TTL)
+
+
+sessions = build_session_signer()
@@ -0,0 +1,65 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from src.cifra_spotify.app.core.cache import TTLCache
+from src.cifra_spotify.app.core.logger import logger
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share the same key onto one execution.
+
+    The first caller for a key starts the work; every caller that arrives
+    while it is in flight awaits the same result. When ``ttl`` is set, the
+    result is also reused for that many seconds after it completes, unless
+    ``cache_if`` rejects it.
+
+    Args:
+        ttl (float): Micro-TTL, in seconds, for completed results. ``0`` disables it.
+        maxsize (int): Maximum number of completed results kept for the TTL.
+        cache_if (Callable[[Any], bool], optional): Whether a completed result
+            may be reused for the TTL. By default every result is.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 0,
+        maxsize: int = 256,
+        cache_if: Callable[[Any], bool] | None = None,
+    ):
+        self.ttl = ttl
+        self.cache_if = cache_if
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._recent = TTLCache(maxsize=maxsize, ttl=ttl) if ttl > 0 else None
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        if self._recent is not None:
+            result = self._recent.get(key)
+            if result is not None:
+                self.coalesced += 1
+                return result
+
+        future = self._inflight.get(key)
+        if future is not None:
+            logger.debug(f"[SingleFlight] Joining in-flight request: {key}")
+            self.coalesced += 1
+            # shield: a cancelled follower must not cancel the shared request.
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(fn())
+        self._inflight[key] = future
+        try:
+            result = await asyncio.shield(future)
+        finally:
+            if future.done():
+                self._inflight.pop(key, None)
+            else:
+                future.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        if self._recent is not None and (
+            self.cache_if is None or self.cache_if(result)
+        ):
+            self._recent.set(key, result)
+        return result
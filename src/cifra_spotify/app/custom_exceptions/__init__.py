@@ -22,4 +22,13 @@ def register_exception_handlers(app: FastAPI) -> FastAPI:
         exc_handler.NotPlayeringException, exc_handler.not_playing_exception
     )
 
+    app.add_exception_handler(
+        exc_handler.CifraPageTooLargeException,
+        exc_handler.cifra_page_too_large_handler,
+    )
+
+    app.add_exception_handler(
+        exc_handler.PdfRenderBusyException, exc_handler.pdf_render_busy_handler
+    )
+
     return app
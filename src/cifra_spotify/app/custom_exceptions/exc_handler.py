@@ -2,8 +2,10 @@ from fastapi import Request
 from fastapi.responses import JSONResponse
 
 from .exceptions import (
+    CifraPageTooLargeException,
     CurrentTrackNotFoundException,
     NotPlayeringException,
+    PdfRenderBusyException,
     PlaylistSeachException,
     UserNotAuthenticatedException,
 )
@@ -27,3 +29,17 @@ def user_not_authenticated_exception_handler(
 
 async def not_playing_exception(request: Request, exc: NotPlayeringException):
     return JSONResponse(content=exc.message, status_code=exc.status_code)
+
+
+async def cifra_page_too_large_handler(
+    request: Request, exc: CifraPageTooLargeException
+):
+    return JSONResponse(content=exc.message, status_code=exc.status_code)
+
+
+async def pdf_render_busy_handler(request: Request, exc: PdfRenderBusyException):
+    return JSONResponse(
+        content=exc.message,
+        status_code=exc.status_code,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
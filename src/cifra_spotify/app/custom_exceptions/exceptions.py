@@ -28,3 +28,22 @@ class NotPlayeringException(Exception):
         self.message = message
         self.status_code = status_code
         super().__init__(self.message)
+
+
+class CifraPageTooLargeException(Exception):
+    """Raised when a chord page exceeds ``CIFRA_MAX_PAGE_BYTES`` while streaming."""
+
+    def __init__(self, message: str, status_code: int = 502):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+class PdfRenderBusyException(Exception):
+    """Raised when the PDF render pool has no room for another render."""
+
+    def __init__(self, message: str, status_code: int = 503, retry_after: int = 1):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.retry_after = retry_after
@@ -0,0 +1,48 @@
+from src.cifra_spotify.app.core.cache import SQLiteCache, TieredCache, TTLCache
+from src.cifra_spotify.app.core.config import settings
+
+
+def cifra_cache_key(url: str, tabs: bool) -> str:
+    return f"{url}|tabs={int(tabs)}"
+
+
+def build_cifra_cache() -> TieredCache:
+    """
+    Build the chord-sheet cache from the application settings.
+
+    Parsed pages are kept in an in-process LRU and, when ``CIFRA_CACHE_PATH``
+    is set, persisted to SQLite so they survive restarts.
+    """
+    memory = TTLCache(
+        maxsize=settings.CIFRA_CACHE_MEMORY_ENTRIES, ttl=settings.CIFRA_CACHE_TTL
+    )
+    disk = None
+    if settings.CIFRA_CACHE_PATH:
+        disk = SQLiteCache(
+            settings.CIFRA_CACHE_PATH,
+            ttl=settings.CIFRA_CACHE_TTL,
+            max_entries=settings.CIFRA_CACHE_DISK_ENTRIES,
+            table="cifras",
+        )
+    return TieredCache(memory=memory, disk=disk)
+
+
+def build_search_cache() -> TieredCache:
+    """
+    Build the cache of CifraClub search results.
+
+    It shares the SQLite file of the chord-sheet cache, so a polling worker
+    prefetching in another process also warms the API's searches.
+    """
+    memory = TTLCache(
+        maxsize=settings.CIFRA_SEARCH_CACHE_ENTRIES, ttl=settings.CIFRA_SEARCH_CACHE_TTL
+    )
+    disk = None
+    if settings.CIFRA_CACHE_PATH:
+        disk = SQLiteCache(
+            settings.CIFRA_CACHE_PATH,
+            ttl=settings.CIFRA_SEARCH_CACHE_TTL,
+            max_entries=settings.CIFRA_CACHE_DISK_ENTRIES,
+            table="searches",
+        )
+    return TieredCache(memory=memory, disk=disk)
@@ -1,36 +1,132 @@
 import asyncio
+import importlib.util
 
 import httpx
 from weasyprint import HTML
 
+from src.cifra_spotify.app.core.cache import TieredCache
+from src.cifra_spotify.app.core.config import settings
 from src.cifra_spotify.app.core.logger import logger
+from src.cifra_spotify.app.custom_exceptions.exceptions import (
+    CifraPageTooLargeException,
+)
 from src.cifra_spotify.cifras.cifra_base import Cifra, Instruments
 from src.cifra_spotify.types import cifra as cifra_type
 
+from .cache import cifra_cache_key
 from .parsers.cifraclub import parse_cifra_page
+from .parsers.pool import ParserPool
+from .parsers.scanner import CifraPageScanner
 from .render.cifraclub import render_html_document
-from .util import (
-    compare_artist_name,
-    compare_track,
-    normalize_track_title,
-)
+from .render.pdf import PdfRenderPool
+from .search.matcher import CandidateMatch, rank_candidates
+from .util import normalize_track_title
 
 
 def divisor_medley_default(music_name: str, divisor: str = "/") -> list[str]:
     return [music.strip() for music in music_name.split(divisor)]
 
 
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create the pooled HTTP client shared by every CifraClub request.
+
+    Pool sizes and keep-alive come from the settings; HTTP/2 is only enabled
+    when the optional ``h2`` package is installed.
+    """
+    http2 = settings.CIFRA_HTTP2 and importlib.util.find_spec("h2") is not None
+    limits = httpx.Limits(
+        max_connections=settings.CIFRA_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.CIFRA_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=settings.CIFRA_HTTP_KEEPALIVE_EXPIRY,
+    )
+    logger.info(f"Creating CifraClub HTTP client (http2={http2})")
+    return httpx.AsyncClient(
+        timeout=settings.CIFRA_HTTP_TIMEOUT,
+        limits=limits,
+        http2=http2,
+        follow_redirects=True,
+    )
+
+
 class CifraClub(Cifra):
     url_base = "https://cifraclub.com.br/"
 
-    def __init__(self):
-        self.client = httpx.AsyncClient(timeout=10, follow_redirects=True)
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        cache: TieredCache | None = None,
+        max_concurrency: int = settings.CIFRA_SEARCH_CONCURRENCY,
+        search_cache: TieredCache | None = None,
+        parser_pool: ParserPool | None = None,
+        stream_pages: bool = False,
+        max_page_bytes: int = settings.CIFRA_MAX_PAGE_BYTES,
+        match_top_k: int = settings.CIFRA_MATCH_TOP_K,
+        pdf_renderer: PdfRenderPool | None = None,
+    ):
+        self.client = client or create_http_client()
+        self.cache = cache
+        # Solr search results, keyed by the normalized track title.
+        self.search_cache = search_cache
+        # Without a pool, pages are parsed inline on the event loop.
+        self.parser_pool = parser_pool
+        # Streamed pages are scanned as they arrive, so the pool is not used.
+        self.stream_pages = stream_pages
+        self.max_page_bytes = max_page_bytes
+        # Without a render pool, PDFs are rendered in the default thread pool.
+        self.pdf_renderer = pdf_renderer
+        self._search_semaphore = asyncio.Semaphore(max_concurrency)
+        self.match_top_k = match_top_k
+
+    async def aclose(self):
+        logger.info("Closing CifraClub HTTP client...")
+        await self.client.aclose()
+        if self.cache:
+            await self.cache.aclose()
+        if self.search_cache:
+            await self.search_cache.aclose()
+        if self.parser_pool:
+            await self.parser_pool.aclose()
+        if self.pdf_renderer:
+            await self.pdf_renderer.aclose()
 
     async def _fetch_page(self, uri: str) -> httpx.Response:
         url = self.url_base + uri
         logger.info(f"Fetching page: {url}")
         return await self.client.get(url, follow_redirects=True)
 
+    async def _stream_cifra_page(self, uri: str, tabs: bool) -> cifra_type.CifraType:
+        """
+        Fetch and parse a chord page while it downloads.
+
+        The body is fed to :class:`CifraPageScanner` chunk by chunk and the
+        connection is released as soon as the title and chord block have been
+        read, so the rest of the page is never downloaded or decoded. The key
+        is only picked up if it comes before the chord block, as it does on
+        CifraClub pages; otherwise it is left empty.
+
+        Raises:
+            CifraPageTooLargeException: If more than ``max_page_bytes`` are read
+                before the chord sheet is complete.
+        """
+        url = self.url_base + uri
+        logger.info(f"Streaming page: {url}")
+        scanner = CifraPageScanner(tabs)
+        async with self.client.stream("GET", url, follow_redirects=True) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_text():
+                scanner.feed(chunk)
+                if scanner.has_sheet:
+                    break
+                if response.num_bytes_downloaded > self.max_page_bytes:
+                    raise CifraPageTooLargeException(
+                        f"Cifra page exceeds {self.max_page_bytes} bytes: {url}"
+                    )
+            else:
+                scanner.close()
+            logger.debug(f"Read {response.num_bytes_downloaded} bytes of {url}")
+        return scanner.result()
+
     def _build_url(
         self,
         singer: str,
@@ -50,10 +146,26 @@ class CifraClub(Cifra):
     ):
         logger.info(f"Fetching cifra: {singer} - {music}")
         url = self._build_url(singer, music, instrument)
-        response = await self._fetch_page(url)
-        response.raise_for_status()
-        cifra_page = parse_cifra_page(response, tabs)
+        cache_key = cifra_cache_key(self.url_base + url, tabs)
+        if self.cache:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Cifra cache hit: {cache_key}")
+                return cached
+
+        if self.stream_pages:
+            cifra_page = await self._stream_cifra_page(url, tabs)
+        else:
+            response = await self._fetch_page(url)
+            response.raise_for_status()
+            if self.parser_pool:
+                cifra_page = await self.parser_pool.parse(response.text, tabs)
+            else:
+                cifra_page = parse_cifra_page(response, tabs)
         cifra_page["url"] = self.url_base + url
+
+        if self.cache:
+            await self.cache.set(cache_key, cifra_page)
         return cifra_page
 
     def _generate_pdf(self, html: str):
@@ -93,6 +205,8 @@ class CifraClub(Cifra):
         html: str,
     ) -> bytes:
         logger.info("Generating PDF...")
+        if self.pdf_renderer:
+            return await self.pdf_renderer.render(html)
         return await asyncio.to_thread(self._generate_pdf, html)
 
     async def search_api_cifra(
@@ -106,6 +220,79 @@ class CifraClub(Cifra):
         response.raise_for_status()
         return response
 
+    def _rank_cifras(
+        self, docs: list[dict], music: str, singer: str, check_singer: bool
+    ) -> list[CandidateMatch]:
+        ranked = rank_candidates(
+            docs,
+            music,
+            singer,
+            check_singer,
+            threshold=80,
+            top_k=self.match_top_k,
+        )
+        if not ranked:
+            logger.error(
+                f"Music not found among {len(docs)} results: {singer} - {music}"
+            )
+        for match in ranked:
+            logger.debug(
+                f"Candidate {match.doc['art']} - {match.doc['txt']} "
+                f"(score {match.score:.0f})"
+            )
+        return ranked
+
+    async def _search_docs(self, music: str) -> list[dict]:
+        key = normalize_track_title(music)
+        if self.search_cache is not None:
+            docs = await self.search_cache.get(key)
+            if docs is not None:
+                logger.debug(f"Search cache hit: {key}")
+                return docs
+
+        async with self._search_semaphore:
+            cifra_result = await self.search_api_cifra(music)
+
+        docs = cifra_result.json()["response"]["docs"] if cifra_result else []
+        # An empty result may be a transient Solr failure; don't pin it.
+        if docs and self.search_cache is not None:
+            await self.search_cache.set(key, docs)
+        return docs
+
+    async def _search_and_fetch(
+        self,
+        singer: str,
+        music: str,
+        check_singer: bool,
+        instrument: Instruments,
+        tabs: bool,
+    ) -> cifra_type.CifraType | None:
+        docs = await self._search_docs(music)
+        if not docs:
+            return None
+
+        # Only the winner is fetched; the runners-up are tried in order if its
+        # page turns out to be missing, unreachable, too large or not a chord
+        # sheet.
+        for match in self._rank_cifras(docs, music, singer, check_singer):
+            try:
+                cifra_page = await self._fetch_cifra(
+                    singer=match.doc["dns"],
+                    music=match.doc["url"],
+                    tabs=tabs,
+                    instrument=instrument,
+                )
+            except (
+                httpx.HTTPStatusError,
+                httpx.TransportError,
+                CifraPageTooLargeException,
+                ValueError,
+            ) as exc:
+                logger.warning(f"Falling back from {match.doc['url']}: {exc}")
+                continue
+            return {**cifra_page, "confidence": match.confidence}
+        return None
+
     async def search_musics(
         self,
         singer: str,
@@ -114,57 +301,23 @@ class CifraClub(Cifra):
         tabs: bool = True,
         medley_splitter: cifra_type.MedleySplitter | None = divisor_medley_default,
     ):
-        musics = medley_splitter(music)
-        all_music = []
-        for music in musics:
-            cifra_result = await self.search_api_cifra(music)
-            urls_cifras = []
-            if cifra_result:
-                for cifra in cifra_result.json()["response"]["docs"]:
-                    try:
-                        music_api_name = cifra["txt"]
-                        singer_api_name = cifra["art"]
-                        singer_dns = cifra["dns"]
-                        music_url_api = cifra["url"]
-                    except KeyError:
-                        continue
-                    music_match_result = compare_track(
-                        music_api_name, music, threshold=80
-                    )
-                    if len(musics) == 1:
-                        singer_match_result = compare_artist_name(
-                            singer_api_name, singer, threshold=80
-                        )
-                    else:
-                        singer_match_result = {"match": True}
-
-                    if (
-                        not music_match_result["match"]
-                        or not singer_match_result["match"]
-                    ):
-                        logger.error(
-                            f"Music not found: {music_api_name} - {singer_api_name}"
-                        )
-                        continue
-                    else:
-                        urls_cifras.append(
-                            {
-                                "url": music_url_api,
-                                "singer": singer_dns,
-                                "music": music_api_name,
-                            }
-                        )
-                        break
-            all_music.extend(urls_cifras)
-
-        return await asyncio.gather(
+        if medley_splitter:
+            musics = medley_splitter(music)
+        else:
+            musics = [music]
+
+        # Each part fetches its page as soon as its own search resolves;
+        # gather keeps the results in medley order.
+        results = await asyncio.gather(
             *[
-                self._fetch_cifra(
-                    singer=music["singer"],
-                    music=music["url"],
-                    tabs=tabs,
+                self._search_and_fetch(
+                    singer=singer,
+                    music=part,
+                    check_singer=len(musics) == 1,
                     instrument=instrument,
+                    tabs=tabs,
                 )
-                for music in all_music
+                for part in musics
             ]
         )
+        return [result for result in results if result is not None]
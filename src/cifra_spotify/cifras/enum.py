@@ -4,3 +4,8 @@ import enum
 class SitesCifra(str, enum.Enum):
     CIFRAS_CLUB = "cifraclub.com.br"
     BANANAS = "bananacifras.com.br"
+
+
+class SongbookFormat(str, enum.Enum):
+    HTML = "html"
+    PDF = "pdf"
@@ -0,0 +1,186 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+# Palavras que indicam versões da música
+TRACK_VERSION_KEYWORDS = (
+    "live",
+    "ao vivo",
+    "acoustic",
+    "remaster",
+    "remastered",
+    "version",
+    "edit",
+    "mix",
+    "deluxe",
+)
+
+ARTIGOS = frozenset({"a", "o", "as", "os", "e"})
+
+_PARENTHESES = re.compile(r"[\(\[].*?[\)\]]")
+_HYPHEN_SUFFIX = re.compile(r"\s-\s")
+_REPEATED_SPACES = re.compile(r"\s{2,}")
+# Substring match, like ``any(k in part for k in TRACK_VERSION_KEYWORDS)``.
+_VERSION_KEYWORD = re.compile("|".join(map(re.escape, TRACK_VERSION_KEYWORDS)))
+_NON_SLUG = re.compile(r"[^a-z0-9\s]")
+
+CACHE_SIZE = 4096
+
+
+class _AccentTable(dict):
+    """
+    ``str.translate`` table removing combining marks after decomposition.
+
+    Each character is decomposed once, on first sight, and the result is
+    memoized. Decomposing character by character is equivalent to
+    decomposing the whole string because every mark that canonical
+    reordering could move is dropped anyway.
+    """
+
+    def __init__(self, form: str):
+        super().__init__()
+        self.form = form
+
+    def __missing__(self, codepoint: int) -> str:
+        decomposed = unicodedata.normalize(self.form, chr(codepoint))
+        stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+        self[codepoint] = stripped
+        return stripped
+
+
+_NFD_ACCENTS = _AccentTable("NFD")
+_NFKD_ACCENTS = _AccentTable("NFKD")
+
+
+def strip_accents(text: str, compatibility: bool = False) -> str:
+    """
+    Remove accents and other combining marks from ``text``.
+
+    Args:
+        text (str): Input text.
+        compatibility (bool): Use NFKD instead of NFD, also folding
+            compatibility characters such as ligatures and full-width forms.
+
+    Returns:
+        str: Text without combining marks.
+    """
+    if text.isascii():
+        return text
+    return text.translate(_NFKD_ACCENTS if compatibility else _NFD_ACCENTS)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_text(text: str) -> str:
+    """
+    Normalizes a text string for comparison.
+
+    The normalization removes accents, converts the text to lowercase,
+    and trims surrounding whitespace. This helps ensure consistent
+    string comparisons regardless of accents or case differences.
+
+    Example:
+        "Díana " -> "diana"
+
+    Args:
+        text (str): Input text to normalize.
+
+    Returns:
+        str: Normalized text.
+    """
+    if not text:
+        return ""
+    return strip_accents(text, compatibility=True).lower().strip()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_track_title(title: str) -> str:
+    """
+    Normaliza o título de uma música removendo informações extras comuns
+    em metadados de plataformas de streaming, como versões ao vivo,
+    acústicas ou remasterizadas.
+
+    A função remove termos entre parênteses, colchetes ou hífens que
+    contenham palavras relacionadas a versões da música.
+
+    Exemplos removidos:
+    - (Ao Vivo)
+    - (Live)
+    - (Live at ...)
+    - (Acoustic)
+    - (Remastered 2011)
+    - - Ao Vivo
+    - - Live Version
+    - [Live]
+
+    Parâmetros
+    ----------
+    title : str
+        Título original da música retornado pela API do Spotify
+        ou outra fonte de metadados.
+
+    Retorno
+    -------
+    str
+        Título da música normalizado, contendo apenas o nome principal.
+
+    Exemplos
+    --------
+    >>> normalize_track_title("Evidências (Ao Vivo)")
+    'Evidências'
+
+    >>> normalize_track_title("Hotel California - Live")
+    'Hotel California'
+
+    >>> normalize_track_title("Tempo Perdido (Remastered 2015)")
+    'Tempo Perdido'
+    """
+
+    if not title:
+        return title
+
+    # Remove conteúdos entre () ou []
+    if "(" in title or "[" in title:
+        for part in _PARENTHESES.findall(title):
+            if _VERSION_KEYWORD.search(part.lower()):
+                title = title.replace(part, "")
+
+    # Remove sufixos após hífen
+    if "-" in title:
+        parts = _HYPHEN_SUFFIX.split(title)
+        if len(parts) > 1 and _VERSION_KEYWORD.search(parts[-1].lower()):
+            title = parts[0]
+
+    # Limpeza final
+    return _REPEATED_SPACES.sub(" ", title).strip()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def slugify_cifraclub(text: str) -> str:
+    """
+    Converts a text string into a slug compatible with CifraClub URLs.
+
+    This function normalizes the text by removing accents, converting to
+    lowercase, removing special characters, and replacing spaces with hyphens.
+    It also removes Portuguese articles (defined in ARTIGOS) from the text,
+    except for the first word, to better match the slug format used by
+    CifraClub URLs.
+
+    Example:
+        "O Amor de Deus" -> "o-amor-deus"
+
+    Args:
+        text (str): Input text, usually a music title or artist name.
+
+    Returns:
+        str: Slugified version of the text suitable for URL usage.
+    """
+    # minusculo e apenas letras/numeros/espaco
+    text = _NON_SLUG.sub("", strip_accents(text).lower())
+
+    palavras = text.split()
+
+    if not palavras:
+        return ""
+
+    # mantém a primeira palavra sempre, remove artigos a partir da segunda
+    return "-".join([palavras[0], *(p for p in palavras[1:] if p not in ARTIGOS)])
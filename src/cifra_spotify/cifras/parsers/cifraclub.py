@@ -1,13 +1,18 @@
+from collections.abc import Callable
+
 import httpx
 from bs4 import BeautifulSoup
 
+from src.cifra_spotify.app.core.config import settings
 from src.cifra_spotify.types import cifra as cifra_type
 
+from .scanner import scan_cifra_page
 
-def parse_cifra_page(
-    response: httpx.Response, tabs: bool = False
-) -> cifra_type.CifraType:
-    soup = BeautifulSoup(response.text, "html.parser")
+ParserBackend = Callable[[str, bool], cifra_type.CifraType]
+
+
+def parse_with_bs4(text: str, tabs: bool = False) -> cifra_type.CifraType:
+    soup = BeautifulSoup(text, "html.parser")
     tom_musica = soup.find("span", id="cifra_tom")
     tom_texto = tom_musica.get_text(strip=True) if tom_musica else ""
     element = soup.find("h1", class_="t1")
@@ -28,3 +33,36 @@ def parse_cifra_page(
         "cifra": str(pre),
         "music_name": music_name,
     }
+
+
+def parse_with_scanner(text: str, tabs: bool = False) -> cifra_type.CifraType:
+    return scan_cifra_page(text, tabs)
+
+
+# Every backend must return exactly the same result for the same page.
+PARSER_BACKENDS: dict[str, ParserBackend] = {
+    "bs4": parse_with_bs4,
+    "scanner": parse_with_scanner,
+}
+
+
+def get_parser(name: str | None = None) -> ParserBackend:
+    name = name or settings.CIFRA_PARSER
+    try:
+        return PARSER_BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown cifra parser '{name}'. Use one of: {', '.join(PARSER_BACKENDS)}"
+        ) from None
+
+
+def parse_cifra_html(
+    text: str, tabs: bool = False, backend: str | None = None
+) -> cifra_type.CifraType:
+    return get_parser(backend)(text, tabs)
+
+
+def parse_cifra_page(
+    response: httpx.Response, tabs: bool = False
+) -> cifra_type.CifraType:
+    return parse_cifra_html(response.text, tabs)
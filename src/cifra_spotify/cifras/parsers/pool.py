@@ -0,0 +1,143 @@
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from src.cifra_spotify.app.core.config import settings
+from src.cifra_spotify.app.core.logger import logger
+from src.cifra_spotify.app.core.metrics import LatencyHistogram
+from src.cifra_spotify.types import cifra as cifra_type
+
+from .cifraclub import get_parser, parse_cifra_html
+
+POOL_KINDS = frozenset({"thread", "process"})
+
+
+def _timed_parse(
+    text: str, tabs: bool, backend: str
+) -> tuple[cifra_type.CifraType, float]:
+    # Runs in the worker, so the measured time excludes the queue wait.
+    started = time.perf_counter()
+    result = parse_cifra_html(text, tabs, backend)
+    return result, time.perf_counter() - started
+
+
+class ParserPool:
+    """
+    Run chord page parsing off the event loop.
+
+    Parsing a large page is pure CPU work; done inline it blocks every other
+    request served by the loop. The pool hands it to a thread pool, or to a
+    process pool to use more than one core, and bounds the number of pages
+    submitted at once: callers beyond ``max_pending`` wait for a free slot
+    instead of piling up in the executor queue.
+
+    Args:
+        kind (str): ``"thread"`` or ``"process"``.
+        workers (int, optional): Pool size. Defaults to the CPU count.
+        max_pending (int): Pages submitted to the executor at once.
+        backend (str, optional): Parser backend name (see
+            :data:`PARSER_BACKENDS`). Defaults to ``CIFRA_PARSER``.
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        workers: int | None = None,
+        max_pending: int = 64,
+        backend: str | None = None,
+    ):
+        if kind not in POOL_KINDS:
+            raise ValueError(
+                f"Unknown parser pool '{kind}'. Use one of: {', '.join(sorted(POOL_KINDS))}"
+            )
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        # Resolved here so process workers do not depend on their own settings.
+        self.backend = backend or settings.CIFRA_PARSER
+        get_parser(self.backend)
+
+        self._executor: Executor | None = None
+        self._slots = asyncio.Semaphore(max_pending)
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.queue_wait = LatencyHistogram()
+        self.parse_time = LatencyHistogram()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            logger.info(f"[Parser] Starting {self.kind} pool ({self.workers} workers)")
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="cifra-parser"
+                )
+        return self._executor
+
+    async def parse(self, text: str, tabs: bool = False) -> cifra_type.CifraType:
+        """
+        Parse a chord page in the pool.
+
+        Raises:
+            ValueError: Propagated from the parser when the page has no
+                title or chord sheet.
+        """
+        loop = asyncio.get_running_loop()
+        queued = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            result, seconds = await loop.run_in_executor(
+                self._get_executor(), _timed_parse, text, tabs, self.backend
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+        # Time waiting for a slot, in the executor queue and in transit.
+        self.queue_wait.observe(max(time.perf_counter() - queued - seconds, 0))
+        self.parse_time.observe(seconds)
+        self.completed += 1
+        return result
+
+    async def aclose(self):
+        if self._executor is not None:
+            logger.info("[Parser] Shutting down pool...")
+            await asyncio.to_thread(self._executor.shutdown, wait=True)
+            self._executor = None
+
+    def metrics(self) -> dict:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "queue_wait": self.queue_wait.as_dict(),
+            "parse_time": self.parse_time.as_dict(),
+        }
+
+
+def build_parser_pool() -> ParserPool | None:
+    """Build the parser pool from the settings; ``None`` parses inline."""
+    if settings.CIFRA_PARSER_POOL == "inline":
+        return None
+    return ParserPool(
+        kind=settings.CIFRA_PARSER_POOL,
+        workers=settings.CIFRA_PARSER_WORKERS,
+        max_pending=settings.CIFRA_PARSER_MAX_PENDING,
+    )
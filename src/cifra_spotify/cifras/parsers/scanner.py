@@ -0,0 +1,309 @@
+import re
+from collections import Counter
+from html.parser import HTMLParser
+
+from bs4.builder import HTMLParserTreeBuilder
+from bs4.dammit import EntitySubstitution, UnicodeDammit
+
+from src.cifra_spotify.types import cifra as cifra_type
+
+# Reuse Beautiful Soup's own tables so the output matches
+# ``str(soup.find("pre"))`` and ``get_text(strip=True)`` character for character.
+_BUILDER = HTMLParserTreeBuilder()
+_VOID_TAGS = frozenset(_BUILDER.empty_element_tags)
+_PRESERVE_WHITESPACE_TAGS = frozenset(_BUILDER.preserve_whitespace_tags)
+_STRING_CONTAINER_TAGS = frozenset(_BUILDER.string_containers)
+_MULTI_VALUED_ANY = frozenset(_BUILDER.cdata_list_attributes.get("*", ()))
+_MULTI_VALUED = {
+    tag: _MULTI_VALUED_ANY | frozenset(names)
+    for tag, names in _BUILDER.cdata_list_attributes.items()
+}
+_UNESCAPED_TEXT_TAGS = frozenset({"script", "style"})
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+_NON_WHITESPACE = re.compile(r"\S+")
+_DECIMAL_REFERENCE = re.compile("^([0-9]+)(.*)")
+_HEX_REFERENCE = re.compile("^([0-9a-f]+)(.*)")
+
+_TEXT = ("", "")
+_CDATA = ("<![CDATA[", "]]>")
+_COMMENT = ("<!--", "-->")
+_DECLARATION = ("<?", "?>")
+_DOCTYPE = ("<!DOCTYPE ", ">\n")
+_PROCESSING_INSTRUCTION = ("<?", ">")
+
+
+class _TextCapture:
+    """Collects ``get_text(strip=True)`` of one element while it is open."""
+
+    def __init__(self, depth: int):
+        self.depth = depth
+        self.parts: list[str] = []
+
+
+class CifraPageScanner(HTMLParser):
+    """
+    Incremental extractor for CifraClub chord pages.
+
+    Produces the same result as the Beautiful Soup based parser without
+    building a document tree: the tokenizer events are tracked on a stack of
+    open tag names, the text of ``span#cifra_tom`` and ``h1.t1`` is captured
+    as it streams by, and the first ``<pre>`` is serialized on the fly. Once
+    all three have been seen, :attr:`done` is set and the rest of the page
+    can be skipped. :attr:`has_sheet` is set as soon as the title and the
+    ``<pre>`` are read, for callers that accept a missing key rather than
+    reading on until the end of a page without one.
+
+    Args:
+        tabs (bool): Keep ``span.tablatura`` blocks inside the ``<pre>``.
+    """
+
+    def __init__(self, tabs: bool = False):
+        super().__init__(convert_charrefs=False)
+        self.tabs = tabs
+        self.done = False
+
+        self._stack: list[str] = []
+        self._open = Counter()
+        self._closed_void: list[str] = []
+        self._data: list[str] = []
+        self._preserve: list[int] = []
+        self._containers: list[int] = []
+
+        self._tom: _TextCapture | None = None
+        self._title: _TextCapture | None = None
+        self._tom_text: str | None = None
+        self._title_text: str | None = None
+
+        self._pre_depth: int | None = None
+        self._pre_parts: list[str] = []
+        self._pre_html: str | None = None
+        self._skip_depth: int | None = None
+
+    # Tokenizer events, mirroring bs4.builder._htmlparser.
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, handle_empty_element=False)
+        self.handle_endtag(tag, check_already_closed=False)
+
+    def handle_starttag(self, tag, attrs, handle_empty_element=True):
+        if self.done:
+            return
+        attr_dict = {}
+        for key, value in attrs:
+            attr_dict[key] = "" if value is None else value
+
+        self._flush()
+        self._push(tag, attr_dict)
+        if tag in _VOID_TAGS and handle_empty_element:
+            self.handle_endtag(tag, check_already_closed=False)
+            self._closed_void.append(tag)
+
+    def handle_endtag(self, tag, check_already_closed=True):
+        if self.done:
+            return
+        if check_already_closed and tag in self._closed_void:
+            self._closed_void.remove(tag)
+            return
+
+        self._flush()
+        if not self._open[tag]:
+            return
+        while self._stack and self._pop() != tag:
+            pass
+
+    def handle_data(self, data):
+        if not self.done:
+            self._data.append(data)
+
+    def handle_charref(self, name):
+        base, pattern = 10, _DECIMAL_REFERENCE
+        if name.startswith(("x", "X")):
+            name, base, pattern = name[1:], 16, _HEX_REFERENCE
+
+        extra = ""
+        try:
+            number = int(name, base)
+        except ValueError:
+            match = pattern.search(name)
+            if match is None:
+                self.handle_data(name)
+                return
+            number, extra = int(match.group(1), base), match.group(2)
+
+        self.handle_data(UnicodeDammit.numeric_character_reference(number)[0])
+        if extra:
+            self.handle_data(extra)
+
+    def handle_entityref(self, name):
+        character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self.handle_data(character if character is not None else f"&{name}")
+
+    def handle_comment(self, data):
+        self._special(data, _COMMENT)
+
+    def handle_decl(self, decl):
+        self._special(decl[len("DOCTYPE ") :], _DOCTYPE)
+
+    def unknown_decl(self, data):
+        if data.upper().startswith("CDATA["):
+            self._special(data[len("CDATA[") :], _CDATA)
+        else:
+            self._special(data, _DECLARATION)
+
+    def handle_pi(self, data):
+        self._special(data, _PROCESSING_INSTRUCTION)
+
+    def close(self):
+        super().close()
+        if self.done:
+            return
+        self._flush()
+        while self._stack:
+            self._pop()
+
+    # Tree bookkeeping.
+
+    def _special(self, data: str, kind: tuple[str, str]):
+        if self.done:
+            return
+        self._flush()
+        self._data.append(data)
+        self._flush(kind)
+
+    def _flush(self, kind: tuple[str, str] = _TEXT):
+        if not self._data:
+            return
+        data = "".join(self._data)
+        self._data = []
+        if not self._preserve and not data.strip(_ASCII_SPACES):
+            data = "\n" if "\n" in data else " "
+
+        plain = (kind is _TEXT and not self._containers) or kind is _CDATA
+        if plain and (self._tom or self._title):
+            stripped = data.strip()
+            if stripped:
+                for capture in (self._tom, self._title):
+                    if capture:
+                        capture.parts.append(stripped)
+
+        if self._pre_depth is not None and self._skip_depth is None:
+            if kind is _TEXT and self._stack[-1] not in _UNESCAPED_TEXT_TAGS:
+                data = EntitySubstitution.substitute_xml(data)
+            self._pre_parts.append(kind[0] + data + kind[1])
+
+    def _push(self, tag: str, attrs: dict[str, str]):
+        self._stack.append(tag)
+        self._open[tag] += 1
+        depth = len(self._stack)
+        if tag in _PRESERVE_WHITESPACE_TAGS:
+            self._preserve.append(depth)
+        if tag in _STRING_CONTAINER_TAGS:
+            self._containers.append(depth)
+
+        for key in attrs.keys() & _MULTI_VALUED.get(tag, _MULTI_VALUED_ANY):
+            attrs[key] = _NON_WHITESPACE.findall(attrs[key])
+        classes = attrs.get("class", ())
+
+        wants_tom = self._tom_text is None and self._tom is None
+        wants_title = self._title_text is None and self._title is None
+        if wants_tom and tag == "span" and attrs.get("id") == "cifra_tom":
+            self._tom = _TextCapture(depth)
+        if wants_title and tag == "h1" and "t1" in classes:
+            self._title = _TextCapture(depth)
+
+        if self._pre_depth is None:
+            if tag == "pre" and self._pre_html is None:
+                self._pre_depth = depth
+            else:
+                return
+        if self._skip_depth is not None:
+            return
+        if not self.tabs and tag == "span" and "tablatura" in classes:
+            self._skip_depth = depth
+            return
+        self._pre_parts.append(self._format_start_tag(tag, attrs))
+
+    def _pop(self) -> str:
+        depth = len(self._stack)
+        tag = self._stack.pop()
+        self._open[tag] -= 1
+        if self._preserve and self._preserve[-1] == depth:
+            self._preserve.pop()
+        if self._containers and self._containers[-1] == depth:
+            self._containers.pop()
+
+        if self._tom and self._tom.depth == depth:
+            self._tom_text = "".join(self._tom.parts)
+            self._tom = None
+        if self._title and self._title.depth == depth:
+            self._title_text = "".join(self._title.parts)
+            self._title = None
+
+        if self._pre_depth is not None:
+            if self._skip_depth == depth:
+                self._skip_depth = None
+            elif self._skip_depth is None and tag not in _VOID_TAGS:
+                self._pre_parts.append(f"</{tag}>")
+            if self._pre_depth == depth:
+                self._pre_html = "".join(self._pre_parts)
+                self._pre_depth = None
+                self._pre_parts = []
+
+        if (
+            self._pre_html is not None
+            and self._title_text is not None
+            and self._tom_text is not None
+        ):
+            self.done = True
+        return tag
+
+    @property
+    def has_sheet(self) -> bool:
+        """Title and chord block read, and not inside ``span#cifra_tom``."""
+        return (
+            self._title_text is not None
+            and self._pre_html is not None
+            and self._tom is None
+        )
+
+    @staticmethod
+    def _format_start_tag(tag: str, attrs: dict[str, str | list[str]]) -> str:
+        parts = [tag]
+        for key, value in sorted(attrs.items()):
+            if isinstance(value, list):
+                value = " ".join(value)
+            value = EntitySubstitution.substitute_xml(value)
+            parts.append(f"{key}={EntitySubstitution.quoted_attribute_value(value)}")
+        suffix = "/>" if tag in _VOID_TAGS else ">"
+        return "<" + " ".join(parts) + suffix
+
+    def result(self) -> cifra_type.CifraType:
+        """
+        Extracted page data.
+
+        Raises:
+            ValueError: If the title or the ``<pre>`` block is missing.
+        """
+        if self._title_text is None:
+            raise ValueError("Music name not found")
+        if self._pre_html is None:
+            raise ValueError("Cifra not found")
+        return {
+            "tom": (self._tom_text or "").replace("tom:", ""),
+            "cifra": self._pre_html,
+            "music_name": self._title_text,
+        }
+
+
+def scan_cifra_page(
+    text: str, tabs: bool = False, chunk_size: int = 16 * 1024
+) -> cifra_type.CifraType:
+    """Parse a chord page with :class:`CifraPageScanner`, stopping early."""
+    scanner = CifraPageScanner(tabs)
+    for start in range(0, len(text), chunk_size):
+        scanner.feed(text[start : start + chunk_size])
+        if scanner.done:
+            break
+    else:
+        scanner.close()
+    return scanner.result()
@@ -41,9 +41,8 @@ async def get_current_track_with_genres(spotify: SpotifyAPI) -> SongData | None:
 
     genres = []
     if first_artist and first_artist.get("id"):
-        artist_response = await spotify.get_artist(first_artist["id"])
-        artist_data = artist_response.json()
-        genres = artist_data.get("genres", [])
+        artists = await spotify.get_artists_metadata([first_artist["id"]])
+        genres = artists.get(first_artist["id"], {}).get("genres", [])
 
     result = {
         "track_name": item.get("name"),
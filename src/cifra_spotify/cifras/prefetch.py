@@ -0,0 +1,123 @@
+import asyncio
+
+from src.cifra_spotify.app.core.cache import TTLCache
+from src.cifra_spotify.app.core.logger import logger
+from src.cifra_spotify.cifras.cifra_base import Instruments
+from src.cifra_spotify.cifras.cifra_club import CifraClub
+from src.cifra_spotify.spotify.pooling import SpotifyPollingService
+from src.cifra_spotify.spotify.ratelimit import background_priority
+from src.cifra_spotify.spotify.spotify import SpotifyAPI
+
+
+class ChordPrefetcher:
+    """
+    Warm the chord caches as soon as the polling service sees a new track.
+
+    :meth:`attach` registers ``start``/``change`` hooks that return right
+    away and run :meth:`CifraClub.search_musics` for the new track in a
+    background task, so by the time the musician calls ``/api/cifra/`` the
+    search and the page are already cached. With ``queue_depth`` set, the
+    next tracks in the listener's Spotify queue are prefetched as well.
+
+    Tracks are deduplicated by Spotify ID for ``dedupe_ttl`` seconds.
+
+    Prefetching only happens for accounts that something is polling. In the
+    polling worker that is every account it serves. In the API process the
+    prefetcher is attached to the now-playing broadcaster, so an account is
+    only prefetched while it has an SSE or WebSocket subscriber; run the
+    worker with ``CIFRA_PREFETCH`` to warm the shared caches for everyone.
+
+    Args:
+        cifra_club (CifraClub): Client whose caches are warmed.
+        instrument (Instruments): Instrument requested when prefetching.
+        tabs (bool): Whether the prefetched pages keep tablature.
+        queue_depth (int): Upcoming queue tracks to prefetch; ``0`` disables.
+        max_concurrency (int): Prefetches running at once.
+        dedupe_ttl (float): Seconds a track is not prefetched again.
+    """
+
+    def __init__(
+        self,
+        cifra_club: CifraClub,
+        instrument: Instruments = Instruments.GUITAR,
+        tabs: bool = True,
+        queue_depth: int = 0,
+        max_concurrency: int = 2,
+        dedupe_ttl: float = 60 * 60,
+    ):
+        self.cifra_club = cifra_club
+        self.instrument = instrument
+        self.tabs = tabs
+        self.queue_depth = queue_depth
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._seen = TTLCache(maxsize=4096, ttl=dedupe_ttl)
+        self._tasks: set[asyncio.Task] = set()
+        self.prefetched = 0
+        self.failed = 0
+
+    def attach(self, service: SpotifyPollingService):
+        async def on_track(event: dict):
+            self.schedule(event, service.api)
+
+        service.add_hook("start", on_track)
+        service.add_hook("change", on_track)
+
+    def schedule(self, track: dict, api: SpotifyAPI | None = None):
+        """Prefetch ``track`` (a polling event payload) in the background."""
+        task = asyncio.create_task(self._run(track, api))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, track: dict, api: SpotifyAPI | None):
+        await self.prefetch(track.get("id"), track.get("name"), track.get("artist"))
+        if not api or not self.queue_depth:
+            return
+
+        try:
+            with background_priority():
+                response = await api.get_queue()
+        except Exception as exc:
+            logger.warning(f"[Prefetch] Could not read the queue: {exc}")
+            return
+        if response.status_code != 200:
+            return
+
+        upcoming = (response.json().get("queue") or [])[: self.queue_depth]
+        await asyncio.gather(
+            *[
+                self.prefetch(
+                    item.get("id"),
+                    item.get("name"),
+                    (item.get("artists") or [{}])[0].get("name"),
+                )
+                for item in upcoming
+            ]
+        )
+
+    async def prefetch(self, track_id: str | None, name: str, artist: str):
+        if not name or not artist:
+            return
+        key = track_id or f"{artist}|{name}"
+        if self._seen.get(key):
+            return
+        self._seen.set(key, True)
+
+        async with self._semaphore:
+            logger.info(f"[Prefetch] Warming chords for {artist} - {name}")
+            try:
+                await self.cifra_club.search_musics(
+                    singer=artist,
+                    music=name,
+                    instrument=self.instrument,
+                    tabs=self.tabs,
+                )
+                self.prefetched += 1
+            except Exception as exc:
+                self.failed += 1
+                self._seen.delete(key)
+                logger.warning(f"[Prefetch] Failed for {artist} - {name}: {exc}")
+
+    async def aclose(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
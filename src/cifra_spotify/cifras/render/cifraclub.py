@@ -1,3 +1,5 @@
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+
 from src.cifra_spotify.app.core.logger import logger
 from src.cifra_spotify.types import cifra as cifra_type
 
@@ -91,12 +93,28 @@ def _render_footer() -> str:
     """
 
 
-def render_html_document(songs: list[cifra_type.CifraType]) -> str:
-    html = _render_header()
+def _render_song(song: cifra_type.CifraType) -> str:
+    logger.debug(f"Rendering song: {song['music_name']}")
+    return _render_song_section(song["music_name"], song["tom"], song["cifra"])
+
 
+def iter_html_document(songs: Iterable[cifra_type.CifraType]) -> Iterator[str]:
+    """Yield the songbook document in chunks: header, one per song, footer."""
+    yield _render_header()
     for song in songs:
-        logger.debug(f"Rendering song: {song['music_name']}")
-        html += _render_song_section(song["music_name"], song["tom"], song["cifra"])
+        yield _render_song(song)
+    yield _render_footer()
+
+
+async def aiter_html_document(
+    songs: AsyncIterable[cifra_type.CifraType],
+) -> AsyncIterator[str]:
+    """Async :func:`iter_html_document`, rendering songs as they arrive."""
+    yield _render_header()
+    async for song in songs:
+        yield _render_song(song)
+    yield _render_footer()
+
 
-    html += _render_footer()
-    return html
+def render_html_document(songs: Iterable[cifra_type.CifraType]) -> str:
+    return "".join(iter_html_document(songs))
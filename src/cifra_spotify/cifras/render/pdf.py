@@ -0,0 +1,158 @@
+import asyncio
+import hashlib
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from weasyprint import HTML
+
+from src.cifra_spotify.app.core.config import settings
+from src.cifra_spotify.app.core.logger import logger
+from src.cifra_spotify.app.core.metrics import LatencyHistogram
+from src.cifra_spotify.app.core.singleflight import SingleFlight
+from src.cifra_spotify.app.custom_exceptions.exceptions import (
+    PdfRenderBusyException,
+)
+
+from .cifraclub import _render_footer, _render_header
+
+
+def _warm_worker():
+    # Lays out the songbook stylesheet once so fontconfig, the fonts used by
+    # the CSS and WeasyPrint's own modules are loaded before the first request.
+    HTML(string=_render_header() + _render_footer()).write_pdf()
+
+
+def _ping() -> bool:
+    return True
+
+
+def render_pdf(html: str) -> tuple[bytes, float]:
+    started = time.perf_counter()
+    pdf = HTML(string=html).write_pdf()
+    return pdf, time.perf_counter() - started
+
+
+def content_key(html: str) -> str:
+    return hashlib.sha256(html.encode()).hexdigest()
+
+
+class PdfRenderPool:
+    """
+    Render songbook PDFs in a pool of warm WeasyPrint processes.
+
+    WeasyPrint layout is CPU bound and holds the GIL, so renders run in
+    separate processes, each warmed up with the songbook stylesheet when it
+    starts. Identical documents are rendered once: concurrent requests share
+    the in-flight render and finished PDFs are kept for ``cache_ttl`` seconds,
+    keyed by the SHA-256 of the HTML.
+
+    At most ``max_pending`` renders are admitted (running or queued); beyond
+    that :class:`PdfRenderBusyException` is raised right away so the client
+    can retry, instead of waiting behind a long queue. Its ``Retry-After``
+    is the time the admitted renders should take, from the mean render time.
+
+    Args:
+        workers (int): Number of render processes.
+        max_pending (int): Renders admitted at once.
+        cache_entries (int): Finished PDFs kept in memory.
+        cache_ttl (float): Seconds a finished PDF is reused. ``0`` disables it.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_pending: int = 8,
+        cache_entries: int = 32,
+        cache_ttl: float = 3600,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: ProcessPoolExecutor | None = None
+        self._renders = SingleFlight(ttl=cache_ttl, maxsize=cache_entries)
+        self.pending = 0
+        self.rendered = 0
+        self.rejected = 0
+        self.render_time = LatencyHistogram()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            logger.info(f"[PDF] Starting render pool ({self.workers} workers)")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_warm_worker
+            )
+        return self._executor
+
+    async def start(self):
+        """Spawn and warm every worker before the first request."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(
+            *[loop.run_in_executor(executor, _ping) for _ in range(self.workers)]
+        )
+
+    async def render(self, html: str) -> bytes:
+        """
+        Render ``html`` to PDF, reusing a cached or in-flight render.
+
+        Raises:
+            PdfRenderBusyException: If ``max_pending`` renders are admitted.
+        """
+        return await self._renders.do(content_key(html), lambda: self._render(html))
+
+    async def _render(self, html: str) -> bytes:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            logger.warning(f"[PDF] Rejecting render, {self.pending} pending")
+            raise PdfRenderBusyException(
+                "PDF renderer is busy, try again later.",
+                retry_after=self.retry_after(),
+            )
+
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        try:
+            pdf, seconds = await loop.run_in_executor(
+                self._get_executor(), render_pdf, html
+            )
+        finally:
+            self.pending -= 1
+
+        self.rendered += 1
+        self.render_time.observe(seconds)
+        return pdf
+
+    def retry_after(self) -> int:
+        """Seconds until the admitted renders are likely done."""
+        histogram = self.render_time
+        mean = histogram.sum / histogram.count if histogram.count else 1.0
+        return max(1, math.ceil(mean * self.pending / self.workers))
+
+    async def aclose(self):
+        if self._executor is not None:
+            logger.info("[PDF] Shutting down render pool...")
+            await asyncio.to_thread(self._executor.shutdown, wait=True)
+            self._executor = None
+
+    def metrics(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rendered": self.rendered,
+            "cached": self._renders.coalesced,
+            "rejected": self.rejected,
+            "render_time": self.render_time.as_dict(),
+        }
+
+
+def build_pdf_renderer() -> PdfRenderPool | None:
+    """PDF render pool from the settings; ``None`` renders in a thread."""
+    if settings.CIFRA_PDF_WORKERS <= 0:
+        return None
+    return PdfRenderPool(
+        workers=settings.CIFRA_PDF_WORKERS,
+        max_pending=settings.CIFRA_PDF_MAX_PENDING,
+        cache_entries=settings.CIFRA_PDF_CACHE_ENTRIES,
+        cache_ttl=settings.CIFRA_PDF_CACHE_TTL,
+    )
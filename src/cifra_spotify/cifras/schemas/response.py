@@ -30,6 +30,12 @@ class ChordResult(BaseModel):
         default=None, description="Fonte de onde a cifra foi obtida."
     )
     url: HttpUrl = Field(..., description="URL da cifra original.")
+    confidence: Optional[float] = Field(
+        default=None,
+        ge=0,
+        le=1,
+        description="Confiança de que a cifra corresponde à música buscada (0 a 1).",
+    )
     preview: Optional[str] = Field(
         default=None, description="Trecho resumido da cifra para exibição em listas."
     )
@@ -0,0 +1,156 @@
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+
+from rapidfuzz import fuzz, process
+
+from ..normalize import CACHE_SIZE, normalize_text, normalize_track_title
+from ..util import normalize_artist_name
+
+REQUIRED_KEYS = frozenset({"txt", "art", "dns", "url"})
+
+# Weights of the combined score, in the spirit of ``ranking.score_result``.
+TITLE_WEIGHT = 0.6
+ARTIST_WEIGHT = 0.4
+# Same version as the query (e.g. both live) vs. a different one.
+VARIANT_MATCH_BONUS = 5
+VARIANT_MISMATCH_PENALTY = 5
+
+_VARIANTS = (
+    ("live", re.compile(r"\b(ao vivo|live)\b")),
+    ("acoustic", re.compile(r"\b(acustico|acustica|acoustic|unplugged)\b")),
+)
+
+
+@dataclass
+class CandidateMatch:
+    index: int
+    doc: dict
+    title_score: float
+    artist_score: float | None
+    score: float
+
+    @property
+    def confidence(self) -> float:
+        """Combined score scaled to 0-1."""
+        return round(min(max(self.score, 0), 100) / 100, 3)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def track_variant(title: str) -> str | None:
+    """Version of a track title: ``"live"``, ``"acoustic"`` or ``None``."""
+    text = normalize_text(title)
+    for variant, pattern in _VARIANTS:
+        if pattern.search(text):
+            return variant
+    return None
+
+
+def variant_adjustment(query_variant: str | None, title: str) -> float:
+    variant = track_variant(title)
+    if variant == query_variant:
+        return VARIANT_MATCH_BONUS if variant else 0
+    return -VARIANT_MISMATCH_PENALTY
+
+
+def score_choices(query: str, choices: Sequence[str]) -> list[float]:
+    """``fuzz.token_sort_ratio`` of ``query`` against every choice, in order."""
+    scores = [0.0] * len(choices)
+    for _, score, index in process.extract(
+        query, choices, scorer=fuzz.token_sort_ratio, processor=None, limit=None
+    ):
+        scores[index] = score
+    return scores
+
+
+def rank_candidates(
+    docs: list[dict],
+    music: str,
+    singer: str,
+    check_singer: bool = True,
+    threshold: float = 80,
+    top_k: int = 3,
+) -> list[CandidateMatch]:
+    """
+    Rank the CifraClub search results for a track, best first.
+
+    Titles and artists are normalized like :func:`compare_track` and
+    :func:`compare_artist_name`, through the normalization caches, and all
+    candidates are scored in one :func:`rapidfuzz.process.extract` batch.
+    A candidate qualifies when its title (and, with ``check_singer``, its
+    artist) scores at least ``threshold``.
+
+    Qualifying candidates are ordered by a combined score: the weighted
+    title and artist scores, plus :data:`VARIANT_MATCH_BONUS` when the
+    candidate is the same live/acoustic version as the query, or minus
+    :data:`VARIANT_MISMATCH_PENALTY` when it is a different one. Ties keep
+    Solr's order.
+
+    Args:
+        docs (list[dict]): Solr docs with ``txt``, ``art``, ``dns`` and ``url``.
+        music (str): Track title being searched, as on Spotify.
+        singer (str): Artist being searched.
+        check_singer (bool): Also require and weigh the artist.
+        threshold (float): Minimum ``token_sort_ratio`` score (0-100).
+        top_k (int): Number of candidates returned.
+
+    Returns:
+        list[CandidateMatch]: Up to ``top_k`` qualifying candidates.
+    """
+    candidates = [
+        (index, doc) for index, doc in enumerate(docs) if doc.keys() >= REQUIRED_KEYS
+    ]
+    if not candidates:
+        return []
+
+    title_scores = score_choices(
+        normalize_track_title(music).lower(),
+        [normalize_track_title(doc["txt"]).lower() for _, doc in candidates],
+    )
+    artist_scores = None
+    if check_singer:
+        artist_scores = score_choices(
+            normalize_artist_name(singer).lower(),
+            [normalize_artist_name(doc["art"]).lower() for _, doc in candidates],
+        )
+    query_variant = track_variant(music)
+
+    combined = []
+    eligible = []
+    for position, (_, doc) in enumerate(candidates):
+        score = title_scores[position]
+        qualifies = score >= threshold
+        if artist_scores is not None:
+            artist = artist_scores[position]
+            score = score * TITLE_WEIGHT + artist * ARTIST_WEIGHT
+            qualifies = qualifies and artist >= threshold
+        combined.append(score + variant_adjustment(query_variant, doc["txt"]))
+        if qualifies:
+            eligible.append(position)
+    ranked = sorted(eligible, key=lambda position: -combined[position])[:top_k]
+
+    return [
+        CandidateMatch(
+            index=candidates[position][0],
+            doc=candidates[position][1],
+            title_score=title_scores[position],
+            artist_score=(
+                artist_scores[position] if artist_scores is not None else None
+            ),
+            score=combined[position],
+        )
+        for position in ranked
+    ]
+
+
+def match_candidates(
+    docs: list[dict],
+    music: str,
+    singer: str,
+    check_singer: bool = True,
+    threshold: float = 80,
+) -> CandidateMatch | None:
+    """Best candidate of :func:`rank_candidates`, or ``None``."""
+    ranked = rank_candidates(docs, music, singer, check_singer, threshold, top_k=1)
+    return ranked[0] if ranked else None
@@ -1,29 +1,6 @@
 import re
-import unicodedata
 
-
-def normalize_text(text: str) -> str:
-    """
-    Normalizes a text string for comparison.
-
-    The normalization removes accents, converts the text to lowercase,
-    and trims surrounding whitespace. This helps ensure consistent
-    string comparisons regardless of accents or case differences.
-
-    Example:
-        "Díana " -> "diana"
-
-    Args:
-        text (str): Input text to normalize.
-
-    Returns:
-        str: Normalized text.
-    """
-    if not text:
-        return ""
-    text = unicodedata.normalize("NFKD", text)
-    text = "".join(c for c in text if not unicodedata.combining(c))
-    return text.lower().strip()
+from ..normalize import normalize_text
 
 
 def contains_word(text: str, term: str) -> bool:
@@ -0,0 +1,99 @@
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
+from src.cifra_spotify.app.core.logger import logger
+from src.cifra_spotify.cifras.cifra_base import Instruments
+from src.cifra_spotify.cifras.cifra_club import CifraClub
+from src.cifra_spotify.types import cifra as cifra_type
+
+
+@dataclass
+class SongbookEntry:
+    track: dict
+    cifras: list[cifra_type.CifraType] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def found(self) -> bool:
+        return bool(self.cifras)
+
+
+async def iter_songbook(
+    cifra_club: CifraClub,
+    tracks: list[dict],
+    instrument: Instruments = Instruments.GUITAR,
+    tabs: bool = False,
+    max_concurrency: int = 8,
+) -> AsyncIterator[SongbookEntry]:
+    """
+    Resolve every track of a set list to its chord sheets, yielding the
+    entries in set-list order as soon as each one and those before it are
+    ready.
+
+    Tracks are searched and fetched concurrently, at most ``max_concurrency``
+    at a time. A track that fails or has no match does not affect the others:
+    its entry just has no chord sheets, and ``error`` says why. Closing the
+    iterator early cancels the tracks still being resolved.
+
+    Args:
+        cifra_club (CifraClub): Client used to search and fetch the pages.
+        tracks (list[dict]): Tracks with ``name`` and ``artist``.
+        instrument (Instruments): Instrument of the chord sheets.
+        tabs (bool): Keep tablatures.
+        max_concurrency (int): Tracks resolved at once.
+
+    Yields:
+        SongbookEntry: One entry per track, in set-list order.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def resolve(track: dict) -> SongbookEntry:
+        entry = SongbookEntry(track=track)
+        async with semaphore:
+            try:
+                entry.cifras = await cifra_club.search_musics(
+                    singer=track.get("artist") or "",
+                    music=track["name"],
+                    instrument=instrument,
+                    tabs=tabs,
+                )
+            except Exception as exc:
+                logger.warning(
+                    f"[Songbook] Failed for {track.get('artist')} - {track['name']}: {exc}"
+                )
+                entry.error = str(exc) or type(exc).__name__
+                return entry
+        if not entry.found:
+            entry.error = "Cifra not found"
+        return entry
+
+    tasks = [asyncio.ensure_future(resolve(track)) for track in tracks]
+    found = 0
+    try:
+        for task in tasks:
+            entry = await task
+            found += entry.found
+            yield entry
+        logger.info(f"[Songbook] Resolved {found}/{len(tasks)} tracks")
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Collect every outcome so no task exception goes unretrieved.
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def resolve_songbook(
+    cifra_club: CifraClub,
+    tracks: list[dict],
+    instrument: Instruments = Instruments.GUITAR,
+    tabs: bool = False,
+    max_concurrency: int = 8,
+) -> list[SongbookEntry]:
+    """Every entry of :func:`iter_songbook`, once all tracks are resolved."""
+    return [
+        entry
+        async for entry in iter_songbook(
+            cifra_club, tracks, instrument, tabs, max_concurrency
+        )
+    ]
@@ -1,7 +1,11 @@
 from src.cifra_spotify.app.core.config import settings
 
 from .auth import SpotifyAuth
+from .cache import build_artist_cache
+from .ratelimit import RateLimiter
 from .spotify import SpotifyAPI
+from .token_store import build_token_store
+from .users import SpotifyUsers
 
 spotify_auth = SpotifyAuth(
     client_id=settings.SPOTIFY_CLIENT_ID,
@@ -9,5 +13,35 @@ spotify_auth = SpotifyAuth(
     redirect_uri=settings.SPOTIFY_REDIRECT_URI,
 )
 
+rate_limiter = RateLimiter(
+    rate=settings.SPOTIFY_RATE_LIMIT,
+    capacity=settings.SPOTIFY_RATE_BURST,
+    max_retry_after=settings.SPOTIFY_MAX_RETRY_AFTER,
+)
+artist_cache = build_artist_cache()
+
+
+spotify = SpotifyAPI(
+    auth=spotify_auth,
+    coalesce_ttl=settings.SPOTIFY_COALESCE_TTL,
+    artist_cache=artist_cache,
+    rate_limiter=rate_limiter,
+    max_retries=settings.SPOTIFY_MAX_RETRIES,
+    etag_entries=settings.SPOTIFY_ETAG_CACHE_ENTRIES,
+)
 
-spotify = SpotifyAPI(auth=spotify_auth)
+spotify_users = SpotifyUsers(
+    store=build_token_store(
+        settings.SPOTIFY_TOKEN_STORE,
+        settings.SPOTIFY_TOKEN_DB,
+        settings.SPOTIFY_REDIS_URL,
+    ),
+    client_id=settings.SPOTIFY_CLIENT_ID,
+    client_secret=settings.SPOTIFY_CLIENT_SECRET,
+    redirect_uri=settings.SPOTIFY_REDIRECT_URI,
+    rate_limiter=rate_limiter,
+    artist_cache=artist_cache,
+    coalesce_ttl=settings.SPOTIFY_COALESCE_TTL,
+    max_retries=settings.SPOTIFY_MAX_RETRIES,
+    etag_entries=settings.SPOTIFY_ETAG_CACHE_ENTRIES,
+)
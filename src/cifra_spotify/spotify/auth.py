@@ -1,3 +1,4 @@
+import asyncio
 import os
 import time
 import urllib.parse
@@ -9,22 +10,65 @@ from src.cifra_spotify.app.custom_exceptions.exceptions import (
     UserNotAuthenticatedException,
 )
 
+from .token_store import TokenData, TokenStore
+
 
 class SpotifyAuth:
     AUTH_URL = "https://accounts.spotify.com/authorize"
     TOKEN_URL = "https://accounts.spotify.com/api/token"
     TOKEN_FILE = ".spotify_token"
-
-    def __init__(self, client_id: str, client_secret: str, redirect_uri: str):
+    # Seconds before expiry at which a background refresh is started.
+    REFRESH_MARGIN = 60
+    # Wait after a failed refresh, doubled on each consecutive failure.
+    REFRESH_BACKOFF = 5
+    REFRESH_BACKOFF_MAX = 300
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        redirect_uri: str,
+        store: TokenStore | None = None,
+        user_id: str | None = None,
+        http: httpx.AsyncClient | None = None,
+    ):
         self.client_id = client_id
         self.client_secret = client_secret
         self.redirect_uri = redirect_uri
+        self.store = store
+        self.user_id = user_id
+        # Token calls share one client; a private one is opened on first use.
+        self._owns_http = http is None
+        self.http = http
 
         self.access_token = None
         self.refresh_token = None
         self.expires_at = None
+        self._refresh_task: asyncio.Task | None = None
+        self._refresh_failures = 0
+        self._refresh_retry_at = 0.0
 
-        self._load_from_file()
+        # Without a store the single-user token file is kept for compatibility.
+        self._loaded = store is None
+        if store is None:
+            self._load_from_file()
+
+    async def _load(self):
+        if self._loaded:
+            return
+        token = await self.store.get(self.user_id)
+        if token:
+            self.use_token(token)
+        self._loaded = True
+
+    async def _save(self):
+        if self.store is None:
+            await asyncio.to_thread(self._save_to_file)
+            return
+        await self.store.set(
+            self.user_id,
+            TokenData(self.access_token, self.refresh_token, self.expires_at),
+        )
 
     def _save_to_file(self):
         logger.info("Saving token to file...")
@@ -58,41 +102,62 @@ class SpotifyAuth:
         logger.debug("Generating login URL...")
         return f"{self.AUTH_URL}?{urllib.parse.urlencode(params)}"
 
-    async def exchange_code_for_token(self, code: str):
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                self.TOKEN_URL,
-                data={
-                    "grant_type": "authorization_code",
-                    "code": code,
-                    "redirect_uri": self.redirect_uri,
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                },
-            )
+    async def request_token(self, code: str) -> dict:
+        """
+        Exchange an authorization code for tokens without keeping them.
+
+        Used by the login callback, which stores the tokens under the user ID
+        they belong to instead of on this instance.
+        """
         logger.info("Exchanging code for token...")
+        resp = await self._post_token(
+            {
+                "grant_type": "authorization_code",
+                "code": code,
+                "redirect_uri": self.redirect_uri,
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+            }
+        )
+        if resp.status_code != 200:
+            logger.error("Failed to exchange authorization code.")
+            raise UserNotAuthenticatedException(
+                "Failed to exchange authorization code.", 401
+            )
+        return resp.json()
 
-        data = resp.json()
+    def use_token(self, token: TokenData):
+        """Replace the tokens held in memory, e.g. after a new login."""
+        self.access_token = token.access_token
+        self.refresh_token = token.refresh_token
+        self.expires_at = token.expires_at
+        self._loaded = True
+
+    async def save_token(self, data: dict):
+        """Keep and persist the tokens of a token endpoint payload."""
         self.access_token = data["access_token"]
         self.refresh_token = data.get("refresh_token", self.refresh_token)
         self.expires_at = time.time() + data["expires_in"]
+        self._loaded = True
 
-        self._save_to_file()
+        await self._save()
         logger.info("Tokens obtained.")
+
+    async def exchange_code_for_token(self, code: str):
+        data = await self.request_token(code)
+        await self.save_token(data)
         return data
 
     async def refresh_access_token(self):
         logger.info("Refreshing access token...")
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                self.TOKEN_URL,
-                data={
-                    "grant_type": "refresh_token",
-                    "refresh_token": self.refresh_token,
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                },
-            )
+        resp = await self._post_token(
+            {
+                "grant_type": "refresh_token",
+                "refresh_token": self.refresh_token,
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+            }
+        )
         if resp.status_code != 200:
             logger.error("Failed to refresh access token.")
             raise Exception("Failed to refresh access token.")
@@ -106,19 +171,72 @@ class SpotifyAuth:
         if data.get("refresh_token"):
             self.refresh_token = data["refresh_token"]
 
-        self._save_to_file()
+        await self._save()
         return data
 
+    def _start_refresh(self) -> asyncio.Task:
+        """
+        Start a token refresh, or join the one already in flight.
+
+        Concurrent callers share a single request to the token endpoint.
+        After a failure no new refresh is started until the backoff has
+        passed; meanwhile the failed task is returned again.
+        """
+        task = self._refresh_task
+        if task is None or (task.done() and time.monotonic() >= self._refresh_retry_at):
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+            self._refresh_task.add_done_callback(self._retrieve_error)
+        return self._refresh_task
+
+    async def _refresh(self):
+        try:
+            data = await self.refresh_access_token()
+        except Exception as exc:
+            self._refresh_failures += 1
+            backoff = min(
+                self.REFRESH_BACKOFF * 2 ** (self._refresh_failures - 1),
+                self.REFRESH_BACKOFF_MAX,
+            )
+            self._refresh_retry_at = time.monotonic() + backoff
+            logger.error(f"Token refresh failed: {exc}. Retrying in {backoff}s")
+            raise
+        self._refresh_failures = 0
+        return data
+
+    @staticmethod
+    def _retrieve_error(task: asyncio.Task):
+        # Background refreshes are not awaited; the error is already logged.
+        if not task.cancelled():
+            task.exception()
+
+    async def _post_token(self, data: dict) -> httpx.Response:
+        if self.http is None:
+            self.http = httpx.AsyncClient()
+        return await self.http.post(self.TOKEN_URL, data=data)
+
+    async def aclose(self):
+        if self._owns_http and self.http is not None:
+            await self.http.aclose()
+            self.http = None
+
     async def ensure_token(self):
         logger.debug("Ensuring access token...")
+        await self._load()
+        if not self.access_token and self.store is None:
+            # Another process (the API's login callback) may have logged in since.
+            await asyncio.to_thread(self._load_from_file)
         if not self.access_token:
             logger.error("User not authenticated.")
             raise UserNotAuthenticatedException("User not authenticated.", 401)
 
-        if time.time() >= self.expires_at - 5:
+        remaining = self.expires_at - time.time()
+        if remaining <= 5:
             logger.info("Access token expired. Refreshing...")
-            await self.refresh_access_token()
+            await asyncio.shield(self._start_refresh())
             logger.info("Access token refreshed.")
+        elif remaining <= self.REFRESH_MARGIN:
+            logger.debug("Access token close to expiry. Refreshing in background...")
+            self._start_refresh()
 
         logger.debug("Access token obtained.")
 
@@ -0,0 +1,143 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+from src.cifra_spotify.app.core.config import settings
+from src.cifra_spotify.app.core.logger import logger
+from src.cifra_spotify.spotify.pooling import EVENT_TYPES, SpotifyPollingService
+from src.cifra_spotify.spotify.scheduler import PollingScheduler
+from src.cifra_spotify.spotify.spotify import SpotifyAPI
+
+# (event type, JSON message) pairs, serialized once per event for every client.
+Message = tuple[str, str]
+
+
+@dataclass
+class _Channel:
+    subscribers: set[asyncio.Queue[Message]] = field(default_factory=set)
+    last: Message | None = None
+
+
+class NowPlayingBroadcaster:
+    """
+    Fan out now-playing events to any number of connected clients.
+
+    Each Spotify account with at least one subscriber gets a single
+    :class:`SpotifyPollingService` on the shared :class:`PollingScheduler`;
+    its start/change/stop hooks publish to every subscriber of that account.
+    The poll starts with the first subscriber and stops with the last one,
+    and new subscribers immediately receive the latest event.
+
+    Each subscriber has a bounded queue: a client that cannot keep up loses
+    its oldest pending events instead of slowing the others down.
+
+    Args:
+        scheduler (PollingScheduler): Scheduler running the upstream polls.
+        api_for (Callable[[str | None], SpotifyAPI]): Resolves an account ID
+            (``None`` for the default account) to its API client.
+        queue_size (int): Pending events kept per subscriber.
+        on_watch (Callable, optional): Called with every polling service
+            created, e.g. to attach extra hooks.
+    """
+
+    def __init__(
+        self,
+        scheduler: PollingScheduler,
+        api_for: Callable[[str | None], SpotifyAPI],
+        queue_size: int = 16,
+        on_watch: Callable[[SpotifyPollingService], None] | None = None,
+    ):
+        self.scheduler = scheduler
+        self.api_for = api_for
+        self.queue_size = queue_size
+        self.on_watch = on_watch
+        self.dropped = 0
+        self._channels: dict[str, _Channel] = {}
+
+    @staticmethod
+    def _key(account: str | None) -> str:
+        return account or ""
+
+    async def start(self):
+        await self.scheduler.start()
+
+    async def stop(self):
+        await self.scheduler.stop()
+        self._channels.clear()
+
+    def _watch(self, account: str | None):
+        key = self._key(account)
+        service = SpotifyPollingService(
+            api=self.api_for(account),
+            user_id=account,
+            predictive=settings.SPOTIFY_POLLING_PREDICTIVE,
+            max_predictive_interval=settings.SPOTIFY_POLLING_MAX_PREDICTIVE_INTERVAL,
+        )
+        for event in EVENT_TYPES:
+            service.add_hook(
+                event, self._publisher(key, event), name=f"broadcast.{event}"
+            )
+        if self.on_watch:
+            self.on_watch(service)
+        self.scheduler.add(key, service)
+
+    def _publisher(self, key: str, event: str):
+        async def publish(data: dict):
+            self.publish(key, event, data)
+
+        return publish
+
+    def publish(self, key: str, event: str, data: dict):
+        channel = self._channels.get(key)
+        if channel is None:
+            return
+
+        message = (event, json.dumps({"event": event, "track": data}))
+        channel.last = message
+        for queue in channel.subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(message)
+
+    @asynccontextmanager
+    async def subscribe(
+        self, account: str | None = None
+    ) -> AsyncIterator[asyncio.Queue[Message]]:
+        """
+        Subscribe to the now-playing events of ``account``.
+
+        Yields:
+            asyncio.Queue: Queue receiving ``(event, json_message)`` pairs.
+        """
+        key = self._key(account)
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = self._channels[key] = _Channel()
+            logger.info(f"[Stream] First subscriber for account '{key}'")
+            self._watch(account)
+
+        queue: asyncio.Queue[Message] = asyncio.Queue(self.queue_size)
+        if channel.last:
+            queue.put_nowait(channel.last)
+        channel.subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            channel.subscribers.discard(queue)
+            if not channel.subscribers and self._channels.get(key) is channel:
+                logger.info(f"[Stream] Last subscriber left account '{key}'")
+                del self._channels[key]
+                self.scheduler.remove(key)
+
+    def metrics(self) -> dict:
+        return {
+            "accounts": len(self._channels),
+            "subscribers": sum(
+                len(channel.subscribers) for channel in self._channels.values()
+            ),
+            "dropped": self.dropped,
+            "scheduler": self.scheduler.metrics(),
+        }
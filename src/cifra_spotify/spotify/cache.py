@@ -0,0 +1,25 @@
+from src.cifra_spotify.app.core.cache import SQLiteCache, TieredCache, TTLCache
+from src.cifra_spotify.app.core.config import settings
+
+
+def build_artist_cache() -> TieredCache:
+    """
+    Build the artist metadata cache from the application settings.
+
+    Artist data (genres, name, images) rarely changes, so entries live for
+    ``SPOTIFY_ARTIST_CACHE_TTL`` and are persisted to SQLite when
+    ``SPOTIFY_ARTIST_CACHE_PATH`` is set.
+    """
+    memory = TTLCache(
+        maxsize=settings.SPOTIFY_ARTIST_CACHE_ENTRIES,
+        ttl=settings.SPOTIFY_ARTIST_CACHE_TTL,
+    )
+    disk = None
+    if settings.SPOTIFY_ARTIST_CACHE_PATH:
+        disk = SQLiteCache(
+            settings.SPOTIFY_ARTIST_CACHE_PATH,
+            ttl=settings.SPOTIFY_ARTIST_CACHE_TTL,
+            max_entries=settings.SPOTIFY_ARTIST_CACHE_ENTRIES * 10,
+            table="artists",
+        )
+    return TieredCache(memory=memory, disk=disk)
@@ -1,21 +1,68 @@
 import asyncio
+import contextvars
+import functools
 import inspect
+import time
+from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import Executor, ThreadPoolExecutor
 from typing import Callable
 
 import httpx
 
-from cifra_spotify.app.core.config import settings
-from cifra_spotify.app.core.logger import logger
-from cifra_spotify.app.custom_exceptions.exceptions import (
+from src.cifra_spotify.app.core.config import settings
+from src.cifra_spotify.app.core.logger import logger
+from src.cifra_spotify.app.core.metrics import LatencyHistogram
+from src.cifra_spotify.app.custom_exceptions.exceptions import (
     UserNotAuthenticatedException,
 )
-from cifra_spotify.spotify.spotify import SpotifyAPI
+from src.cifra_spotify.spotify.ratelimit import background_priority
+from src.cifra_spotify.spotify.spotify import SpotifyAPI
+from src.cifra_spotify.spotify.webhook_queue import (
+    WebhookQueue,
+    build_webhook_queue,
+    webhook_envelope,
+)
 
 HOOKSTYPES = Callable[[dict], None]
 EVENT_TYPES = ("start", "change", "stop")
 
+_hook_executor: ThreadPoolExecutor | None = None
+
+
+def default_hook_executor() -> ThreadPoolExecutor:
+    """
+    Bounded thread pool shared by the sync hooks of every polling service.
+
+    A sync hook that times out keeps its thread until it returns; running
+    hooks here keeps such threads out of the loop's default executor, which
+    ``asyncio.to_thread`` and DNS lookups rely on.
+    """
+    global _hook_executor
+    if _hook_executor is None:
+        _hook_executor = ThreadPoolExecutor(
+            max_workers=settings.SPOTIFY_POLLING_HOOK_WORKERS,
+            thread_name_prefix="polling-hook",
+        )
+    return _hook_executor
+
+
+def hook_name(hook: HOOKSTYPES) -> str:
+    """Metrics key of a hook: ``module.qualname`` of the underlying function."""
+    target = hook.func if isinstance(hook, functools.partial) else hook
+    qualname = getattr(target, "__qualname__", None)
+    if qualname is None:
+        return repr(hook)
+    return f"{getattr(target, '__module__', None)}.{qualname}"
+
 
 class SpotifyPollingService:
+    # Drift between the reported and the extrapolated progress above which the
+    # listener is assumed to have seeked.
+    SEEK_TOLERANCE_MS = 3000
+    # Delay after the predicted end of a track before polling for the next one.
+    TRANSITION_LAG = 0.5
+
     def __init__(
         self,
         api: SpotifyAPI,
@@ -25,20 +72,51 @@ class SpotifyPollingService:
         on_track_stop=None,
         on_track_start=None,
         webhook_url: str | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        predictive: bool = False,
+        max_predictive_interval: float = 30,
+        transition_margin: float = 2,
+        clock: Callable[[], float] = time.monotonic,
+        webhook_queue: WebhookQueue | None = None,
+        hook_timeout: float | None = 10,
+        hook_executor: Executor | None = None,
+        ordered_events: Iterable[str] = (),
+        user_id: str | None = None,
     ):
         self.api = api
+        # Spotify account being polled, sent with every event so receivers
+        # of a shared webhook can tell whose track changed.
+        self.user_id = user_id
         self.interval = interval
         self._interval = interval
         self.max_interval = max_interval
+        self.predictive = predictive
+        self.max_predictive_interval = max_predictive_interval
+        self.transition_margin = transition_margin
+        self.clock = clock
         self.on_track_change = self._ensure_list(on_track_change)
         self.on_track_stop = self._ensure_list(on_track_stop)
         self.on_track_start = self._ensure_list(on_track_start)
         self.webhook_url = webhook_url or settings.SPOTIFY_WEBHOOK_URL
 
         self._current_track_id: str | None = None
+        self._last_progress: tuple[str, int, float] | None = None
         self._running = False
         self._task: asyncio.Task | None = None
-        self._http: httpx.AsyncClient | None = None
+        self._http: httpx.AsyncClient | None = http_client
+        self._owns_http = http_client is None
+        self.webhook_queue = webhook_queue
+        self._owns_queue = False
+
+        # Hooks run concurrently; events listed in ``ordered_events`` run
+        # their hooks one at a time, in registration order, instead.
+        self.hook_timeout = hook_timeout
+        self.hook_executor = hook_executor
+        self.ordered_events = frozenset(ordered_events)
+        self.hook_latency: dict[str, LatencyHistogram] = {}
+        self._hook_names: dict[HOOKSTYPES, str] = {}
+        self._hook_timeouts: Counter[str] = Counter()
+        self._hook_errors: Counter[str] = Counter()
 
     @staticmethod
     def _ensure_list(value):
@@ -55,7 +133,12 @@ class SpotifyPollingService:
 
         logger.info("[Polling] Starting...")
         self._running = True
-        self._http = httpx.AsyncClient(timeout=10)
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=10)
+        if self.webhook_queue is None and self.webhook_url:
+            self.webhook_queue = build_webhook_queue(self.webhook_url, self._http)
+            self._owns_queue = True
+            await self.webhook_queue.start()
         self._task = asyncio.create_task(self._run())
 
     async def stop(self):
@@ -69,54 +152,79 @@ class SpotifyPollingService:
             except asyncio.CancelledError:
                 pass
 
-        if self._http:
+        if self._owns_queue:
+            await self.webhook_queue.stop()
+            self.webhook_queue = None
+            self._owns_queue = False
+
+        if self._http and self._owns_http:
             await self._http.aclose()
             self._http = None
 
     async def _run(self):
         logger.info("[Polling] Started.")
         while self._running:
-            try:
-                await self._tick()
-            except UserNotAuthenticatedException as exc:
-                logger.error(f"[Polling] Auth error: {exc}", exc_info=True)
-                self._interval = self.max_interval
-            except asyncio.CancelledError:
-                raise
-            except Exception as exc:
-                logger.error(f"[Polling] Unexpected error: {exc}", exc_info=True)
+            interval = await self.poll_once()
+            logger.debug(f"[Polling] Waiting {interval}s...")
+            await asyncio.sleep(interval)
 
-            logger.debug(f"[Polling] Waiting {self._interval}s...")
-            await asyncio.sleep(self._interval)
+    async def poll_once(self) -> float:
+        """
+        Run a single tick, logging any error, and return how many seconds to
+        wait before the next one.
+        """
+        try:
+            await self._tick()
+        except UserNotAuthenticatedException as exc:
+            logger.error(f"[Polling] Auth error: {exc}", exc_info=True)
+            self._interval = self.max_interval
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error(f"[Polling] Unexpected error: {exc}", exc_info=True)
+        return self._interval
 
     async def _tick(self):
         logger.debug("[Polling] Ticking...")
-        response = await self.api.get_current_track()
+        with background_priority():
+            response = await self.api.get_current_track()
 
         if response.status_code == 204:
             logger.debug("[Polling] No track playing.")
             self._interval = min(self._interval * 2, self.max_interval)
+            self._last_progress = None
 
             if self._current_track_id is not None:
                 logger.info("[Polling] Track stopped.")
                 await self._fire(
                     self.on_track_stop,
-                    {"id": self._current_track_id, "progress_ms": None},
+                    {
+                        "user_id": self.user_id,
+                        "id": self._current_track_id,
+                        "progress_ms": None,
+                    },
+                    "stop",
                 )
                 self._current_track_id = None
             return
 
-        self._interval = self.interval
-
         data = response.json()
         track = data.get("item")
         progress_ms = data.get("progress_ms")
 
         if not track:
+            self._interval = self.interval
             return
 
         track_id = track.get("id")
+        self._interval = self._predict_interval(
+            track_id,
+            progress_ms,
+            track.get("duration_ms"),
+            data.get("is_playing", True),
+        )
         event_payload = {
+            "user_id": self.user_id,
             "id": track_id,
             "name": track["name"],
             "artist": track["artists"][0]["name"],
@@ -126,33 +234,80 @@ class SpotifyPollingService:
         if not self._current_track_id:
             logger.info("[Polling] First track playing.")
             self._current_track_id = track_id
-            await self._fire(self.on_track_start, event_payload)
+            await self._fire(self.on_track_start, event_payload, "start")
             await self._notify_webhook(event_payload)
             return
 
         if track_id != self._current_track_id:
             logger.info("[Polling] Track changed.")
             self._current_track_id = track_id
-            await self._fire(self.on_track_change, event_payload)
+            await self._fire(self.on_track_change, event_payload, "change")
             await self._notify_webhook(event_payload)
 
+    def _predict_interval(
+        self,
+        track_id: str,
+        progress_ms: int | None,
+        duration_ms: int | None,
+        is_playing: bool,
+    ) -> float:
+        """
+        Seconds until the next tick for a track that is currently loaded.
+
+        In predictive mode the service sleeps until shortly before the track
+        is due to end (capped at ``max_predictive_interval`` so manual skips
+        are still noticed), then polls right after the boundary. Paused
+        playback, missing timing data and detected seeks fall back to the
+        normal ``interval`` cadence.
+        """
+        now = self.clock()
+        previous = self._last_progress
+        playing = is_playing and progress_ms is not None
+        self._last_progress = (track_id, progress_ms, now) if playing else None
+
+        if not self.predictive or not playing or not duration_ms:
+            return self.interval
+
+        if previous and previous[0] == track_id:
+            expected_ms = previous[1] + (now - previous[2]) * 1000
+            if abs(progress_ms - expected_ms) > self.SEEK_TOLERANCE_MS:
+                logger.debug("[Polling] Seek detected.")
+                return self.interval
+
+        remaining = max(duration_ms - progress_ms, 0) / 1000
+        if remaining <= self.interval + self.transition_margin:
+            return min(self.interval, remaining + self.TRANSITION_LAG)
+        return min(remaining - self.transition_margin, self.max_predictive_interval)
+
     async def _notify_webhook(self, payload: dict):
+        if self.webhook_queue is not None:
+            await self.webhook_queue.put(payload)
+            return
+
         if not self.webhook_url or not self._http:
             return
 
         try:
             logger.info("[Webhook] Notifying...")
-            await self._http.post(self.webhook_url, json=payload)
+            await self._http.post(self.webhook_url, json=webhook_envelope([payload]))
             logger.info("[Webhook] Event sent.")
         except Exception as exc:
             logger.error(f"[Webhook] Error: {exc}", exc_info=True)
 
-    def add_hook(self, event: str, callback: HOOKSTYPES):
+    def add_hook(self, event: str, callback: HOOKSTYPES, name: str | None = None):
+        """
+        Register ``callback`` for ``event``.
+
+        ``name`` labels the hook in :meth:`hook_metrics`; by default it is the
+        ``module.qualname`` of the function, shared by lambdas of one module.
+        """
         if event not in EVENT_TYPES:
             raise ValueError(
                 f"Unknown event '{event}'. Use one of: {', '.join(EVENT_TYPES)}"
             )
 
+        if name:
+            self._hook_names[callback] = name
         if event == "start":
             self.on_track_start.append(callback)
         elif event == "change":
@@ -160,15 +315,48 @@ class SpotifyPollingService:
         elif event == "stop":
             self.on_track_stop.append(callback)
 
-    async def _fire(self, hooks: list[HOOKSTYPES], data: dict):
-        for hook in hooks:
-            await self._fire_async(hook, data)
+    async def _fire(
+        self, hooks: list[HOOKSTYPES], data: dict, event: str | None = None
+    ):
+        # Every hook gets its own copy, so one cannot change what others see.
+        if event in self.ordered_events:
+            for hook in hooks:
+                await self._fire_async(hook, dict(data))
+            return
+        await asyncio.gather(*(self._fire_async(hook, dict(data)) for hook in hooks))
 
     async def _fire_async(self, hook, data):
+        name = self._hook_names.get(hook) or hook_name(hook)
+        started = time.perf_counter()
         try:
             if inspect.iscoroutinefunction(hook):
-                await hook(data)
+                call = hook(data)
             else:
-                hook(data)
+                # Sync hooks run in a worker thread so slow or CPU-bound
+                # callbacks never block the event loop.
+                ctx = contextvars.copy_context()
+                call = asyncio.get_running_loop().run_in_executor(
+                    self.hook_executor or default_hook_executor(), ctx.run, hook, data
+                )
+            await asyncio.wait_for(call, timeout=self.hook_timeout)
+        except TimeoutError:
+            self._hook_timeouts[name] += 1
+            logger.error(f"Hook {name} timed out after {self.hook_timeout}s")
         except Exception as exc:
+            self._hook_errors[name] += 1
             logger.error(f"Hook error: {exc}", exc_info=True)
+        finally:
+            self.hook_latency.setdefault(name, LatencyHistogram()).observe(
+                time.perf_counter() - started
+            )
+
+    def hook_metrics(self) -> dict:
+        """Latency histogram, timeouts and errors of every hook fired so far."""
+        return {
+            name: {
+                **histogram.as_dict(),
+                "timeouts": self._hook_timeouts[name],
+                "errors": self._hook_errors[name],
+            }
+            for name, histogram in self.hook_latency.items()
+        }
@@ -0,0 +1,106 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+request_priority: ContextVar[Priority] = ContextVar(
+    "spotify_request_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def background_priority():
+    """Mark every Spotify request made inside the block as background work."""
+    token = request_priority.set(Priority.BACKGROUND)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every request sent to the Spotify API.
+
+    Tokens refill at ``rate`` per second up to ``capacity``. Background
+    requests yield while interactive ones are waiting, and a 429 answer
+    pauses the whole bucket for the ``Retry-After`` period, at most
+    ``max_retry_after`` seconds.
+
+    Args:
+        rate (float): Sustained requests per second.
+        capacity (int): Maximum burst size.
+        max_retry_after (float): Longest pause caused by a single 429.
+    """
+
+    def __init__(
+        self, rate: float = 5, capacity: int = 10, max_retry_after: float = 30
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_retry_after = max_retry_after
+        self.throttled = 0
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting = {priority: 0 for priority in Priority}
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def _outranked(self, priority: Priority) -> bool:
+        return any(self._waiting[p] for p in Priority if p < priority)
+
+    async def acquire(self, priority: Priority | None = None):
+        priority = request_priority.get() if priority is None else priority
+        self._waiting[priority] += 1
+        try:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self._outranked(priority):
+                    delay = 1 / self.rate
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    delay = (1 - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+        finally:
+            self._waiting[priority] -= 1
+
+    def penalize(self, retry_after: float):
+        """
+        Pause every request for ``retry_after`` seconds after a 429.
+
+        The pause is clamped to ``max_retry_after`` so a long ``Retry-After``
+        does not stall interactive requests until they time out.
+        """
+        self.throttled += 1
+        self._tokens = 0
+        pause = min(retry_after, self.max_retry_after)
+        self._paused_until = max(self._paused_until, time.monotonic() + pause)
+
+    def metrics(self) -> dict:
+        now = time.monotonic()
+        self._refill(now)
+        return {
+            "tokens": round(self._tokens, 2),
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "queue_depth": sum(self._waiting.values()),
+            "queue_by_priority": {p.name.lower(): n for p, n in self._waiting.items()},
+            "paused_for": round(max(0.0, self._paused_until - now), 2),
+            "throttled": self.throttled,
+        }
@@ -0,0 +1,131 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+from src.cifra_spotify.app.core.logger import logger
+from src.cifra_spotify.spotify.pooling import SpotifyPollingService
+
+
+class PollingScheduler:
+    """
+    Poll many Spotify accounts from a single event loop.
+
+    Each account keeps its own :class:`SpotifyPollingService` (and therefore
+    its own adaptive ``interval``/``max_interval`` backoff), but none of them
+    runs a task of its own. The scheduler keeps a heap of next-due times,
+    sleeps until the earliest one and runs due ticks in due-time order with
+    at most ``max_concurrency`` Spotify calls in flight, so CPU usage stays
+    flat no matter how many accounts are idle.
+
+    Args:
+        max_concurrency (int): Maximum number of ticks running at once.
+    """
+
+    def __init__(self, max_concurrency: int = 20):
+        self.max_concurrency = max_concurrency
+        self._services: dict[str, SpotifyPollingService] = {}
+        self._generation: dict[str, int] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._wakeup = asyncio.Event()
+        self._inflight: set[asyncio.Task] = set()
+        self._running = False
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._services)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._services
+
+    def user_ids(self) -> list[str]:
+        return list(self._services)
+
+    def get(self, user_id: str) -> SpotifyPollingService | None:
+        return self._services.get(user_id)
+
+    def add(self, user_id: str, service: SpotifyPollingService, delay: float = 0):
+        logger.info(f"[Scheduler] Tracking account {user_id}")
+        self._services[user_id] = service
+        self._schedule(user_id, delay)
+
+    def remove(self, user_id: str):
+        logger.info(f"[Scheduler] Untracking account {user_id}")
+        self._services.pop(user_id, None)
+        # Heap entries for this account become stale and are skipped lazily.
+        self._generation.pop(user_id, None)
+
+    def _schedule(self, user_id: str, delay: float):
+        seq = next(self._seq)
+        self._generation[user_id] = seq
+        heapq.heappush(self._heap, (time.monotonic() + delay, seq, user_id))
+        self._wakeup.set()
+
+    async def start(self):
+        if self._running:
+            return
+        logger.info("[Scheduler] Starting...")
+        self._running = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        logger.info("[Scheduler] Stopping...")
+        self._running = False
+        tasks = [task for task in (self._task, *self._inflight) if task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    async def _wait(self, timeout: float | None):
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except TimeoutError:
+            pass
+
+    async def _run(self):
+        while self._running:
+            if not self._heap:
+                await self._wait(None)
+                continue
+
+            due, seq, user_id = self._heap[0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                await self._wait(delay)
+                continue
+
+            heapq.heappop(self._heap)
+            service = self._services.get(user_id)
+            if service is None or self._generation.get(user_id) != seq:
+                continue
+
+            await self._semaphore.acquire()
+            task = asyncio.create_task(self._poll(user_id, seq, service))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _poll(self, user_id: str, seq: int, service: SpotifyPollingService):
+        try:
+            interval = await service.poll_once()
+        finally:
+            self._semaphore.release()
+
+        # Skip rescheduling if the account was removed or re-added meanwhile.
+        if self._generation.get(user_id) == seq:
+            self._schedule(user_id, interval)
+
+    def metrics(self) -> dict:
+        now = time.monotonic()
+        return {
+            "accounts": len(self._services),
+            "in_flight": len(self._inflight),
+            "overdue": sum(
+                1
+                for due, seq, user_id in self._heap
+                if due <= now and self._generation.get(user_id) == seq
+            ),
+        }
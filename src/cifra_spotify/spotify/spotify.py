@@ -1,10 +1,16 @@
+import asyncio
+import random
 from typing import Any
 
 import httpx
 
+from src.cifra_spotify.app.core.cache import TieredCache, TTLCache
 from src.cifra_spotify.app.core.logger import logger
+from src.cifra_spotify.app.core.singleflight import SingleFlight
+from src.cifra_spotify.app.custom_exceptions.exceptions import PlaylistSeachException
 
 from .auth import SpotifyAuth
+from .ratelimit import RateLimiter
 
 
 class SpotifyAPI:
@@ -16,18 +22,63 @@ class SpotifyAPI:
     """
 
     BASE_URL = "https://api.spotify.com/v1"
+    MAX_ARTISTS_PER_REQUEST = 50
+    MAX_PLAYLIST_ITEMS_PER_REQUEST = 100
+    # Only what a songbook needs, to keep 100-item pages small.
+    PLAYLIST_ITEM_FIELDS = "total,items(track(id,name,artists(name)))"
+    SERVER_ERRORS = frozenset({500, 502, 503, 504})
 
-    def __init__(self, auth: SpotifyAuth, request_timeout: int = 10):
+    def __init__(
+        self,
+        auth: SpotifyAuth,
+        request_timeout: int = 10,
+        coalesce_ttl: float = 0,
+        artist_cache: TieredCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        client: httpx.AsyncClient | None = None,
+        etag_entries: int = 0,
+    ):
         """
         Inicializa o cliente da API do Spotify.
 
         Args:
             auth (SpotifyAuth): Instância responsável por obter e renovar tokens OAuth.
             request_timeout (int): Timeout padrão para requisições HTTP, em segundos.
+            coalesce_ttl (float): Por quantos segundos uma resposta GET idêntica
+                é reaproveitada após concluída. ``0`` apenas agrupa as
+                requisições simultâneas.
+            artist_cache (TieredCache, optional): Cache de metadados de
+                artistas. Por padrão, um LRU em memória.
+            rate_limiter (RateLimiter, optional): Token bucket compartilhado
+                entre as instâncias que usam o mesmo app do Spotify.
+            max_retries (int): Tentativas extras após 429 ou erro 5xx.
+            backoff_base (float): Espera inicial, em segundos, entre
+                tentativas após erro 5xx (cresce exponencialmente).
+            client (httpx.AsyncClient, optional): Cliente HTTP compartilhado.
+                Quando informado, não é fechado por :meth:`aclose`.
+            etag_entries (int): Quantas respostas com ``ETag`` guardar para
+                requisições condicionais (``If-None-Match``). ``0`` desativa.
         """
         self.auth = auth
         self.request_timeout = request_timeout
-        self.client = httpx.AsyncClient(timeout=request_timeout)
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(timeout=request_timeout)
+        # Falhas (401, 429, 5xx) não são reaproveitadas: o próximo chamador
+        # tenta de novo.
+        self._singleflight = SingleFlight(
+            ttl=coalesce_ttl, cache_if=lambda response: response.is_success
+        )
+        self.artist_cache = artist_cache or TieredCache(
+            TTLCache(maxsize=1024, ttl=60 * 60 * 24)
+        )
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self._etags = TTLCache(maxsize=etag_entries) if etag_entries else None
+        self.not_modified = 0
+        self.bytes_saved = 0
 
     async def _send_request(
         self, path: str, params: dict[str, Any] | None = None
@@ -35,6 +86,9 @@ class SpotifyAPI:
         """
         Envia uma requisição GET autenticada à API do Spotify.
 
+        Requisições idênticas (mesmo caminho e parâmetros) feitas ao mesmo
+        tempo compartilham uma única chamada HTTP.
+
         Args:
             path (str): Caminho relativo dentro da API (ex: "me", "search").
             params (dict, optional): Parâmetros de querystring.
@@ -42,15 +96,95 @@ class SpotifyAPI:
         Returns:
             httpx.Response: Resposta completa da requisição HTTP.
         """
+        key = (path, tuple(sorted((params or {}).items())))
+        return await self._singleflight.do(key, lambda: self._get(key, path, params))
+
+    async def _get(
+        self, key: tuple, path: str, params: dict[str, Any] | None = None
+    ) -> httpx.Response:
+        cached = self._etags.get(key) if self._etags is not None else None
 
-        token = await self.auth.ensure_token()
-        logger.debug("Sending request to Spotify API...")
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire()
+            token = await self.auth.ensure_token()
+            logger.debug("Sending request to Spotify API...")
 
-        return await self.client.get(
-            f"{self.BASE_URL}/{path}",
-            params=params,
-            headers={"Authorization": f"Bearer {token}"},
-        )
+            headers = {"Authorization": f"Bearer {token}"}
+            if cached:
+                headers["If-None-Match"] = cached[0]
+
+            response = await self.client.get(
+                f"{self.BASE_URL}/{path}", params=params, headers=headers
+            )
+            if response.is_success:
+                self._store_etag(key, response)
+                break
+
+            if cached and response.status_code == 304:
+                logger.debug(f"Spotify resource not modified: {path}")
+                self.not_modified += 1
+                self.bytes_saved += len(cached[1].content)
+                return cached[1]
+
+            if attempt == self.max_retries:
+                break
+
+            if response.status_code == 429:
+                retry_after = self._retry_after(response)
+                self.rate_limiter.penalize(retry_after)
+                if retry_after > self.rate_limiter.max_retry_after:
+                    # Esperar tanto travaria o cliente; devolve o 429.
+                    logger.warning(
+                        f"Spotify rate limit hit. Retry-After {retry_after}s "
+                        "is too long, giving up"
+                    )
+                    break
+                logger.warning(f"Spotify rate limit hit. Retrying in {retry_after}s")
+            elif response.status_code in self.SERVER_ERRORS:
+                delay = self.backoff_base * 2**attempt * random.uniform(0.5, 1.5)
+                logger.warning(
+                    f"Spotify error {response.status_code}. Retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+            else:
+                break
+
+        return response
+
+    def _store_etag(self, key: tuple, response: httpx.Response):
+        if self._etags is None:
+            return
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etags.set(key, (etag, response))
+        else:
+            self._etags.delete(key)
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> float:
+        try:
+            return float(response.headers.get("Retry-After", 1))
+        except ValueError:
+            return 1.0
+
+    def metrics(self) -> dict:
+        """
+        Métricas do agendador de requisições.
+
+        Returns:
+            dict: Orçamento do token bucket, profundidade da fila, total de
+                requisições agrupadas pelo single-flight e respostas ``304``
+                servidas do cache de ETags.
+        """
+        return {
+            "rate_limiter": self.rate_limiter.metrics(),
+            "coalesced": self._singleflight.coalesced,
+            "etag": {
+                "entries": len(self._etags) if self._etags is not None else 0,
+                "not_modified": self.not_modified,
+                "bytes_saved": self.bytes_saved,
+            },
+        }
 
     async def me(self) -> httpx.Response:
         """
@@ -73,6 +207,17 @@ class SpotifyAPI:
         logger.debug("Requesting current track...")
         return await self._send_request("me/player/currently-playing")
 
+    async def get_queue(self) -> httpx.Response:
+        """
+        Obtém a fila de reprodução do usuário.
+
+        Returns:
+            httpx.Response: Faixa atual (``currently_playing``) e próximas
+                faixas (``queue``).
+        """
+        logger.debug("Requesting playback queue...")
+        return await self._send_request("me/player/queue")
+
     async def search_track(
         self, name: str, limit: int = 10, offset: int = 0
     ) -> httpx.Response:
@@ -108,6 +253,87 @@ class SpotifyAPI:
         params = {"limit": limit, "offset": offset}
         return await self._send_request("me/playlists", params=params)
 
+    async def get_playlist_items(
+        self, playlist_id: str, limit: int = 100, offset: int = 0
+    ) -> httpx.Response:
+        """
+        Obtém uma página das faixas de uma playlist.
+
+        Args:
+            playlist_id (str): ID da playlist.
+            limit (int): Número máximo de itens (até 100).
+            offset (int): Offset para paginação.
+
+        Returns:
+            httpx.Response: Página com ``total`` e ``items``.
+        """
+        logger.info(f"Requesting playlist {playlist_id} items, offset: {offset}")
+        params = {"limit": limit, "offset": offset, "fields": self.PLAYLIST_ITEM_FIELDS}
+        return await self._send_request(
+            f"playlists/{playlist_id}/tracks", params=params
+        )
+
+    async def get_playlist_tracks(
+        self, playlist_id: str, max_tracks: int | None = None
+    ) -> tuple[list[dict], int]:
+        """
+        Obtém todas as faixas de uma playlist.
+
+        A primeira página informa o total; as demais são buscadas em
+        paralelo, limitadas pelo rate limiter do cliente.
+
+        Args:
+            playlist_id (str): ID da playlist.
+            max_tracks (int, optional): Número máximo de faixas lidas.
+
+        Returns:
+            tuple[list[dict], int]: Faixas na ordem da playlist, com ``id``,
+                ``name`` e ``artist``, e o total de itens da playlist, que
+                indica se ``max_tracks`` cortou o restante. Itens sem faixa
+                (ex: removidos) ficam de fora.
+
+        Raises:
+            PlaylistSeachException: Se alguma página não puder ser obtida.
+        """
+        page_size = self.MAX_PLAYLIST_ITEMS_PER_REQUEST
+        if max_tracks is not None:
+            page_size = min(page_size, max_tracks)
+
+        first = await self.get_playlist_items(playlist_id, limit=page_size)
+        pages = [first]
+        playlist_total = 0
+        if first.status_code == 200:
+            playlist_total = total = first.json().get("total") or 0
+            if max_tracks is not None:
+                total = min(total, max_tracks)
+            pages += await asyncio.gather(
+                *[
+                    self.get_playlist_items(
+                        playlist_id, limit=min(page_size, total - offset), offset=offset
+                    )
+                    for offset in range(page_size, total, page_size)
+                ]
+            )
+
+        tracks = []
+        for page in pages:
+            if page.status_code != 200:
+                raise PlaylistSeachException(
+                    "Erro ao buscar faixas da playlist", status_code=page.status_code
+                )
+            for item in page.json().get("items") or []:
+                track = item.get("track")
+                if not track or not track.get("name"):
+                    continue
+                tracks.append(
+                    {
+                        "id": track.get("id"),
+                        "name": track["name"],
+                        "artist": (track.get("artists") or [{}])[0].get("name"),
+                    }
+                )
+        return tracks, playlist_total
+
     async def search_playlist(
         self, name: str, limit: int = 10, offset: int = 0
     ) -> httpx.Response:
@@ -137,8 +363,62 @@ class SpotifyAPI:
 
         Deve ser chamado no shutdown da aplicação para liberar recursos.
         """
-        logger.info("Closing HTTP client...")
-        await self.client.aclose()
+        if self._owns_client:
+            logger.info("Closing HTTP client...")
+            await self.client.aclose()
+        await self.auth.aclose()
+        await self.artist_cache.aclose()
 
     async def get_artist(self, artist_id: str):
-        return await self._send_request(f"/artists/{artist_id}")
+        return await self._send_request(f"artists/{artist_id}")
+
+    async def get_artists(self, artist_ids: list[str]) -> httpx.Response:
+        """
+        Obtém vários artistas em uma única chamada.
+
+        Args:
+            artist_ids (list[str]): IDs dos artistas (máximo de 50).
+
+        Returns:
+            httpx.Response: Resposta com a lista ``artists``.
+        """
+        logger.info(f"Requesting {len(artist_ids)} artists...")
+        return await self._send_request("artists", params={"ids": ",".join(artist_ids)})
+
+    async def get_artists_metadata(self, artist_ids: list[str]) -> dict[str, dict]:
+        """
+        Obtém metadados de artistas usando o cache.
+
+        Apenas os IDs ausentes do cache são buscados, em lotes de até 50 por
+        requisição ao endpoint ``/artists``.
+
+        Args:
+            artist_ids (list[str]): IDs dos artistas.
+
+        Returns:
+            dict[str, dict]: Metadados indexados pelo ID do artista. IDs que
+                não puderam ser obtidos ficam de fora.
+        """
+        artists: dict[str, dict] = {}
+        missing = []
+        for artist_id in dict.fromkeys(artist_ids):
+            cached = await self.artist_cache.get(artist_id)
+            if cached is not None:
+                artists[artist_id] = cached
+            else:
+                missing.append(artist_id)
+
+        for start in range(0, len(missing), self.MAX_ARTISTS_PER_REQUEST):
+            batch = missing[start : start + self.MAX_ARTISTS_PER_REQUEST]
+            response = await self.get_artists(batch)
+            if response.status_code != 200:
+                logger.error(f"Failed to fetch artists: {response.status_code}")
+                continue
+
+            for artist in response.json().get("artists") or []:
+                if not artist:
+                    continue
+                artists[artist["id"]] = artist
+                await self.artist_cache.set(artist["id"], artist)
+
+        return artists
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from src.cifra_spotify.app.core.logger import logger
+
+
+@dataclass
+class TokenData:
+    access_token: str
+    refresh_token: str | None
+    expires_at: float
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> "TokenData":
+        return cls(**json.loads(raw))
+
+
+class TokenStore(ABC):
+    """Async storage of Spotify OAuth tokens keyed by user ID."""
+
+    @abstractmethod
+    async def get(self, user_id: str) -> TokenData | None: ...
+
+    @abstractmethod
+    async def set(self, user_id: str, token: TokenData) -> None: ...
+
+    @abstractmethod
+    async def delete(self, user_id: str) -> None: ...
+
+    @abstractmethod
+    async def user_ids(self) -> list[str]: ...
+
+    async def aclose(self) -> None:
+        return None
+
+
+class MemoryTokenStore(TokenStore):
+    def __init__(self):
+        self._tokens: dict[str, TokenData] = {}
+
+    async def get(self, user_id: str) -> TokenData | None:
+        return self._tokens.get(user_id)
+
+    async def set(self, user_id: str, token: TokenData) -> None:
+        self._tokens[user_id] = token
+
+    async def delete(self, user_id: str) -> None:
+        self._tokens.pop(user_id, None)
+
+    async def user_ids(self) -> list[str]:
+        return list(self._tokens)
+
+
+class SQLiteTokenStore(TokenStore):
+    """
+    Token store backed by a SQLite file.
+
+    Queries run in worker threads, so token refreshes never block the event
+    loop on disk I/O.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            logger.debug(f"Opening token store: {self.path}")
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS spotify_tokens ("
+                "user_id TEXT PRIMARY KEY, token TEXT NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _execute(self, query: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(query, params).fetchall()
+            conn.commit()
+            return rows
+
+    async def get(self, user_id: str) -> TokenData | None:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT token FROM spotify_tokens WHERE user_id = ?",
+            (user_id,),
+        )
+        return TokenData.from_json(rows[0][0]) if rows else None
+
+    async def set(self, user_id: str, token: TokenData) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO spotify_tokens (user_id, token) VALUES (?, ?)",
+            (user_id, token.to_json()),
+        )
+
+    async def delete(self, user_id: str) -> None:
+        await asyncio.to_thread(
+            self._execute, "DELETE FROM spotify_tokens WHERE user_id = ?", (user_id,)
+        )
+
+    async def user_ids(self) -> list[str]:
+        rows = await asyncio.to_thread(
+            self._execute, "SELECT user_id FROM spotify_tokens ORDER BY user_id"
+        )
+        return [row[0] for row in rows]
+
+    async def aclose(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class RedisTokenStore(TokenStore):
+    """
+    Token store for any client exposing the ``redis.asyncio`` API subset
+    used here: ``get``, ``set``, ``delete``, ``sadd``, ``srem`` and ``smembers``.
+    """
+
+    def __init__(self, client: Any, prefix: str = "spotify:token:"):
+        self.client = client
+        self.prefix = prefix
+
+    @staticmethod
+    def _decode(value: str | bytes) -> str:
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def get(self, user_id: str) -> TokenData | None:
+        raw = await self.client.get(self.prefix + user_id)
+        return TokenData.from_json(raw) if raw else None
+
+    async def set(self, user_id: str, token: TokenData) -> None:
+        await self.client.set(self.prefix + user_id, token.to_json())
+        await self.client.sadd(self.prefix + "users", user_id)
+
+    async def delete(self, user_id: str) -> None:
+        await self.client.delete(self.prefix + user_id)
+        await self.client.srem(self.prefix + "users", user_id)
+
+    async def user_ids(self) -> list[str]:
+        members = await self.client.smembers(self.prefix + "users")
+        return sorted(self._decode(member) for member in members)
+
+    async def aclose(self) -> None:
+        if hasattr(self.client, "aclose"):
+            await self.client.aclose()
+
+
+def build_token_store(backend: str, path: str, redis_url: str | None) -> TokenStore:
+    logger.info(f"Using '{backend}' Spotify token store")
+    if backend == "memory":
+        return MemoryTokenStore()
+    if backend == "sqlite":
+        return SQLiteTokenStore(path)
+    if backend == "redis":
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "The redis token store requires the 'redis' package"
+            ) from exc
+        return RedisTokenStore(redis.from_url(redis_url or "redis://localhost:6379/0"))
+    raise ValueError(f"Unknown token store backend: {backend}")
@@ -0,0 +1,126 @@
+import time
+from collections import OrderedDict
+
+import httpx
+
+from src.cifra_spotify.app.core.cache import TieredCache
+from src.cifra_spotify.app.core.logger import logger
+
+from .auth import SpotifyAuth
+from .ratelimit import RateLimiter
+from .spotify import SpotifyAPI
+from .token_store import TokenData, TokenStore
+
+
+class SpotifyUsers:
+    """
+    Registry of per-user :class:`SpotifyAPI` clients.
+
+    Tokens live in a :class:`TokenStore`; every client built here shares the
+    same HTTP connection pool, rate limiter and artist cache, since Spotify
+    limits are applied per application rather than per user. Recently used
+    clients are kept in an LRU so their in-flight coalescing state survives
+    between requests.
+
+    Each client owns the :class:`SpotifyAuth` of its user and is evicted
+    with it; a rebuilt client reloads the latest tokens, including rotated
+    refresh tokens, from the store. ``login_auth`` is not tied to any user;
+    it only exchanges login codes, which are then stored through
+    :meth:`register`.
+    """
+
+    def __init__(
+        self,
+        store: TokenStore,
+        client_id: str,
+        client_secret: str,
+        redirect_uri: str,
+        rate_limiter: RateLimiter,
+        artist_cache: TieredCache,
+        coalesce_ttl: float = 0,
+        max_retries: int = 3,
+        max_clients: int = 1024,
+        request_timeout: int = 10,
+        etag_entries: int = 0,
+    ):
+        self.store = store
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.redirect_uri = redirect_uri
+        self.rate_limiter = rate_limiter
+        self.artist_cache = artist_cache
+        self.coalesce_ttl = coalesce_ttl
+        self.max_retries = max_retries
+        self.max_clients = max_clients
+        self.etag_entries = etag_entries
+        self.http = httpx.AsyncClient(timeout=request_timeout)
+        self._clients: OrderedDict[str, SpotifyAPI] = OrderedDict()
+        self.login_auth = SpotifyAuth(
+            client_id=client_id,
+            client_secret=client_secret,
+            redirect_uri=redirect_uri,
+            store=store,
+            http=self.http,
+        )
+
+    def get(self, user_id: str) -> SpotifyAPI:
+        api = self._clients.get(user_id)
+        if api is not None:
+            self._clients.move_to_end(user_id)
+            return api
+
+        auth = SpotifyAuth(
+            client_id=self.client_id,
+            client_secret=self.client_secret,
+            redirect_uri=self.redirect_uri,
+            store=self.store,
+            user_id=user_id,
+            http=self.http,
+        )
+        api = SpotifyAPI(
+            auth=auth,
+            coalesce_ttl=self.coalesce_ttl,
+            artist_cache=self.artist_cache,
+            rate_limiter=self.rate_limiter,
+            max_retries=self.max_retries,
+            client=self.http,
+            etag_entries=self.etag_entries,
+        )
+        self._clients[user_id] = api
+        if len(self._clients) > self.max_clients:
+            self._clients.popitem(last=False)
+        return api
+
+    async def register(self, token: dict) -> str:
+        """
+        Store the tokens returned by the OAuth code exchange under the
+        Spotify user ID of their owner.
+
+        Args:
+            token (dict): Payload returned by Spotify's token endpoint.
+
+        Returns:
+            str: The Spotify user ID the tokens were stored under.
+        """
+        response = await self.http.get(
+            f"{SpotifyAPI.BASE_URL}/me",
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+        )
+        response.raise_for_status()
+        user_id = response.json()["id"]
+
+        token_data = TokenData(
+            access_token=token["access_token"],
+            refresh_token=token.get("refresh_token"),
+            expires_at=time.time() + token["expires_in"],
+        )
+        await self.store.set(user_id, token_data)
+        # A client of this user may still hold the previous tokens in memory.
+        if user_id in self._clients:
+            self._clients[user_id].auth.use_token(token_data)
+        logger.info(f"Registered Spotify user {user_id}")
+        return user_id
+
+    async def aclose(self):
+        await self.http.aclose()
+        await self.store.aclose()
@@ -0,0 +1,272 @@
+import asyncio
+import json
+import os
+import random
+import time
+from collections import deque
+from typing import Any
+
+import httpx
+
+from src.cifra_spotify.app.core.config import settings
+from src.cifra_spotify.app.core.logger import logger
+
+WEBHOOK_VERSION = 1
+
+
+def webhook_envelope(events: list[dict]) -> dict:
+    """
+    Body of every webhook POST: ``{"version": 1, "events": [...]}``.
+
+    Each event names the account it belongs to in ``user_id``, since the
+    events of every polled account share the same receiver.
+    """
+    return {"version": WEBHOOK_VERSION, "events": events}
+
+
+class WebhookQueue:
+    """
+    Outbound webhook delivery decoupled from the polling loop.
+
+    :meth:`put` only buffers the event, so a slow or failing receiver never
+    stalls a tick. Delivery workers drain the buffer in batches, each posted
+    as one :func:`webhook_envelope`, whatever its size. Failed batches
+    are retried with jittered exponential backoff and, once ``max_retries``
+    is exhausted (or the receiver rejects them with a 4xx), moved to the
+    dead-letter store.
+
+    When the in-memory buffer is full, events are appended to ``spill_path``
+    (JSON lines) and read back as the buffer drains, including after a
+    restart; without a spill file they are dropped and counted. With more
+    than one worker, batches may reach the receiver out of order.
+
+    Args:
+        url (str): Receiver URL.
+        client (httpx.AsyncClient, optional): Shared HTTP client. One is
+            created (and closed by :meth:`stop`) when omitted.
+        maxsize (int): Events kept in memory.
+        batch_size (int): Maximum events per POST.
+        batch_wait (float): Seconds to wait for a batch to fill up.
+        workers (int): Concurrent delivery workers.
+        max_retries (int): Extra attempts after a failed delivery.
+        backoff_base (float): First retry delay, in seconds.
+        spill_path (str, optional): File used when the buffer is full.
+        dead_letter_path (str, optional): File receiving undeliverable
+            batches. The last ones are always kept in :attr:`dead_letters`.
+    """
+
+    RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        url: str,
+        client: httpx.AsyncClient | None = None,
+        maxsize: int = 1000,
+        batch_size: int = 20,
+        batch_wait: float = 0.5,
+        workers: int = 2,
+        max_retries: int = 5,
+        backoff_base: float = 1,
+        spill_path: str | None = None,
+        dead_letter_path: str | None = None,
+    ):
+        self.url = url
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(timeout=10)
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.spill_path = spill_path
+        self.dead_letter_path = dead_letter_path
+        self.dead_letters: deque[list[dict]] = deque(maxlen=100)
+
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(maxsize)
+        self._spilled = 0
+        self._spill_lock = asyncio.Lock()
+        self._tasks: list[asyncio.Task] = []
+        self._sending = 0
+        self._counters = {
+            "enqueued": 0,
+            "delivered": 0,
+            "batches": 0,
+            "retries": 0,
+            "dead_lettered": 0,
+            "dropped": 0,
+            "spilled": 0,
+        }
+
+    async def start(self):
+        if self._tasks:
+            return
+        logger.info(f"[Webhook] Starting {self.workers} delivery workers...")
+        if self.spill_path:
+            # Pick up events spilled before the last shutdown.
+            self._spilled = await asyncio.to_thread(self._count_lines, self.spill_path)
+            await self._restore_spilled()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 5):
+        """Give pending events ``timeout`` seconds to go out, then stop."""
+        logger.info("[Webhook] Stopping delivery workers...")
+        if self._tasks:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=timeout)
+            except TimeoutError:
+                logger.warning(
+                    f"[Webhook] {self._queue.qsize()} events left undelivered."
+                )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def put(self, event: dict) -> bool:
+        """
+        Buffer an event for delivery without waiting for the receiver.
+
+        Returns:
+            bool: ``False`` when the event had to be dropped.
+        """
+        self._counters["enqueued"] += 1
+
+        if not self._spilled:
+            try:
+                self._queue.put_nowait(event)
+                return True
+            except asyncio.QueueFull:
+                pass
+
+        if not self.spill_path:
+            logger.warning("[Webhook] Queue full, dropping event.")
+            self._counters["dropped"] += 1
+            return False
+
+        # Once anything is on disk, keep appending there to preserve order.
+        async with self._spill_lock:
+            await asyncio.to_thread(self._append_lines, self.spill_path, [event])
+            self._spilled += 1
+            self._counters["spilled"] += 1
+        return True
+
+    async def _restore_spilled(self):
+        async with self._spill_lock:
+            room = self._queue.maxsize - self._queue.qsize()
+            if not self._spilled or room <= 0:
+                return
+            events = await asyncio.to_thread(self._take_lines, self.spill_path, room)
+            for event in events:
+                self._queue.put_nowait(event)
+            self._spilled -= len(events)
+            logger.debug(f"[Webhook] Restored {len(events)} spilled events.")
+
+    @staticmethod
+    def _append_lines(path: str, events: list[Any]):
+        with open(path, "a", encoding="utf-8") as file:
+            for event in events:
+                file.write(json.dumps(event) + "\n")
+
+    @staticmethod
+    def _count_lines(path: str) -> int:
+        if not os.path.exists(path):
+            return 0
+        with open(path, encoding="utf-8") as file:
+            return sum(1 for _ in file)
+
+    @staticmethod
+    def _take_lines(path: str, count: int) -> list[dict]:
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding="utf-8") as file:
+            lines = file.readlines()
+        with open(path, "w", encoding="utf-8") as file:
+            file.writelines(lines[count:])
+        return [json.loads(line) for line in lines[:count]]
+
+    async def _next_batch(self) -> list[dict]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except TimeoutError:
+                break
+        return batch
+
+    async def _worker(self):
+        while True:
+            batch = await self._next_batch()
+            self._sending += 1
+            try:
+                await self._deliver(batch)
+            finally:
+                self._sending -= 1
+                for _ in batch:
+                    self._queue.task_done()
+            if self._spilled:
+                await self._restore_spilled()
+
+    async def _deliver(self, batch: list[dict]):
+        payload = webhook_envelope(batch)
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.client.post(self.url, json=payload)
+                if response.is_success:
+                    logger.info(f"[Webhook] Delivered {len(batch)} events.")
+                    self._counters["delivered"] += len(batch)
+                    self._counters["batches"] += 1
+                    return
+                error = f"status {response.status_code}"
+                if response.status_code not in self.RETRYABLE_STATUS:
+                    break
+            except Exception as exc:
+                error = str(exc) or type(exc).__name__
+
+            if attempt == self.max_retries:
+                break
+            delay = self.backoff_base * 2**attempt * random.uniform(0.5, 1.5)
+            logger.warning(
+                f"[Webhook] Delivery failed ({error}). Retrying in {delay:.2f}s"
+            )
+            self._counters["retries"] += 1
+            await asyncio.sleep(delay)
+
+        logger.error(f"[Webhook] Giving up on {len(batch)} events ({error}).")
+        await self._dead_letter(batch)
+
+    async def _dead_letter(self, batch: list[dict]):
+        self._counters["dead_lettered"] += len(batch)
+        self.dead_letters.append(batch)
+        if self.dead_letter_path:
+            await asyncio.to_thread(self._append_lines, self.dead_letter_path, batch)
+
+    def metrics(self) -> dict:
+        return {
+            **self._counters,
+            "depth": self._queue.qsize(),
+            "capacity": self._queue.maxsize,
+            "on_disk": self._spilled,
+            "sending": self._sending,
+        }
+
+
+def build_webhook_queue(
+    url: str, client: httpx.AsyncClient | None = None
+) -> WebhookQueue:
+    return WebhookQueue(
+        url,
+        client=client,
+        maxsize=settings.SPOTIFY_WEBHOOK_QUEUE_SIZE,
+        batch_size=settings.SPOTIFY_WEBHOOK_BATCH_SIZE,
+        batch_wait=settings.SPOTIFY_WEBHOOK_BATCH_WAIT,
+        workers=settings.SPOTIFY_WEBHOOK_WORKERS,
+        max_retries=settings.SPOTIFY_WEBHOOK_MAX_RETRIES,
+        spill_path=settings.SPOTIFY_WEBHOOK_SPILL_PATH,
+        dead_letter_path=settings.SPOTIFY_WEBHOOK_DEAD_LETTER_PATH,
+    )
@@ -1,10 +1,13 @@
-from typing import Callable, TypedDict
+from typing import Callable, NotRequired, TypedDict
 
 
 class CifraType(TypedDict):
     cifra: str
     tom: str
     music_name: str
+    url: NotRequired[str]
+    # How well the page matched the searched track, from 0 to 1.
+    confidence: NotRequired[float]
 
 
 MedleySplitter = Callable[[str, str], list[str]]
@@ -0,0 +1,158 @@
+import asyncio
+import bisect
+import hashlib
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable
+
+from src.cifra_spotify.app.core.logger import logger
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent hash ring with virtual nodes.
+
+    Adding or removing a node only moves the keys that node owned (or now
+    owns), so a worker joining or leaving reshuffles about ``1/N`` accounts.
+
+    Args:
+        nodes (Iterable[str]): Initial node names.
+        replicas (int): Virtual nodes per node; more gives a smoother spread.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 100):
+        self.replicas = replicas
+        self._ring: list[tuple[int, str]] = []
+        self._nodes: set[str] = set()
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> set[str]:
+        return set(self._nodes)
+
+    def add(self, node: str):
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for replica in range(self.replicas):
+            bisect.insort(self._ring, (_hash(f"{node}#{replica}"), node))
+
+    def remove(self, node: str):
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        self._ring = [entry for entry in self._ring if entry[1] != node]
+
+    def get(self, key: str) -> str | None:
+        if not self._ring:
+            return None
+        index = bisect.bisect(self._ring, (_hash(key), ""))
+        return self._ring[index % len(self._ring)][1]
+
+
+class LeaseTable:
+    """
+    Worker membership kept in a SQLite table.
+
+    Each worker renews its lease with :meth:`heartbeat`; workers whose lease
+    is older than ``ttl`` seconds are considered gone. Every process pointing
+    at the same file (local disk or shared volume) sees the same membership.
+
+    Args:
+        path (str): SQLite database file.
+        ttl (float): Seconds a lease stays valid without a heartbeat.
+        clock (Callable[[], float]): Time source, overridable in tests.
+    """
+
+    def __init__(
+        self, path: str, ttl: float = 30, clock: Callable[[], float] = time.time
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.clock = clock
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _execute(self, query: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS polling_leases ("
+                    "worker_id TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+                )
+            rows = self._conn.execute(query, params).fetchall()
+            self._conn.commit()
+            return rows
+
+    async def heartbeat(self, worker_id: str):
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO polling_leases (worker_id, expires_at) "
+            "VALUES (?, ?)",
+            (worker_id, self.clock() + self.ttl),
+        )
+
+    async def release(self, worker_id: str):
+        await asyncio.to_thread(
+            self._execute,
+            "DELETE FROM polling_leases WHERE worker_id = ?",
+            (worker_id,),
+        )
+
+    async def active_workers(self) -> list[str]:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT worker_id FROM polling_leases WHERE expires_at > ? "
+            "ORDER BY worker_id",
+            (self.clock(),),
+        )
+        return [row[0] for row in rows]
+
+    async def aclose(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class ShardCoordinator:
+    """
+    Decide which accounts this worker polls.
+
+    On every :meth:`refresh` the worker renews its lease and rebuilds the
+    hash ring from the live workers, so the split rebalances when a worker
+    joins or its lease expires. Two workers may overlap for at most one
+    refresh period while they converge on the same membership.
+    """
+
+    def __init__(self, worker_id: str, leases: LeaseTable, replicas: int = 100):
+        self.worker_id = worker_id
+        self.leases = leases
+        self.ring = HashRing(replicas=replicas)
+
+    async def refresh(self) -> bool:
+        """Renew this worker's lease and return whether membership changed."""
+        await self.leases.heartbeat(self.worker_id)
+        workers = set(await self.leases.active_workers())
+        if workers == self.ring.nodes:
+            return False
+
+        logger.info(f"[Shard] Workers changed: {sorted(workers)}")
+        self.ring = HashRing(workers, replicas=self.ring.replicas)
+        return True
+
+    def owns(self, user_id: str) -> bool:
+        return self.ring.get(user_id) == self.worker_id
+
+    def assigned(self, user_ids: Iterable[str]) -> list[str]:
+        return [user_id for user_id in user_ids if self.owns(user_id)]
+
+    async def leave(self):
+        await self.leases.release(self.worker_id)
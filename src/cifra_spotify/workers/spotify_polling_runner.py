@@ -1,15 +1,148 @@
+import argparse
 import asyncio
+import os
 import signal
+import socket
+
+import httpx
 
 from src.cifra_spotify.api.deps import spotify
+from src.cifra_spotify.app.core.config import settings
 from src.cifra_spotify.app.core.logger import logger
+from src.cifra_spotify.cifras.cache import build_cifra_cache, build_search_cache
+from src.cifra_spotify.cifras.cifra_club import CifraClub
+from src.cifra_spotify.cifras.parsers.pool import build_parser_pool
+from src.cifra_spotify.cifras.prefetch import ChordPrefetcher
+from src.cifra_spotify.spotify import spotify_users
 from src.cifra_spotify.spotify.pooling import SpotifyPollingService
+from src.cifra_spotify.spotify.scheduler import PollingScheduler
+from src.cifra_spotify.spotify.webhook_queue import WebhookQueue, build_webhook_queue
+from src.cifra_spotify.workers.sharding import LeaseTable, ShardCoordinator
 
 
-async def main():
-    stop_event = asyncio.Event()
+def build_prefetcher() -> ChordPrefetcher | None:
+    """
+    Chord prefetcher for this worker, when ``CIFRA_PREFETCH`` is enabled.
+
+    It writes to the same SQLite caches as the API, so pages warmed here are
+    served from disk by the API process.
+    """
+    if not settings.CIFRA_PREFETCH:
+        return None
+    cifra_club = CifraClub(
+        cache=build_cifra_cache(),
+        search_cache=build_search_cache(),
+        parser_pool=build_parser_pool(),
+        stream_pages=settings.CIFRA_STREAM_PAGES,
+    )
+    return ChordPrefetcher(
+        cifra_club,
+        queue_depth=settings.CIFRA_PREFETCH_QUEUE_DEPTH,
+        max_concurrency=settings.CIFRA_PREFETCH_CONCURRENCY,
+    )
+
+
+async def close_prefetcher(prefetcher: ChordPrefetcher | None):
+    if prefetcher:
+        await prefetcher.aclose()
+        await prefetcher.cifra_club.aclose()
+
+
+def sync_accounts(
+    scheduler: PollingScheduler,
+    http: httpx.AsyncClient,
+    user_ids: list[str],
+    webhook_queue: WebhookQueue | None = None,
+    prefetcher: ChordPrefetcher | None = None,
+):
+    """Make the scheduler track exactly ``user_ids``."""
+    wanted = set(user_ids)
+    for user_id in set(scheduler.user_ids()) - wanted:
+        scheduler.remove(user_id)
+    for user_id in wanted - set(scheduler.user_ids()):
+        service = SpotifyPollingService(
+            api=spotify_users.get(user_id),
+            http_client=http,
+            webhook_queue=webhook_queue,
+            user_id=user_id,
+            predictive=settings.SPOTIFY_POLLING_PREDICTIVE,
+            max_predictive_interval=settings.SPOTIFY_POLLING_MAX_PREDICTIVE_INTERVAL,
+        )
+        if prefetcher:
+            prefetcher.attach(service)
+        scheduler.add(user_id, service)
+
+
+async def run_all_users(
+    stop_event: asyncio.Event, coordinator: ShardCoordinator | None = None
+):
+    scheduler = PollingScheduler(max_concurrency=settings.SPOTIFY_POLLING_CONCURRENCY)
+    http = httpx.AsyncClient(timeout=10)
+    # Every account shares one delivery queue so events from different
+    # listeners are batched into the same POSTs.
+    webhook_queue = None
+    if settings.SPOTIFY_WEBHOOK_URL:
+        webhook_queue = build_webhook_queue(settings.SPOTIFY_WEBHOOK_URL, http)
+        await webhook_queue.start()
+    prefetcher = build_prefetcher()
+    sync_interval = settings.SPOTIFY_POLLING_SYNC_INTERVAL
+    if coordinator:
+        # Renew the lease well before it expires.
+        sync_interval = min(sync_interval, coordinator.leases.ttl / 3)
 
-    service = SpotifyPollingService(api=spotify)
+    await scheduler.start()
+    logger.info("Spotify multi-account polling worker started.")
+
+    try:
+        while not stop_event.is_set():
+            user_ids = await spotify_users.store.user_ids()
+            if coordinator:
+                await coordinator.refresh()
+                user_ids = coordinator.assigned(user_ids)
+            sync_accounts(scheduler, http, user_ids, webhook_queue, prefetcher)
+            logger.debug(f"[Scheduler] {scheduler.metrics()}")
+            if webhook_queue:
+                logger.debug(f"[Webhook] {webhook_queue.metrics()}")
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=sync_interval)
+            except TimeoutError:
+                pass
+    finally:
+        await scheduler.stop()
+        if webhook_queue:
+            await webhook_queue.stop()
+        await close_prefetcher(prefetcher)
+        if coordinator:
+            await coordinator.leave()
+            await coordinator.leases.aclose()
+        await http.aclose()
+        await spotify_users.aclose()
+
+
+async def run_single_user(stop_event: asyncio.Event):
+    service = SpotifyPollingService(
+        api=spotify,
+        predictive=settings.SPOTIFY_POLLING_PREDICTIVE,
+        max_predictive_interval=settings.SPOTIFY_POLLING_MAX_PREDICTIVE_INTERVAL,
+    )
+    prefetcher = build_prefetcher()
+    if prefetcher:
+        prefetcher.attach(service)
+    await service.start()
+    logger.info("Spotify polling worker started.")
+
+    try:
+        await stop_event.wait()
+    finally:
+        await service.stop()
+        await close_prefetcher(prefetcher)
+        await spotify.aclose()
+
+
+async def main(
+    all_users: bool = False, shard: bool = False, worker_id: str | None = None
+):
+    stop_event = asyncio.Event()
 
     def _handle_stop(*_):
         logger.info("Shutdown signal received.")
@@ -23,17 +156,49 @@ async def main():
         except NotImplementedError:
             pass
 
-    await service.start()
-    logger.info("Spotify polling worker started.")
-
     try:
-        await stop_event.wait()
+        if shard:
+            coordinator = ShardCoordinator(
+                worker_id or f"{socket.gethostname()}-{os.getpid()}",
+                LeaseTable(
+                    settings.SPOTIFY_SHARD_DB, ttl=settings.SPOTIFY_SHARD_LEASE_TTL
+                ),
+            )
+            await run_all_users(stop_event, coordinator)
+        elif all_users:
+            await run_all_users(stop_event)
+        else:
+            await run_single_user(stop_event)
     finally:
-        await service.stop()
-        await spotify.aclose()
         logger.info("Spotify polling worker stopped.")
 
 
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Spotify polling worker")
+    parser.add_argument(
+        "--all-users",
+        action="store_true",
+        help="Poll every account found in the token store.",
+    )
+    parser.add_argument(
+        "--shard",
+        action="store_true",
+        help=(
+            "Poll only the accounts assigned to this worker by consistent "
+            "hashing across every worker sharing the lease table."
+        ),
+    )
+    parser.add_argument(
+        "--worker-id",
+        default=None,
+        help="Stable worker name for sharding (default: hostname-pid).",
+    )
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_args()
+    asyncio.run(
+        main(all_users=args.all_users, shard=args.shard, worker_id=args.worker_id)
+    )
     logger.info("Spotify polling worker stopped.")
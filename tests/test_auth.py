@@ -1,6 +1,8 @@
+import asyncio
 import time
 from unittest.mock import AsyncMock, mock_open, patch
 
+import httpx
 import pytest
 
 from src.cifra_spotify.spotify.auth import SpotifyAuth
@@ -98,3 +100,88 @@ async def test_ensure_token_no_access_raises(spotify_auth):
     spotify_auth.access_token = None
     with pytest.raises(Exception, match="User not authenticated"):
         await spotify_auth.ensure_token()
+
+
+@pytest.mark.asyncio
+async def test_ensure_token_refreshes_once_for_concurrent_callers(spotify_auth):
+    async def slow_refresh():
+        await asyncio.sleep(0.01)
+        spotify_auth.access_token = "fresh"
+        spotify_auth.expires_at = time.time() + 3600
+
+    spotify_auth.access_token = "stale"
+    spotify_auth.expires_at = time.time() - 10
+
+    with patch.object(
+        SpotifyAuth, "refresh_access_token", new=AsyncMock(side_effect=slow_refresh)
+    ) as mock_refresh:
+        tokens = await asyncio.gather(*[spotify_auth.ensure_token() for _ in range(10)])
+
+    assert tokens == ["fresh"] * 10
+    mock_refresh.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_ensure_token_refreshes_in_background_before_expiry(spotify_auth):
+    spotify_auth.access_token = "current"
+    spotify_auth.expires_at = time.time() + 30
+
+    with patch.object(
+        SpotifyAuth, "refresh_access_token", new_callable=AsyncMock
+    ) as mock_refresh:
+        token = await spotify_auth.ensure_token()
+        await asyncio.sleep(0)
+
+    assert token == "current"
+    mock_refresh.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_backs_off(spotify_auth):
+    spotify_auth.access_token = "current"
+    spotify_auth.expires_at = time.time() + 30
+
+    with patch.object(
+        SpotifyAuth,
+        "refresh_access_token",
+        new=AsyncMock(side_effect=Exception("Failed to refresh access token.")),
+    ) as mock_refresh:
+        for _ in range(5):
+            assert await spotify_auth.ensure_token() == "current"
+            await asyncio.sleep(0)
+
+        assert mock_refresh.await_count == 1
+
+        spotify_auth.expires_at = time.time() - 10
+        with pytest.raises(Exception, match="Failed to refresh"):
+            await spotify_auth.ensure_token()
+        assert mock_refresh.await_count == 1
+
+        spotify_auth._refresh_retry_at = 0
+        with pytest.raises(Exception, match="Failed to refresh"):
+            await spotify_auth.ensure_token()
+        assert mock_refresh.await_count == 2
+        assert spotify_auth._refresh_failures == 2
+
+
+@pytest.mark.asyncio
+async def test_token_calls_reuse_one_client(spotify_auth):
+    spotify_auth.refresh_token = "rtoken"
+    response = httpx.Response(
+        200,
+        json={"access_token": "access2", "expires_in": 3600},
+        request=httpx.Request("POST", SpotifyAuth.TOKEN_URL),
+    )
+
+    with (
+        patch("httpx.AsyncClient.post", new=AsyncMock(return_value=response)),
+        patch.object(spotify_auth, "_save_to_file"),
+    ):
+        await spotify_auth.refresh_access_token()
+        client = spotify_auth.http
+        await spotify_auth.refresh_access_token()
+
+    assert client is not None
+    assert spotify_auth.http is client
+    await spotify_auth.aclose()
+    assert spotify_auth.http is None
@@ -0,0 +1,111 @@
+import asyncio
+import contextlib
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from main import create_app
+from src.cifra_spotify.app.core.session import sessions
+from src.cifra_spotify.spotify.broadcaster import NowPlayingBroadcaster
+from src.cifra_spotify.spotify.scheduler import PollingScheduler
+from src.cifra_spotify.spotify.spotify import SpotifyAPI
+
+
+def playing(track_id):
+    response = MagicMock(status_code=200)
+    response.json.return_value = {
+        "is_playing": True,
+        "progress_ms": 1000,
+        "item": {"id": track_id, "name": "Song", "artists": [{"name": "Artist"}]},
+    }
+    return response
+
+
+@pytest.mark.asyncio
+async def test_subscribers_share_one_poll_and_get_last_event():
+    api = MagicMock(spec=SpotifyAPI)
+    api.get_current_track = AsyncMock(return_value=playing("1"))
+    api_for = MagicMock(return_value=api)
+
+    broadcaster = NowPlayingBroadcaster(PollingScheduler(), api_for=api_for)
+    await broadcaster.start()
+
+    async with broadcaster.subscribe("alice") as first:
+        event, message = await asyncio.wait_for(first.get(), 1)
+        assert event == "start"
+        assert json.loads(message)["track"]["id"] == "1"
+
+        async with broadcaster.subscribe("alice") as second:
+            assert second.get_nowait() == (event, message)
+            assert broadcaster.metrics()["subscribers"] == 2
+
+        assert api_for.call_count == 1
+        assert len(broadcaster.scheduler) == 1
+
+    assert len(broadcaster.scheduler) == 0
+    assert broadcaster.metrics()["accounts"] == 0
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_oldest_events():
+    broadcaster = NowPlayingBroadcaster(
+        PollingScheduler(), api_for=MagicMock(), queue_size=2
+    )
+
+    async with broadcaster.subscribe("bob") as queue:
+        for track_id in ("1", "2", "3"):
+            broadcaster.publish("bob", "change", {"id": track_id})
+
+        ids = [json.loads(queue.get_nowait()[1])["track"]["id"] for _ in range(2)]
+
+    assert ids == ["2", "3"]
+    assert broadcaster.dropped == 1
+
+
+class FakeBroadcaster:
+    def __init__(self):
+        self.accounts = []
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, account):
+        self.accounts.append(account)
+        queue = asyncio.Queue()
+        queue.put_nowait(("start", json.dumps({"event": "start", "track": {}})))
+        yield queue
+
+
+def test_stream_uses_the_session_account():
+    app = create_app()
+    app.state.now_playing = FakeBroadcaster()
+    client = TestClient(app)
+    session = sessions.issue("alice")
+
+    with client.websocket_connect(
+        "/api/stream/now_playing/ws",
+        headers={"Authorization": f"Bearer {session}"},
+    ) as websocket:
+        assert json.loads(websocket.receive_text())["event"] == "start"
+
+    assert app.state.now_playing.accounts == ["alice"]
+
+
+def test_stream_rejects_forged_sessions():
+    app = create_app()
+    app.state.now_playing = FakeBroadcaster()
+    client = TestClient(app)
+    forged = {"Authorization": "Bearer alice"}
+
+    response = client.get("/api/stream/now_playing", headers=forged)
+    assert response.status_code == 401
+
+    with (
+        pytest.raises(WebSocketDisconnect) as disconnect,
+        client.websocket_connect("/api/stream/now_playing/ws", headers=forged),
+    ):
+        pass
+    assert disconnect.value.code == 1008
+    assert app.state.now_playing.accounts == []
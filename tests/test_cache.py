@@ -0,0 +1,99 @@
+import time
+
+import httpx
+import pytest
+
+from src.cifra_spotify.app.core.cache import SQLiteCache, TieredCache, TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    now[0] += 6
+    assert cache.get("a") is None
+    assert cache.stats.expirations == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_roundtrip_and_eviction(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), max_entries=2)
+    await cache.set("a", {"cifra": "<pre>A</pre>"})
+    await cache.set("b", {"cifra": "<pre>B</pre>"})
+    await cache.set("c", {"cifra": "<pre>C</pre>"})
+
+    assert await cache.get("a") is None
+    assert await cache.get("c") == {"cifra": "<pre>C</pre>"}
+    assert cache.stats.evictions == 1
+    await cache.aclose()
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_promotes_disk_hits(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = TieredCache(TTLCache(maxsize=10), SQLiteCache(path))
+    await first.set("key", {"tom": "G"})
+    await first.aclose()
+
+    second = TieredCache(TTLCache(maxsize=10), SQLiteCache(path))
+    assert await second.get("key") == {"tom": "G"}
+    assert second.memory.get("key") == {"tom": "G"}
+    assert second.stats()["disk"]["hits"] == 1
+    await second.aclose()
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_returns_copies():
+    cache = TieredCache(TTLCache(maxsize=10))
+    value = {"tom": "G", "cifra": ["<pre>G</pre>"]}
+    await cache.set("key", value)
+    value["tom"] = "A"
+
+    first = await cache.get("key")
+    first["cifra"].append("<pre>D</pre>")
+
+    assert await cache.get("key") == {"tom": "G", "cifra": ["<pre>G</pre>"]}
+
+
+@pytest.mark.asyncio
+async def test_fetch_cifra_uses_cache(monkeypatch):
+    from src.cifra_spotify.cifras.cifra_club import CifraClub
+
+    calls = []
+
+    async def fake_fetch_page(self, uri):
+        calls.append(uri)
+        return httpx.Response(
+            200,
+            text="<h1 class='t1'>Lua</h1><pre>OK</pre>",
+            request=httpx.Request("GET", "https://cifraclub.com.br/" + uri),
+        )
+
+    monkeypatch.setattr(CifraClub, "_fetch_page", fake_fetch_page)
+
+    cifra = CifraClub(cache=TieredCache(TTLCache(maxsize=10)))
+    first = await cifra._fetch_cifra("exalta", "lua", tabs=True)
+    second = await cifra._fetch_cifra("exalta", "lua", tabs=True)
+    await cifra._fetch_cifra("exalta", "lua", tabs=False)
+
+    assert first == second
+    assert len(calls) == 2
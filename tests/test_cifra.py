@@ -1,8 +1,19 @@
+import asyncio
+
 import httpx
 import pytest
 
+from src.cifra_spotify.app.custom_exceptions.exceptions import (
+    CifraPageTooLargeException,
+    PdfRenderBusyException,
+)
 from src.cifra_spotify.cifras.cifra_base import Instruments
 from src.cifra_spotify.cifras.cifra_club import CifraClub, divisor_medley_default
+from src.cifra_spotify.cifras.render.cifraclub import (
+    iter_html_document,
+    render_html_document,
+)
+from src.cifra_spotify.cifras.render.pdf import PdfRenderPool
 
 
 def test_divisor_medley_default():
@@ -85,3 +96,234 @@ async def test_generate_pdf(monkeypatch):
     pdf_bytes = await cifra.generate_pdf("<html></html>")
 
     assert pdf_bytes.startswith(b"%PDF")
+
+
+@pytest.mark.asyncio
+async def test_shared_client_is_reused_and_closed():
+    client = httpx.AsyncClient()
+    cifra = CifraClub(client=client)
+
+    assert cifra.client is client
+
+    await cifra.aclose()
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_search_musics_runs_medley_parts_concurrently(monkeypatch):
+    running = []
+    peak = []
+
+    async def fake_search(self, music):
+        running.append(music)
+        peak.append(len(running))
+        await asyncio.sleep(0.01 if music == "A" else 0)
+        running.remove(music)
+        return httpx.Response(
+            200,
+            json={
+                "response": {
+                    "docs": [{"txt": music, "art": "X", "dns": "x", "url": music}]
+                }
+            },
+        )
+
+    async def fake_fetch_cifra(self, singer, music, tabs, instrument):
+        return {"music_name": music, "tom": "", "cifra": ""}
+
+    monkeypatch.setattr(CifraClub, "search_api_cifra", fake_search)
+    monkeypatch.setattr(CifraClub, "_fetch_cifra", fake_fetch_cifra)
+
+    cifra = CifraClub(max_concurrency=2)
+    result = await cifra.search_musics(singer="X", music="A/B/C")
+
+    assert [item["music_name"] for item in result] == ["A", "B", "C"]
+    assert max(peak) == 2
+
+
+def streamed_page(sent: list[int], footer_chunks: int = 100, key: bool = True):
+    async def body():
+        chunks = [
+            b'<html><h1 class="t1">Lua</h1>'
+            + (b'<span id="cifra_tom">tom: G</span>' if key else b""),
+            b"<pre><b>G</b> ta vendo aquela lua",
+            b"</pre>",
+        ] + [b"<div>footer</div>" * 100] * footer_chunks
+        for chunk in chunks:
+            sent.append(len(chunk))
+            yield chunk
+
+    return body()
+
+
+@pytest.mark.asyncio
+async def test_stream_cifra_page_stops_after_chord_block():
+    sent = []
+
+    def handler(request):
+        return httpx.Response(200, content=streamed_page(sent))
+
+    cifra = CifraClub(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        stream_pages=True,
+    )
+    result = await cifra._fetch_cifra("exaltasamba", "lua", tabs=False)
+
+    assert result["music_name"] == "Lua"
+    assert result["tom"] == " G"
+    assert result["cifra"] == "<pre><b>G</b> ta vendo aquela lua</pre>"
+    assert len(sent) == 3
+
+
+@pytest.mark.asyncio
+async def test_stream_cifra_page_stops_early_without_a_key():
+    sent = []
+
+    def handler(request):
+        return httpx.Response(200, content=streamed_page(sent, key=False))
+
+    cifra = CifraClub(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        stream_pages=True,
+        max_page_bytes=10_000,
+    )
+    result = await cifra._fetch_cifra("exaltasamba", "lua", tabs=False)
+
+    assert result["music_name"] == "Lua"
+    assert result["tom"] == ""
+    assert result["cifra"] == "<pre><b>G</b> ta vendo aquela lua</pre>"
+    assert len(sent) == 3
+
+
+@pytest.mark.asyncio
+async def test_stream_cifra_page_enforces_size_limit():
+    async def endless_pre():
+        yield b'<h1 class="t1">Lua</h1><pre>'
+        while True:
+            yield b"x" * 4096
+
+    def handler(request):
+        return httpx.Response(200, content=endless_pre())
+
+    cifra = CifraClub(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        stream_pages=True,
+        max_page_bytes=10_000,
+    )
+    with pytest.raises(CifraPageTooLargeException):
+        await cifra._fetch_cifra("exaltasamba", "lua", tabs=False)
+
+
+@pytest.mark.asyncio
+async def test_pdf_render_pool_caches_and_rejects_when_full():
+    pool = PdfRenderPool(workers=1, max_pending=1)
+    try:
+        first, second = await asyncio.gather(
+            pool.render("<html>a</html>"), pool.render("<html>a</html>")
+        )
+        again = await pool.render("<html>a</html>")
+
+        busy = asyncio.gather(
+            pool.render("<html>b</html>"),
+            pool.render("<html>c</html>"),
+            return_exceptions=True,
+        )
+        results = await busy
+    finally:
+        await pool.aclose()
+
+    assert first == second == again
+    assert first.startswith(b"%PDF")
+    assert isinstance(results[0], bytes)
+    assert isinstance(results[1], PdfRenderBusyException)
+    metrics = pool.metrics()
+    assert metrics["rendered"] == 2
+    assert metrics["cached"] == 2
+    assert metrics["rejected"] == 1
+    assert results[1].retry_after >= 1
+
+
+def test_pdf_retry_after_follows_queue_depth():
+    pool = PdfRenderPool(workers=2, max_pending=8)
+    assert pool.retry_after() == 1
+
+    for _ in range(4):
+        pool.render_time.observe(3)
+    pool.pending = 8
+    assert pool.retry_after() == 12
+
+
+def test_render_html_document_joins_streamed_chunks():
+    songs = [
+        {"music_name": f"Song {i}", "tom": "tom:G", "cifra": f"<pre>{i}</pre>"}
+        for i in range(3)
+    ]
+    chunks = list(iter_html_document(songs))
+
+    assert len(chunks) == len(songs) + 2
+    assert render_html_document(songs) == "".join(chunks)
+    assert render_html_document(iter(songs)) == render_html_document(songs)
+    assert "Tom: G" in chunks[1]
+
+
+@pytest.mark.asyncio
+async def test_search_musics_fetches_winner_and_falls_back(monkeypatch):
+    docs = [
+        {"txt": "Lua (Ao Vivo)", "art": "Exaltasamba", "dns": "exalta", "url": "live"},
+        {"txt": "Lua", "art": "Exaltasamba", "dns": "exalta", "url": "broken"},
+        {"txt": "Lua", "art": "Exaltasamba", "dns": "exalta", "url": "lua"},
+    ]
+    fetched = []
+
+    async def fake_search_docs(self, music):
+        return docs
+
+    async def fake_fetch_cifra(self, singer, music, tabs, instrument):
+        fetched.append(music)
+        if music == "broken":
+            raise ValueError("Cifra not found")
+        return {"music_name": music, "tom": "", "cifra": ""}
+
+    monkeypatch.setattr(CifraClub, "_search_docs", fake_search_docs)
+    monkeypatch.setattr(CifraClub, "_fetch_cifra", fake_fetch_cifra)
+    cifra = CifraClub()
+
+    live = await cifra.search_musics(singer="Exaltasamba", music="Lua - Ao Vivo")
+    assert fetched == ["live"]
+    assert live[0]["confidence"] == 1.0
+
+    fetched.clear()
+    studio = await cifra.search_musics(singer="Exaltasamba", music="Lua")
+    assert fetched == ["broken", "lua"]
+    assert studio == [{"music_name": "lua", "tom": "", "cifra": "", "confidence": 1.0}]
+
+
+@pytest.mark.asyncio
+async def test_search_musics_falls_back_from_oversized_and_unreachable_pages(
+    monkeypatch,
+):
+    docs = [
+        {"txt": "Lua", "art": "Exaltasamba", "dns": "exalta", "url": url}
+        for url in ("huge", "down", "lua")
+    ]
+    fetched = []
+
+    async def fake_search_docs(self, music):
+        return docs
+
+    async def fake_fetch_cifra(self, singer, music, tabs, instrument):
+        fetched.append(music)
+        if music == "huge":
+            raise CifraPageTooLargeException("Cifra page too large")
+        if music == "down":
+            raise httpx.ConnectError("connection refused")
+        return {"music_name": music, "tom": "", "cifra": ""}
+
+    monkeypatch.setattr(CifraClub, "_search_docs", fake_search_docs)
+    monkeypatch.setattr(CifraClub, "_fetch_cifra", fake_fetch_cifra)
+    cifra = CifraClub(match_top_k=3)
+
+    result = await cifra.search_musics(singer="Exaltasamba", music="Lua")
+
+    assert fetched == ["huge", "down", "lua"]
+    assert [song["music_name"] for song in result] == ["lua"]
@@ -0,0 +1,53 @@
+from src.cifra_spotify.cifras.search.matcher import match_candidates, rank_candidates
+from src.cifra_spotify.cifras.util import compare_artist_name, compare_track
+
+DOCS = [
+    {"txt": "Evidencias", "art": "Outro Artista", "dns": "outro", "url": "evid"},
+    {"art": "Chitãozinho & Xororó"},
+    {"txt": "Evidência", "art": "Chitaozinho e Xororo", "dns": "cx", "url": "ev1"},
+    {
+        "txt": "Evidências (Ao Vivo)",
+        "art": "Chitãozinho & Xororó",
+        "dns": "chitaozinho-xororo",
+        "url": "evidencias",
+    },
+    {"txt": "Amor", "art": "Chitãozinho & Xororó", "dns": "cx", "url": "amor"},
+]
+
+
+def test_match_candidates_picks_best_combined_score():
+    match = match_candidates(DOCS, "Evidências", "Chitãozinho & Xororó")
+
+    assert match.doc["url"] == "evidencias"
+    assert match.index == 3
+    assert match.title_score == compare_track(DOCS[3]["txt"], "Evidências")["score"]
+    assert (
+        match.artist_score
+        == compare_artist_name(DOCS[3]["art"], "Chitãozinho & Xororó")["score"]
+    )
+
+
+def test_match_candidates_thresholds():
+    assert match_candidates(DOCS, "Evidências", "Zezé", threshold=80) is None
+    assert match_candidates(DOCS, "Outra", "Chitãozinho & Xororó") is None
+    assert match_candidates([{"txt": "x"}], "x", "y") is None
+
+    # Without the artist check, the earliest of the tied titles wins.
+    match = match_candidates(DOCS, "Evidencias", "Zezé", check_singer=False)
+    assert match.index == 0
+    assert match.artist_score is None
+
+
+def test_rank_candidates_prefers_the_same_version():
+    docs = [
+        *DOCS,
+        {"txt": "Evidências", "art": "Chitãozinho & Xororó", "dns": "cx", "url": "st"},
+    ]
+
+    studio = rank_candidates(docs, "Evidências", "Chitãozinho & Xororó", top_k=2)
+    live = rank_candidates(docs, "Evidências - Ao Vivo", "Chitãozinho & Xororó")
+
+    assert [match.doc["url"] for match in studio] == ["st", "evidencias"]
+    assert studio[0].confidence == 1.0
+    assert studio[1].confidence == 0.95
+    assert [match.doc["url"] for match in live] == ["evidencias", "st", "ev1"]
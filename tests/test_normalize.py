@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from benchmarks.normalize import PAIRS, synthetic_titles
+from src.cifra_spotify.cifras.normalize import (
+    normalize_text,
+    normalize_track_title,
+    slugify_cifraclub,
+    strip_accents,
+)
+
+TRICKY = [
+    "",
+    " ",
+    "Evidências (Ao Vivo)",
+    "Hotel California - Live",
+    "Tempo Perdido (Remastered 2015)",
+    "Garota de Ipanema (feat. Tom Jobim) [Live]",
+    "((live) nested)",
+    "(a (live) b) (live)",
+    "Song - Part 1 - Edit",
+    "Mix - Não Mix",
+    "Song-Live",
+    "Song -  Remix",
+    "Song [Deluxe (2011]",
+    "Café́ Über ﬁnal ＡＢＣ İstanbul ǅ",
+    "ȩ́ ̈́x 한국어 ß",
+    "O Amor de Deus",
+    "A Banda e a Lua",
+    "  Díana  ",
+]
+
+
+@pytest.mark.parametrize("name", sorted(PAIRS))
+def test_normalization_matches_legacy_implementation(name):
+    legacy, new = PAIRS[name]
+    rng = random.Random(0)
+    noise = [
+        "".join(rng.choice("aé ()[]-ǗlIve") for _ in range(rng.randint(0, 20)))
+        for _ in range(2000)
+    ]
+    for title in TRICKY + noise + synthetic_titles(2000):
+        assert new(title) == legacy(title), title
+
+
+def test_normalization_examples():
+    assert normalize_track_title("Evidências (Ao Vivo)") == "Evidências"
+    assert normalize_track_title("Hotel California - Live") == "Hotel California"
+    assert slugify_cifraclub("O Amor e a Lua") == "o-amor-lua"
+    assert normalize_text("Díana ") == "diana"
+    assert strip_accents("ação") == "acao"
+    assert strip_accents("plain") == "plain"
@@ -0,0 +1,152 @@
+import asyncio
+import random
+import threading
+
+import pytest
+
+from src.cifra_spotify.cifras.parsers.cifraclub import (
+    parse_cifra_html,
+    parse_with_bs4,
+)
+from src.cifra_spotify.cifras.parsers.pool import ParserPool
+from src.cifra_spotify.cifras.parsers.scanner import CifraPageScanner, scan_cifra_page
+
+PAGE = """<!DOCTYPE html>
+<html><head><title>Cifra</title>
+<script>var x = "<pre>not this</pre>" && 1 < 2;</script>
+<style>pre > b { color: red }</style></head>
+<body>
+<div class="g-side"><h1 class="t1 big">  Garota de Ipanema <!-- c --></h1>
+<h2 class="t3"><a href="/tom-jobim/">Tom Jobim</a></h2>
+<span id="cifra_tom">tom:
+  <a class="js-modal-trigger" title='alterar o "tom"'>F&#x23;m7</a></span>
+<pre>[Intro] <b>Fmaj7</b>  <b>G7(13)</b>
+Olha que coisa mais linda &amp; mais cheia de gra&ccedil;a &nbsp;&copy &foo; &#150;
+<span class="tablatura"><span class="cnt">E|---3---|
+B|---0---|</span></span>
+<b data-x="a &quot;b&quot; 'c'" class=" q  r ">Gm7</b><br>Ela<br/>&lt;é&gt;<p/><img src=x>
+<span class="tablatura other">e|--|</span><!-- fim --><i>unclosed
+</pre>
+<div>trailer</div>
+<pre>second pre</pre>
+</div></body></html>
+"""
+
+
+@pytest.mark.parametrize("tabs", [True, False])
+@pytest.mark.parametrize("chunk_size", [7, 64, 16 * 1024])
+def test_scanner_matches_bs4(tabs, chunk_size):
+    assert scan_cifra_page(PAGE, tabs, chunk_size=chunk_size) == parse_with_bs4(
+        PAGE, tabs
+    )
+
+
+def test_scanner_stops_after_pre():
+    scanner = CifraPageScanner()
+    scanner.feed(PAGE.split("<div>trailer")[0])
+    assert scanner.done
+
+
+@pytest.mark.parametrize(
+    "page,message",
+    [
+        ("<pre>x</pre>", "Music name not found"),
+        ('<h1 class="t1">Song</h1>', "Cifra not found"),
+    ],
+)
+def test_scanner_raises_like_bs4(page, message):
+    for backend in ("bs4", "scanner"):
+        with pytest.raises(ValueError, match=message):
+            parse_cifra_html(page, backend=backend)
+
+
+def random_page(rng: random.Random) -> str:
+    tags = ["b", "i", "span", "a", "div", "p", "br", "img", "script", "pre"]
+    pieces = ['<h1 class="t1">', "Title", "</h1>"]
+    for _ in range(rng.randint(20, 80)):
+        choice = rng.random()
+        tag = rng.choice(tags)
+        if choice < 0.3:
+            pieces.append(
+                rng.choice(["x", " ", "\n", "  \t", "&amp;", "&lt;", "&#233;", "a>b"])
+            )
+        elif choice < 0.55:
+            attrs = rng.choice(
+                ["", ' class="tablatura"', ' id="cifra_tom"', " class=' a  b'", " x"]
+            )
+            pieces.append(f"<{tag}{attrs}>")
+        elif choice < 0.8:
+            pieces.append(f"</{tag}>")
+        elif choice < 0.9:
+            pieces.append(f"<{tag}/>")
+        else:
+            pieces.append(rng.choice(["<!-- note -->", "<![CDATA[raw]]>", "<?pi x?>"]))
+    return "".join(pieces) + "<pre>tail</pre>"
+
+
+def outcome(parse, *args):
+    try:
+        return parse(*args)
+    except ValueError as e:
+        return str(e)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_scanner_matches_bs4_on_random_markup(seed):
+    page = random_page(random.Random(seed))
+    for tabs in (True, False):
+        assert outcome(scan_cifra_page, page, tabs, 13) == outcome(
+            parse_with_bs4, page, tabs
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["thread", "process"])
+async def test_parser_pool_matches_inline_parse(kind):
+    pool = ParserPool(kind=kind, workers=2, backend="scanner")
+    try:
+        results = await asyncio.gather(
+            *[pool.parse(PAGE, tabs) for tabs in (True, False)]
+        )
+        with pytest.raises(ValueError, match="Cifra not found"):
+            await pool.parse('<h1 class="t1">Song</h1>')
+    finally:
+        await pool.aclose()
+
+    assert results == [parse_with_bs4(PAGE, True), parse_with_bs4(PAGE, False)]
+    metrics = pool.metrics()
+    assert metrics["completed"] == 2
+    assert metrics["failed"] == 1
+    assert metrics["parse_time"]["count"] == 2
+    assert metrics["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_parser_pool_bounds_pending_pages(monkeypatch):
+    release = threading.Event()
+    running = 0
+    peak = 0
+
+    def slow_parse(text, tabs, backend):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        release.wait(5)
+        running -= 1
+        return {"cifra": text}, 0.0
+
+    monkeypatch.setattr(
+        "src.cifra_spotify.cifras.parsers.pool._timed_parse", slow_parse
+    )
+    pool = ParserPool(workers=4, max_pending=2)
+    tasks = [asyncio.create_task(pool.parse(str(i))) for i in range(5)]
+    await asyncio.sleep(0.05)
+
+    assert pool.in_flight == 2
+    assert pool.waiting == 3
+
+    release.set()
+    results = await asyncio.gather(*tasks)
+    await pool.aclose()
+    assert [result["cifra"] for result in results] == ["0", "1", "2", "3", "4"]
+    assert peak == 2
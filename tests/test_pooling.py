@@ -1,8 +1,12 @@
+import asyncio
+import functools
+import threading
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from src.cifra_spotify.spotify.pooling import SpotifyPollingService
+from src.cifra_spotify.spotify.pooling import SpotifyPollingService, hook_name
 from src.cifra_spotify.spotify.spotify import SpotifyAPI
 
 
@@ -102,6 +106,33 @@ async def test_fire_supports_async_hooks():
     assert hook_async_called[0]["id"] == "1"
 
 
+@pytest.mark.asyncio
+async def test_events_carry_the_polled_account():
+    """Eventos devem indicar de qual conta do Spotify vieram."""
+    fake_track = {"id": "1", "name": "Song", "artists": [{"name": "Artist"}]}
+    playing = MagicMock(status_code=200)
+    playing.json.return_value = {"item": fake_track, "progress_ms": 1000}
+
+    api = MagicMock(spec=SpotifyAPI)
+    api.get_current_track = AsyncMock(side_effect=[playing, MagicMock(status_code=204)])
+
+    events = []
+    service = SpotifyPollingService(
+        api,
+        on_track_start=events.append,
+        on_track_stop=events.append,
+        webhook_url=None,
+        user_id="alice",
+    )
+    service._notify_webhook = AsyncMock()
+
+    await service._tick()
+    await service._tick()
+
+    assert [event["user_id"] for event in events] == ["alice", "alice"]
+    assert service._notify_webhook.await_args.args[0]["user_id"] == "alice"
+
+
 @pytest.mark.asyncio
 async def test_notify_webhook_post_called():
     """Deve chamar _http.post com payload correto."""
@@ -120,4 +151,187 @@ async def test_notify_webhook_post_called():
     with patch.object(service._http, "post", new_callable=AsyncMock) as post:
         await service._notify_webhook(fake_track)
 
-    post.assert_awaited_once_with("http://example.com", json=fake_track)
+    post.assert_awaited_once_with(
+        "http://example.com", json={"version": 1, "events": [fake_track]}
+    )
+
+
+@pytest.mark.asyncio
+async def test_scheduler_polls_many_accounts_with_bounded_concurrency():
+    """O scheduler deve respeitar o intervalo de cada conta e o limite de concorrência."""
+    from src.cifra_spotify.spotify.scheduler import PollingScheduler
+
+    running = []
+    peak = []
+
+    class FakeService:
+        def __init__(self, interval):
+            self.interval = interval
+            self.ticks = 0
+
+        async def poll_once(self):
+            running.append(self)
+            peak.append(len(running))
+            await asyncio.sleep(0.005)
+            running.remove(self)
+            self.ticks += 1
+            return self.interval
+
+    fast = [FakeService(0.01) for _ in range(5)]
+    slow = FakeService(10)
+
+    scheduler = PollingScheduler(max_concurrency=2)
+    for index, service in enumerate([*fast, slow]):
+        scheduler.add(f"user{index}", service)
+
+    await scheduler.start()
+    await asyncio.sleep(0.1)
+    scheduler.remove("user0")
+    ticks_after_remove = fast[0].ticks
+    await asyncio.sleep(0.05)
+    await scheduler.stop()
+
+    assert max(peak) == 2
+    assert slow.ticks == 1
+    assert all(service.ticks > 1 for service in fast[1:])
+    assert fast[0].ticks <= ticks_after_remove + 1
+    assert len(scheduler) == 5
+
+
+@pytest.mark.asyncio
+async def test_predictive_polling_sleeps_until_track_end_and_detects_seek():
+    """No modo preditivo, deve dormir até perto do fim da faixa e voltar à cadência normal após seek."""
+    now = [0.0]
+
+    def playing(progress_ms):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {
+            "is_playing": True,
+            "progress_ms": progress_ms,
+            "item": {
+                "id": "1",
+                "name": "Song",
+                "artists": [{"name": "Artist"}],
+                "duration_ms": 200_000,
+            },
+        }
+        return response
+
+    api = MagicMock(spec=SpotifyAPI)
+    service = SpotifyPollingService(
+        api,
+        webhook_url=None,
+        predictive=True,
+        max_predictive_interval=30,
+        clock=lambda: now[0],
+    )
+
+    api.get_current_track = AsyncMock(return_value=playing(10_000))
+    assert await service.poll_once() == 30
+
+    now[0] += 30
+    api.get_current_track = AsyncMock(return_value=playing(180_000))
+    assert await service.poll_once() == service.interval
+
+    now[0] += 3
+    api.get_current_track = AsyncMock(return_value=playing(183_000))
+    assert await service.poll_once() == 15
+
+    now[0] += 15
+    api.get_current_track = AsyncMock(return_value=playing(198_000))
+    assert await service.poll_once() == 2.5
+
+
+@pytest.mark.asyncio
+async def test_fire_runs_hooks_concurrently_with_timeout():
+    """Hooks lentos não devem atrasar os demais e devem expirar pelo timeout."""
+    threads = []
+
+    async def slow_hook(event):
+        await asyncio.sleep(1)
+
+    async def fast_hook(event):
+        await asyncio.sleep(0.02)
+
+    def sync_hook(event):
+        threads.append(threading.current_thread())
+        time.sleep(0.02)
+
+    service = SpotifyPollingService(MagicMock(spec=SpotifyAPI), hook_timeout=0.1)
+
+    started = time.perf_counter()
+    await service._fire([slow_hook, fast_hook, sync_hook], {"id": "1"})
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.5
+    assert threads and threads[0].name.startswith("polling-hook")
+    metrics = service.hook_metrics()
+    assert metrics[hook_name(slow_hook)]["timeouts"] == 1
+    assert metrics[hook_name(fast_hook)]["count"] == 1
+    assert metrics[hook_name(fast_hook)]["timeouts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_fire_gives_each_hook_its_own_copy():
+    """Um hook que altera o evento não deve afetar os demais."""
+    seen = []
+
+    def mutating_hook(event):
+        event["id"] = "changed"
+
+    async def reading_hook(event):
+        await asyncio.sleep(0.01)
+        seen.append(event["id"])
+
+    service = SpotifyPollingService(MagicMock(spec=SpotifyAPI))
+    data = {"id": "1"}
+    await service._fire([mutating_hook, reading_hook], data)
+
+    assert seen == ["1"]
+    assert data == {"id": "1"}
+
+
+@pytest.mark.asyncio
+async def test_hook_metrics_keep_distinct_names():
+    """Hooks com o mesmo nome devem ter métricas separadas quando nomeados."""
+
+    async def record(label, event):
+        pass
+
+    service = SpotifyPollingService(MagicMock(spec=SpotifyAPI))
+    service.add_hook("start", functools.partial(record, "a"), name="audit")
+    service.add_hook("start", functools.partial(record, "b"))
+    service.add_hook("start", lambda event: None)
+
+    await service._fire(service.on_track_start, {"id": "1"})
+
+    assert set(service.hook_metrics()) == {
+        "audit",
+        f"{__name__}.test_hook_metrics_keep_distinct_names.<locals>.record",
+        f"{__name__}.test_hook_metrics_keep_distinct_names.<locals>.<lambda>",
+    }
+
+
+@pytest.mark.asyncio
+async def test_fire_keeps_registration_order_for_ordered_events():
+    """Eventos ordenados devem executar os hooks um de cada vez, em ordem."""
+    order = []
+
+    def make_hook(name, delay):
+        async def hook(event):
+            await asyncio.sleep(delay)
+            order.append(name)
+
+        return hook
+
+    service = SpotifyPollingService(
+        MagicMock(spec=SpotifyAPI), ordered_events=["change"]
+    )
+    hooks = [make_hook("first", 0.03), make_hook("second", 0)]
+
+    await service._fire(hooks, {"id": "1"}, "start")
+    assert order == ["second", "first"]
+
+    order.clear()
+    await service._fire(hooks, {"id": "1"}, "change")
+    assert order == ["first", "second"]
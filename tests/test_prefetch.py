@@ -0,0 +1,75 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from src.cifra_spotify.app.core.cache import TieredCache, TTLCache
+from src.cifra_spotify.cifras.cifra_club import CifraClub
+from src.cifra_spotify.cifras.prefetch import ChordPrefetcher
+from src.cifra_spotify.spotify.pooling import SpotifyPollingService
+from src.cifra_spotify.spotify.spotify import SpotifyAPI
+
+
+@pytest.mark.asyncio
+async def test_search_results_are_cached(monkeypatch):
+    search = AsyncMock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "response": {"docs": [{"txt": "A", "art": "X", "dns": "x", "url": "a"}]}
+            },
+        )
+    )
+    monkeypatch.setattr(CifraClub, "search_api_cifra", search)
+    monkeypatch.setattr(CifraClub, "_fetch_cifra", AsyncMock(return_value={"url": "a"}))
+
+    cifra = CifraClub(search_cache=TieredCache(TTLCache()))
+    await cifra.search_musics(singer="X", music="A")
+    await cifra.search_musics(singer="X", music="A")
+
+    assert search.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_empty_search_results_are_not_cached(monkeypatch):
+    search = AsyncMock(return_value=None)
+    monkeypatch.setattr(CifraClub, "search_api_cifra", search)
+
+    cifra = CifraClub(search_cache=TieredCache(TTLCache()))
+    assert await cifra._search_docs("A") == []
+    assert await cifra._search_docs("A") == []
+
+    assert search.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_prefetcher_warms_track_and_queue_once():
+    cifra_club = MagicMock(spec=CifraClub)
+    cifra_club.search_musics = AsyncMock(return_value=[])
+
+    queue = MagicMock(status_code=200)
+    queue.json.return_value = {
+        "queue": [
+            {"id": "2", "name": "Next", "artists": [{"name": "B"}]},
+            {"id": "3", "name": "Later", "artists": [{"name": "C"}]},
+        ]
+    }
+    api = MagicMock(spec=SpotifyAPI)
+    api.get_queue = AsyncMock(return_value=queue)
+
+    prefetcher = ChordPrefetcher(cifra_club, queue_depth=1)
+    service = SpotifyPollingService(api, webhook_url=None)
+    prefetcher.attach(service)
+
+    event = {"id": "1", "name": "Song", "artist": "A", "progress_ms": 0}
+    await service._fire(service.on_track_start, event, "start")
+    await service._fire(service.on_track_change, event, "change")
+    await asyncio.gather(*prefetcher._tasks)
+
+    searched = [
+        call.kwargs["music"] for call in cifra_club.search_musics.await_args_list
+    ]
+    assert searched == ["Song", "Next"]
+    assert prefetcher.prefetched == 2
+    await prefetcher.aclose()
@@ -0,0 +1,110 @@
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from main import create_app
+from src.cifra_spotify.api.deps import get_session_user
+from src.cifra_spotify.app.core.config import settings
+from src.cifra_spotify.app.core.session import SessionSigner, sessions
+from src.cifra_spotify.app.custom_exceptions.exceptions import (
+    UserNotAuthenticatedException,
+)
+from src.cifra_spotify.spotify import spotify, spotify_users
+
+
+@pytest.fixture
+def single_user_token(monkeypatch, tmp_path):
+    """Keep the callback's single-user token off the working directory."""
+    token_file = tmp_path / "token"
+    monkeypatch.setattr(spotify.auth, "TOKEN_FILE", str(token_file))
+    for attr in ("access_token", "refresh_token", "expires_at"):
+        monkeypatch.setattr(spotify.auth, attr, None)
+    return token_file
+
+
+def test_session_signer_roundtrip_and_tampering():
+    signer = SessionSigner("secret")
+    token = signer.issue("alice")
+
+    assert signer.verify(token) == "alice"
+    assert SessionSigner("other").verify(token) is None
+
+    _, expires_at, signature = token.split(".")
+    forged = signer.issue("bob").split(".")[0]
+    assert signer.verify(f"{forged}.{expires_at}.{signature}") is None
+    assert signer.verify("alice") is None
+    assert signer.verify("") is None
+
+
+def test_session_signer_rejects_expired_tokens():
+    signer = SessionSigner("secret", ttl=-1)
+    assert signer.verify(signer.issue("alice")) is None
+
+
+def test_get_session_user_reads_bearer_or_cookie():
+    token = sessions.issue("alice")
+
+    assert get_session_user(authorization=f"Bearer {token}") == "alice"
+    assert get_session_user(session=token) == "alice"
+    assert get_session_user() is None
+    with pytest.raises(UserNotAuthenticatedException):
+        get_session_user(authorization="Bearer alice")
+
+
+def test_callback_registers_user_and_returns_a_session(monkeypatch, single_user_token):
+    tokens = {"access_token": "a", "refresh_token": "r", "expires_in": 3600}
+    request_token = AsyncMock(return_value=tokens)
+    register = AsyncMock(return_value="alice")
+    monkeypatch.setattr(spotify_users.login_auth, "request_token", request_token)
+    monkeypatch.setattr(spotify_users, "register", register)
+
+    client = TestClient(create_app())
+    response = client.get("/webhooks/callback", params={"code": "c"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert "tokens" not in body
+    assert sessions.verify(body["session"]) == "alice"
+    assert response.cookies[settings.SESSION_COOKIE] == body["session"]
+    assert "secure" in response.headers["set-cookie"].lower()
+    request_token.assert_awaited_once_with("c")
+    register.assert_awaited_once_with(tokens)
+
+
+def test_forged_session_is_rejected():
+    client = TestClient(create_app())
+    response = client.get("/api/", headers={"Authorization": "Bearer alice"})
+    assert response.status_code == 401
+
+
+def test_login_also_authenticates_the_single_user_client(
+    monkeypatch, single_user_token
+):
+    tokens = {"access_token": "a", "refresh_token": "r", "expires_in": 3600}
+    monkeypatch.setattr(
+        spotify_users.login_auth, "request_token", AsyncMock(return_value=tokens)
+    )
+    monkeypatch.setattr(spotify_users, "register", AsyncMock(return_value="alice"))
+
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers["Authorization"])
+        return httpx.Response(204)
+
+    monkeypatch.setattr(
+        spotify, "client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+
+    client = TestClient(create_app())
+    assert client.get("/api/track/current_track").status_code == 401
+
+    client.get("/webhooks/callback", params={"code": "c"})
+    client.cookies.clear()
+    response = client.get("/api/track/current_track")
+
+    assert response.status_code == 404
+    assert seen == ["Bearer a"]
+    assert single_user_token.read_text().startswith("a\nr\n")
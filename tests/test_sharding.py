@@ -0,0 +1,52 @@
+import pytest
+
+from src.cifra_spotify.workers.sharding import HashRing, LeaseTable, ShardCoordinator
+
+USERS = [f"user{i}" for i in range(1000)]
+
+
+def test_hash_ring_moves_only_keys_of_the_removed_node():
+    ring = HashRing(["a", "b", "c"])
+    before = {user: ring.get(user) for user in USERS}
+
+    ring.remove("c")
+    after = {user: ring.get(user) for user in USERS}
+
+    moved = [user for user in USERS if before[user] != after[user]]
+    assert all(before[user] == "c" for user in moved)
+    assert set(after.values()) == {"a", "b"}
+    assert 200 < len(moved) < 470
+
+
+@pytest.mark.asyncio
+async def test_coordinators_split_accounts_and_rebalance(tmp_path):
+    now = [1000.0]
+    path = str(tmp_path / "leases.db")
+
+    def table():
+        return LeaseTable(path, ttl=30, clock=lambda: now[0])
+
+    workers = [ShardCoordinator(name, table()) for name in ("w1", "w2", "w3")]
+    for worker in workers:
+        await worker.leases.heartbeat(worker.worker_id)
+    for worker in workers:
+        assert await worker.refresh()
+
+    shares = [set(worker.assigned(USERS)) for worker in workers]
+    assert set().union(*shares) == set(USERS)
+    assert sum(len(share) for share in shares) == len(USERS)
+
+    # w3 stops heartbeating and its lease expires.
+    now[0] += 31
+    for worker in workers[:2]:
+        await worker.leases.heartbeat(worker.worker_id)
+    for worker in workers[:2]:
+        assert await worker.refresh()
+
+    shares = [set(worker.assigned(USERS)) for worker in workers[:2]]
+    assert set().union(*shares) == set(USERS)
+    assert not shares[0] & shares[1]
+
+    await workers[1].leave()
+    assert await workers[0].refresh()
+    assert workers[0].assigned(USERS) == USERS
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import create_app
+from src.cifra_spotify.api.deps import get_cifra_club, get_spotify
+from src.cifra_spotify.cifras.songbook import iter_songbook, resolve_songbook
+
+
+class FakeCifraClub:
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+
+    async def search_musics(self, singer, music, instrument, tabs):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.running -= 1
+        if music == "broken":
+            raise RuntimeError("upstream error")
+        if music == "missing":
+            return []
+        return [{"music_name": music, "tom": "G", "cifra": f"<pre>{music}</pre>"}]
+
+    async def generate_pdf(self, html):
+        return b"%PDF " + html.encode()
+
+
+TRACKS = [
+    {"id": "1", "name": "first", "artist": "A"},
+    {"id": "2", "name": "broken", "artist": "A"},
+    {"id": "3", "name": "missing", "artist": "A"},
+    {"id": "4", "name": "last", "artist": "A"},
+]
+
+
+@pytest.mark.asyncio
+async def test_resolve_songbook_isolates_failures_and_bounds_concurrency():
+    cifra_club = FakeCifraClub()
+
+    entries = await resolve_songbook(cifra_club, TRACKS * 5, max_concurrency=3)
+
+    assert [entry.track["id"] for entry in entries] == ["1", "2", "3", "4"] * 5
+    assert [entry.found for entry in entries[:4]] == [True, False, False, True]
+    assert entries[1].error == "upstream error"
+    assert entries[2].error == "Cifra not found"
+    assert cifra_club.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_iter_songbook_cancels_pending_tracks_when_closed():
+    cifra_club = FakeCifraClub()
+    entries = iter_songbook(cifra_club, TRACKS * 5, max_concurrency=2)
+
+    first = await anext(entries)
+    await entries.aclose()
+    await asyncio.sleep(0.05)
+
+    assert first.track["id"] == "1"
+    assert cifra_club.running == 0
+
+
+def test_playlist_songbook_endpoint_renders_partial_songbook():
+    class FakeSpotify:
+        async def get_playlist_tracks(self, playlist_id, max_tracks=None):
+            return TRACKS, 250
+
+    app = create_app()
+    app.dependency_overrides[get_spotify] = FakeSpotify
+    app.dependency_overrides[get_cifra_club] = FakeCifraClub
+    client = TestClient(app)
+
+    response = client.get("/api/playlist/pl1/songbook")
+    assert response.status_code == 200
+    assert response.headers["x-songbook-tracks"] == "4"
+    assert response.headers["x-songbook-truncated"] == "true"
+    assert response.text.index("<pre>first</pre>") < response.text.index(
+        "<pre>last</pre>"
+    )
+
+    pdf = client.get("/api/playlist/pl1/songbook", params={"format": "pdf"})
+    assert pdf.headers["content-type"] == "application/pdf"
+    assert pdf.content.startswith(b"%PDF")
+    assert pdf.headers["x-songbook-missing"] == "2"
@@ -1,9 +1,11 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
 
 from cifra_spotify.spotify.auth import SpotifyAuth
+from cifra_spotify.spotify.ratelimit import Priority, RateLimiter
 from cifra_spotify.spotify.spotify import SpotifyAPI
 
 
@@ -123,3 +125,188 @@ async def test_aclose():
     with patch.object(api.client, "aclose", new=AsyncMock()) as mock_close:
         await api.aclose()
         mock_close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_send_request_coalesces_identical_gets():
+    """GETs idênticos simultâneos devem gerar uma única requisição."""
+    auth = MagicMock(spec=SpotifyAuth)
+    auth.ensure_token = AsyncMock(return_value="T")
+
+    api = SpotifyAPI(auth)
+    mock_response = MagicMock(spec=httpx.Response)
+
+    async def slow_get(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return mock_response
+
+    with patch.object(api.client, "get", new=AsyncMock(side_effect=slow_get)) as get:
+        responses = await asyncio.gather(
+            *[api._send_request("me/player/currently-playing") for _ in range(5)],
+            api._send_request("me"),
+        )
+
+    assert all(resp is mock_response for resp in responses)
+    assert get.await_count == 2
+
+    with patch.object(api.client, "get", new=AsyncMock(return_value=mock_response)):
+        await api._send_request("me")
+        assert api.client.get.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_send_request_does_not_reuse_failed_responses():
+    """Com micro-TTL, só respostas de sucesso devem ser reaproveitadas."""
+    auth = MagicMock(spec=SpotifyAuth)
+    auth.ensure_token = AsyncMock(return_value="T")
+
+    api = SpotifyAPI(auth, coalesce_ttl=60, max_retries=0)
+    responses = [httpx.Response(503), httpx.Response(200, json={"id": "u"})]
+
+    with patch.object(
+        api.client, "get", new=AsyncMock(side_effect=responses)
+    ) as mock_get:
+        first = await api._send_request("me")
+        second = await api._send_request("me")
+        third = await api._send_request("me")
+
+    assert first.status_code == 503
+    assert second.status_code == 200
+    assert third is second
+    assert mock_get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_artists_metadata_uses_cache_and_batches():
+    """Artistas em cache não devem gerar novas requisições."""
+    auth = MagicMock(spec=SpotifyAuth)
+    auth.ensure_token = AsyncMock(return_value="T")
+
+    api = SpotifyAPI(auth)
+    ids = [f"id{i}" for i in range(60)]
+
+    def fake_artists(path, params):
+        requested = params["ids"].split(",")
+        return httpx.Response(
+            200, json={"artists": [{"id": i, "genres": ["samba"]} for i in requested]}
+        )
+
+    with patch.object(
+        api, "_send_request", new=AsyncMock(side_effect=fake_artists)
+    ) as mock_req:
+        first = await api.get_artists_metadata(ids)
+        second = await api.get_artists_metadata(["id0", "id59"])
+
+    assert len(first) == 60
+    assert second["id59"]["genres"] == ["samba"]
+    assert mock_req.await_count == 2
+    assert len(mock_req.await_args_list[0].kwargs["params"]["ids"].split(",")) == 50
+
+
+@pytest.mark.asyncio
+async def test_send_request_retries_after_429():
+    """Após 429, deve respeitar Retry-After e repetir a requisição."""
+    auth = MagicMock(spec=SpotifyAuth)
+    auth.ensure_token = AsyncMock(return_value="T")
+
+    api = SpotifyAPI(auth, backoff_base=0)
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(503),
+        httpx.Response(200, json={"id": "me"}),
+    ]
+
+    with patch.object(api.client, "get", new=AsyncMock(side_effect=responses)) as get:
+        resp = await api._send_request("me")
+
+    assert resp.status_code == 200
+    assert get.await_count == 3
+    assert api.metrics()["rate_limiter"]["throttled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_send_request_returns_429_when_retry_after_is_too_long():
+    """Retry-After acima do limite devolve o 429 e pausa só pelo limite."""
+    auth = MagicMock(spec=SpotifyAuth)
+    auth.ensure_token = AsyncMock(return_value="T")
+
+    limiter = RateLimiter(max_retry_after=5)
+    api = SpotifyAPI(auth, rate_limiter=limiter)
+    response = httpx.Response(429, headers={"Retry-After": "3600"})
+
+    with patch.object(api.client, "get", new=AsyncMock(return_value=response)) as get:
+        resp = await api._send_request("me")
+
+    assert resp.status_code == 429
+    assert get.await_count == 1
+    assert 0 < limiter.metrics()["paused_for"] <= 5
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_prioritizes_interactive_requests():
+    """Requisições interativas passam na frente das de background."""
+    limiter = RateLimiter(rate=50, capacity=1)
+    await limiter.acquire()
+    order = []
+
+    async def worker(priority):
+        await limiter.acquire(priority)
+        order.append(priority)
+
+    background = asyncio.create_task(worker(Priority.BACKGROUND))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(worker(Priority.INTERACTIVE))
+    await asyncio.gather(background, interactive)
+
+    assert order == [Priority.INTERACTIVE, Priority.BACKGROUND]
+
+
+@pytest.mark.asyncio
+async def test_send_request_revalidates_with_etag():
+    """Com ETag salvo, deve enviar If-None-Match e servir o corpo em cache no 304."""
+    auth = MagicMock(spec=SpotifyAuth)
+    auth.ensure_token = AsyncMock(return_value="T")
+
+    api = SpotifyAPI(auth, etag_entries=10)
+    first = httpx.Response(200, headers={"ETag": '"v1"'}, json={"items": [1, 2]})
+    responses = [first, httpx.Response(304)]
+
+    with patch.object(api.client, "get", new=AsyncMock(side_effect=responses)) as get:
+        await api._send_request("me/playlists", params={"limit": 10})
+        resp = await api._send_request("me/playlists", params={"limit": 10})
+
+    assert resp is first
+    assert resp.json() == {"items": [1, 2]}
+    assert "If-None-Match" not in get.await_args_list[0].kwargs["headers"]
+    assert get.await_args_list[1].kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert api.metrics()["etag"]["not_modified"] == 1
+    assert api.metrics()["etag"]["bytes_saved"] == len(first.content)
+
+
+@pytest.mark.asyncio
+async def test_get_playlist_tracks_pages_through_playlist():
+    """Deve buscar todas as páginas da playlist e manter a ordem das faixas."""
+    auth = MagicMock(spec=SpotifyAuth)
+    auth.ensure_token = AsyncMock(return_value="T")
+
+    api = SpotifyAPI(auth)
+
+    def fake_items(path, params):
+        offset, limit = params["offset"], params["limit"]
+        items = [
+            {"track": {"id": f"t{i}", "name": f"Song {i}", "artists": [{"name": "A"}]}}
+            for i in range(offset, min(offset + limit, 250))
+        ]
+        items.append({"track": None})
+        return httpx.Response(200, json={"total": 250, "items": items})
+
+    with patch.object(
+        api, "_send_request", new=AsyncMock(side_effect=fake_items)
+    ) as mock_req:
+        tracks, total = await api.get_playlist_tracks("pl1")
+
+    assert total == 250
+    assert [track["id"] for track in tracks] == [f"t{i}" for i in range(250)]
+    assert tracks[0] == {"id": "t0", "name": "Song 0", "artist": "A"}
+    assert mock_req.await_count == 3
+    assert mock_req.await_args_list[0].args[0] == "playlists/pl1/tracks"
@@ -0,0 +1,147 @@
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from src.cifra_spotify.spotify.auth import SpotifyAuth
+from src.cifra_spotify.spotify.ratelimit import RateLimiter
+from src.cifra_spotify.spotify.token_store import (
+    MemoryTokenStore,
+    RedisTokenStore,
+    SQLiteTokenStore,
+    TokenData,
+)
+from src.cifra_spotify.spotify.users import SpotifyUsers
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for redis.asyncio.Redis."""
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+
+    async def get(self, key):
+        value = self.values.get(key)
+        return value.encode() if value is not None else None
+
+    async def set(self, key, value):
+        self.values[key] = value
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+    async def sadd(self, key, member):
+        self.sets.setdefault(key, set()).add(member.encode())
+
+    async def srem(self, key, member):
+        self.sets.get(key, set()).discard(member.encode())
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryTokenStore()
+    if request.param == "sqlite":
+        return SQLiteTokenStore(str(tmp_path / "tokens.db"))
+    return RedisTokenStore(FakeRedis())
+
+
+@pytest.mark.asyncio
+async def test_store_roundtrip(store):
+    token = TokenData("access", "refresh", 123.0)
+
+    await store.set("alice", token)
+    await store.set("bob", TokenData("b", None, 1.0))
+
+    assert await store.get("alice") == token
+    assert await store.get("nobody") is None
+    assert sorted(await store.user_ids()) == ["alice", "bob"]
+
+    await store.delete("alice")
+    assert await store.get("alice") is None
+    assert await store.user_ids() == ["bob"]
+    await store.aclose()
+
+
+@pytest.mark.asyncio
+async def test_auth_loads_and_saves_through_store():
+    store = MemoryTokenStore()
+    await store.set("alice", TokenData("old", "refresh", time.time() - 10))
+
+    auth = SpotifyAuth("id", "secret", "uri", store=store, user_id="alice")
+    response = httpx.Response(
+        200,
+        json={"access_token": "new", "expires_in": 3600},
+        request=httpx.Request("POST", SpotifyAuth.TOKEN_URL),
+    )
+
+    with patch("httpx.AsyncClient.post", new=AsyncMock(return_value=response)):
+        token = await auth.ensure_token()
+
+    assert token == "new"
+    saved = await store.get("alice")
+    assert saved.access_token == "new"
+    assert saved.refresh_token == "refresh"
+
+
+@pytest.mark.asyncio
+async def test_users_registry_builds_one_client_per_user():
+    users = SpotifyUsers(
+        store=MemoryTokenStore(),
+        client_id="id",
+        client_secret="secret",
+        redirect_uri="uri",
+        rate_limiter=RateLimiter(),
+        artist_cache=None,
+        max_clients=2,
+    )
+
+    alice = users.get("alice")
+    assert users.get("alice") is alice
+    assert alice.auth.user_id == "alice"
+    assert alice.client is users.http
+    assert alice.rate_limiter is users.get("bob").rate_limiter
+
+    await users.store.set("alice", TokenData("a", "r", time.time() + 3600))
+    users.get("carol")
+    assert len(users._clients) == 2
+    rebuilt = users.get("alice")
+    assert rebuilt is not alice
+    # The auth goes with its client; the rebuilt one reloads from the store.
+    assert rebuilt.auth is not alice.auth
+    assert await rebuilt.auth.ensure_token() == "a"
+    await users.aclose()
+
+
+@pytest.mark.asyncio
+async def test_users_register_updates_live_auth():
+    store = MemoryTokenStore()
+    users = SpotifyUsers(
+        store=store,
+        client_id="id",
+        client_secret="secret",
+        redirect_uri="uri",
+        rate_limiter=RateLimiter(),
+        artist_cache=None,
+    )
+    alice = users.get("alice")
+    alice.auth.use_token(TokenData("old", "r1", time.time() + 3600))
+
+    me = httpx.Response(
+        200, json={"id": "alice"}, request=httpx.Request("GET", "https://x")
+    )
+    with patch.object(users.http, "get", new=AsyncMock(return_value=me)):
+        user_id = await users.register(
+            {"access_token": "new", "refresh_token": "r2", "expires_in": 3600}
+        )
+
+    assert user_id == "alice"
+    assert alice.auth.access_token == "new"
+    assert (await store.get("alice")).refresh_token == "r2"
+    assert users.login_auth.user_id is None
+    await users.aclose()
@@ -0,0 +1,114 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.cifra_spotify.spotify.webhook_queue import WebhookQueue
+
+
+def make_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_queue_batches_events_into_one_post():
+    received = []
+
+    def handler(request):
+        received.append(json.loads(request.content))
+        return httpx.Response(200)
+
+    queue = WebhookQueue(
+        "http://hook",
+        client=make_client(handler),
+        batch_size=10,
+        batch_wait=0.05,
+        workers=1,
+    )
+    await queue.start()
+    for index in range(3):
+        assert await queue.put({"id": str(index)})
+    await queue.stop()
+
+    assert received == [
+        {"version": 1, "events": [{"id": "0"}, {"id": "1"}, {"id": "2"}]}
+    ]
+    assert queue.metrics()["delivered"] == 3
+    assert queue.metrics()["batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_single_event_uses_the_same_envelope():
+    received = []
+
+    def handler(request):
+        received.append(json.loads(request.content))
+        return httpx.Response(200)
+
+    queue = WebhookQueue("http://hook", client=make_client(handler), batch_wait=0)
+    await queue.start()
+    await queue.put({"user_id": "alice", "id": "1"})
+    await queue.stop()
+
+    assert received == [{"version": 1, "events": [{"user_id": "alice", "id": "1"}]}]
+
+
+@pytest.mark.asyncio
+async def test_queue_retries_then_dead_letters(tmp_path):
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        return httpx.Response(503)
+
+    dead_letter_path = tmp_path / "dead.jsonl"
+    queue = WebhookQueue(
+        "http://hook",
+        client=make_client(handler),
+        batch_wait=0,
+        max_retries=2,
+        backoff_base=0,
+        dead_letter_path=str(dead_letter_path),
+    )
+    await queue.start()
+    await queue.put({"id": "1"})
+    await queue.stop()
+
+    assert len(attempts) == 3
+    assert queue.metrics()["retries"] == 2
+    assert list(queue.dead_letters) == [[{"id": "1"}]]
+    assert json.loads(dead_letter_path.read_text()) == {"id": "1"}
+
+
+@pytest.mark.asyncio
+async def test_queue_spills_to_disk_when_full(tmp_path):
+    received = []
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        received.extend(json.loads(request.content)["events"])
+        return httpx.Response(200)
+
+    queue = WebhookQueue(
+        "http://hook",
+        client=make_client(handler),
+        maxsize=2,
+        batch_size=2,
+        batch_wait=0,
+        workers=1,
+        spill_path=str(tmp_path / "spill.jsonl"),
+    )
+    await queue.start()
+    for index in range(6):
+        assert await queue.put({"id": str(index)})
+    await asyncio.sleep(0)
+
+    assert queue.metrics()["on_disk"] > 0
+    release.set()
+    await queue.stop()
+
+    assert [event["id"] for event in received] == [str(i) for i in range(6)]
+    assert queue.metrics()["on_disk"] == 0
+    assert queue.metrics()["dropped"] == 0